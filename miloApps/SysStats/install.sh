@@ -13,10 +13,20 @@ echo "Installing miloOS System Statistics Monitor..."
 # Install Python dependencies
 echo "Installing dependencies..."
 apt-get install -y python3-psutil 2>/dev/null || echo "psutil already installed or not available"
+apt-get install -y pci.ids 2>/dev/null || echo "pci.ids already installed or not available"
 
 # Install Python script
 install -m 755 sysstats.py /usr/local/bin/sysstats
 
+# Install collector modules
+mkdir -p /usr/local/lib/sysstats/sysstats_lib
+install -m 644 sysstats_lib/*.py /usr/local/lib/sysstats/sysstats_lib/
+
+# Install collector daemon and its systemd user unit
+install -m 755 sysstats-collector /usr/local/bin/sysstats-collector
+mkdir -p /usr/lib/systemd/user
+install -m 644 sysstats-collector.service /usr/lib/systemd/user/
+
 # Install helper script for dmidecode
 if [ -f "sysstats-dmidecode-helper" ]; then
     echo "Installing dmidecode helper..."
@@ -4,17 +4,40 @@ miloOS System Statistics Monitor
 macOS Activity Monitor inspired interface for system monitoring
 """
 
+import os
+import sys
+
+# Collector modules live next to this script in the source tree and
+# under /usr/local/lib/sysstats once installed
+sys.path.insert(0, '/usr/local/lib/sysstats')
+sys.path.insert(0, os.path.dirname(os.path.realpath(__file__)))
+
+# Command-line modes (--json, --watch) never load GTK
+if __name__ == "__main__" and len(sys.argv) > 1:
+    from sysstats_lib import cli
+    sys.exit(cli.main(sys.argv[1:]))
+
 import gi
 gi.require_version('Gtk', '3.0')
 gi.require_version('GdkPixbuf', '2.0')
 from gi.repository import Gtk, Gdk, GLib, GdkPixbuf
+import cairo
+import math
 import subprocess
-import os
 import locale
 import psutil
 import time
 import re
-from collections import deque
+import threading
+import json
+
+from sysstats_lib import dpkg, sysfs
+from sysstats_lib.client import CollectorClient
+from sysstats_lib.collector import Sampler
+from sysstats_lib.cpustat import BREAKDOWN_FIELDS
+from sysstats_lib.history import MetricHistory, VIEW_SPANS
+from sysstats_lib.psi import KINDS as PRESSURE_KINDS, RESOURCES as PRESSURE_RESOURCES
+from sysstats_lib.recorder import Recorder
 
 # Translations
 TRANSLATIONS = {
@@ -25,6 +48,7 @@ TRANSLATIONS = {
         'memory': 'Memory',
         'disk': 'Disk',
         'network': 'Network',
+        'pressure': 'Pressure',
         'processes': 'Processes',
         'system_info': 'System Information',
         'milos_version': 'miloOS Version',
@@ -60,6 +84,87 @@ TRANSLATIONS = {
         'memory_percent': 'Memory %',
         'pid': 'PID',
         'user': 'User',
+        'loading': 'Loading…',
+        'breakdown': 'Per-device breakdown',
+        'device': 'Device',
+        'read': 'Read',
+        'write': 'Write',
+        'read_iops': 'Read IOPS',
+        'write_iops': 'Write IOPS',
+        'await': 'Await',
+        'read_await': 'Read await',
+        'write_await': 'Write await',
+        'service_time': 'Service time',
+        'queue_depth': 'Queue depth',
+        'in_flight': 'In flight',
+        'utilization': 'Utilization',
+        'packets_recv': 'Packets In',
+        'packets_sent': 'Packets Out',
+        'errors': 'Errors',
+        'drops': 'Drops',
+        'cpu_user': 'User',
+        'cpu_nice': 'Nice',
+        'cpu_system': 'System',
+        'cpu_irq': 'IRQ',
+        'cpu_softirq': 'SoftIRQ',
+        'cpu_steal': 'Steal',
+        'cpu_iowait': 'I/O Wait',
+        'io': 'I/O',
+        'psi_some': 'Some',
+        'psi_full': 'Full',
+        'stall_time': 'Stall time',
+        'psi_avg10': '10 s average',
+        'psi_unavailable': 'Pressure stall information is not available on this kernel',
+        'cgroup_breakdown': 'Per-group breakdown',
+        'cgroup': 'Group',
+        'audio': 'Audio',
+        'driver': 'Driver',
+        'dsp_load': 'DSP Load',
+        'quantum': 'Quantum',
+        'sample_rate': 'Rate',
+        'latency': 'Latency',
+        'xruns': 'Xruns',
+        'node_errors': 'node errors',
+        'node': 'Node',
+        'wait': 'Wait',
+        'busy': 'Busy',
+        'audio_unavailable': 'PipeWire is not running or pw-top is not installed',
+        'sched_latency': 'Wakeup Latency',
+        'measure_latency': 'Measure wakeup latency',
+        'maximum': 'Max',
+        'wakeups': 'Wakeups',
+        'policy': 'Policy',
+        'policy_other': 'SCHED_OTHER (real-time not permitted)',
+        'interrupts': 'Interrupts',
+        'hardware_irqs': 'Hardware interrupts',
+        'softirqs': 'Softirqs',
+        'per_cpu_distribution': 'Per-CPU distribution',
+        'source': 'Source',
+        'irq_rate': 'Rate',
+        'affinity': 'Affinity',
+        'effective_affinity': 'Effective',
+        'busiest_cpu': 'Busiest CPU',
+        'rt_threads': 'RT Threads',
+        'only_rt_threads': 'Only real-time and audio threads',
+        'tid': 'TID',
+        'thread': 'Thread',
+        'rt_priority': 'RT Priority',
+        'nice': 'Nice',
+        'last_cpu': 'CPU',
+        'problem': 'Problem',
+        'not_realtime': 'Audio thread not real-time',
+        'preempted_by': 'Preempted by',
+        'thermal': 'Usage, Frequency and Temperature',
+        'memory_history': 'Memory Usage',
+        'history_hint': 'Point at the graph for the busiest processes at that time',
+        'temperature': 'Temperature',
+        'throttling': 'Throttling',
+        'throttle_events': 'throttle events/s',
+        'governor': 'Governor',
+        'slowest_core': 'Slowest core',
+        'fastest_core': 'Fastest core',
+        'hottest_sensor': 'Hottest sensor',
+        'no_sensors': 'No temperature sensors found',
     },
     'es': {
         'title': 'Estadísticas del Sistema',
@@ -68,6 +173,7 @@ TRANSLATIONS = {
         'memory': 'Memoria',
         'disk': 'Disco',
         'network': 'Red',
+        'pressure': 'Presión',
         'processes': 'Procesos',
         'system_info': 'Información del Sistema',
         'milos_version': 'Versión de miloOS',
@@ -103,6 +209,87 @@ TRANSLATIONS = {
         'memory_percent': 'Memoria %',
         'pid': 'PID',
         'user': 'Usuario',
+        'loading': 'Cargando…',
+        'breakdown': 'Desglose por dispositivo',
+        'device': 'Dispositivo',
+        'read': 'Lectura',
+        'write': 'Escritura',
+        'read_iops': 'IOPS de Lectura',
+        'write_iops': 'IOPS de Escritura',
+        'await': 'Espera',
+        'read_await': 'Espera de lectura',
+        'write_await': 'Espera de escritura',
+        'service_time': 'Tiempo de servicio',
+        'queue_depth': 'Profundidad de cola',
+        'in_flight': 'En curso',
+        'utilization': 'Utilización',
+        'packets_recv': 'Paquetes Recibidos',
+        'packets_sent': 'Paquetes Enviados',
+        'errors': 'Errores',
+        'drops': 'Descartados',
+        'cpu_user': 'Usuario',
+        'cpu_nice': 'Nice',
+        'cpu_system': 'Sistema',
+        'cpu_irq': 'IRQ',
+        'cpu_softirq': 'SoftIRQ',
+        'cpu_steal': 'Robado',
+        'cpu_iowait': 'Espera de E/S',
+        'io': 'E/S',
+        'psi_some': 'Algunas',
+        'psi_full': 'Todas',
+        'stall_time': 'Tiempo detenido',
+        'psi_avg10': 'Media de 10 s',
+        'psi_unavailable': 'La información de presión no está disponible en este kernel',
+        'cgroup_breakdown': 'Desglose por grupo',
+        'cgroup': 'Grupo',
+        'audio': 'Audio',
+        'driver': 'Controlador',
+        'dsp_load': 'Carga DSP',
+        'quantum': 'Quantum',
+        'sample_rate': 'Frecuencia',
+        'latency': 'Latencia',
+        'xruns': 'Xruns',
+        'node_errors': 'errores de nodos',
+        'node': 'Nodo',
+        'wait': 'Espera',
+        'busy': 'Ocupado',
+        'audio_unavailable': 'PipeWire no está en ejecución o pw-top no está instalado',
+        'sched_latency': 'Latencia de Activación',
+        'measure_latency': 'Medir latencia de activación',
+        'maximum': 'Máx',
+        'wakeups': 'Activaciones',
+        'policy': 'Política',
+        'policy_other': 'SCHED_OTHER (tiempo real no permitido)',
+        'interrupts': 'Interrupciones',
+        'hardware_irqs': 'Interrupciones de hardware',
+        'softirqs': 'Softirqs',
+        'per_cpu_distribution': 'Distribución por CPU',
+        'source': 'Origen',
+        'irq_rate': 'Tasa',
+        'affinity': 'Afinidad',
+        'effective_affinity': 'Efectiva',
+        'busiest_cpu': 'CPU más cargada',
+        'rt_threads': 'Hilos RT',
+        'only_rt_threads': 'Solo hilos de tiempo real y de audio',
+        'tid': 'TID',
+        'thread': 'Hilo',
+        'rt_priority': 'Prioridad RT',
+        'nice': 'Nice',
+        'last_cpu': 'CPU',
+        'problem': 'Problema',
+        'not_realtime': 'Hilo de audio sin tiempo real',
+        'preempted_by': 'Interrumpido por',
+        'thermal': 'Uso, Frecuencia y Temperatura',
+        'memory_history': 'Uso de Memoria',
+        'history_hint': 'Señale el gráfico para ver los procesos más activos en ese momento',
+        'temperature': 'Temperatura',
+        'throttling': 'Limitación',
+        'throttle_events': 'eventos de limitación/s',
+        'governor': 'Gobernador',
+        'slowest_core': 'Núcleo más lento',
+        'fastest_core': 'Núcleo más rápido',
+        'hottest_sensor': 'Sensor más caliente',
+        'no_sensors': 'No se encontraron sensores de temperatura',
     }
 }
 
@@ -129,6 +316,407 @@ def format_bytes(bytes_val):
         bytes_val /= 1024.0
     return f"{bytes_val:.1f} PB"
 
+# Colors of the CPU time fields stacked in the core squares
+CPU_TIME_COLORS = {
+    'user': (0.2, 0.78, 0.35),
+    'nice': (0.6, 0.88, 0.6),
+    'system': (0.0, 0.48, 1.0),
+    'irq': (0.78, 0.15, 0.18),
+    'softirq': (1.0, 0.58, 0.0),
+    'steal': (0.6, 0.4, 0.8),
+    'iowait': (0.7, 0.7, 0.7),
+}
+
+# Colors of the frequency and temperature lines
+THERMAL_COLORS = {
+    'usage': (0.35, 0.34, 0.84),
+    'slowest_core': (0.0, 0.48, 1.0),
+    'fastest_core': (0.2, 0.78, 0.35),
+    'temperature': (1.0, 0.58, 0.0),
+    'throttling': (1.0, 0.23, 0.19),
+}
+
+# Colors of the pressure lines: some tasks stalled, all tasks stalled
+PRESSURE_COLORS = {
+    'some': (0.0, 0.48, 1.0),
+    'full': (1.0, 0.23, 0.19),
+}
+
+# Average disk wait in milliseconds from which it is shown as a problem;
+# a streaming recorder starts to drop audio well before this
+SLOW_DISK_AWAIT = 100.0
+
+# Seconds between samples by window activity. Hidden windows get no page
+# data, only the counters that keep the graph histories going. Sampling
+# four times a second while focused costs a /proc scan each time, so it
+# is only done when SYSSTATS_FAST_SAMPLING is set.
+FOCUSED_INTERVAL = 0.25 if os.environ.get('SYSSTATS_FAST_SAMPLING') else 1.0
+SAMPLE_INTERVALS = {'focused': FOCUSED_INTERVAL, 'visible': 1.0, 'hidden': 5.0}
+
+# Longest gap between recorded samples that is filled in on the graphs
+MAX_SAMPLE_GAP = 10.0
+
+CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache')), 'sysstats')
+INVENTORY_CACHE = os.path.join(CACHE_DIR, 'inventory.json')
+
+def get_inventory_key():
+    """Identify the boot, kernel and package state a hardware inventory belongs to"""
+    key = {'kernel': os.uname().release}
+    
+    try:
+        with open('/proc/sys/kernel/random/boot_id') as f:
+            key['boot_id'] = f.read().strip()
+    except:
+        key['boot_id'] = None
+    
+    try:
+        key['dpkg_mtime'] = os.stat(dpkg.DPKG_STATUS).st_mtime
+    except:
+        key['dpkg_mtime'] = None
+    
+    return key
+
+class InventoryCache:
+    """On-disk cache for static hardware facts
+
+    Entries are dropped as a whole when the machine reboots, the kernel
+    changes or the dpkg database is modified.
+    """
+
+    def __init__(self, path=INVENTORY_CACHE):
+        self.path = path
+        self.key = get_inventory_key()
+        self.lock = threading.Lock()
+        self.entries = self.load()
+
+    def load(self):
+        """Load cached entries that still match the current inventory key"""
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            if data.get('key') == self.key:
+                return data.get('entries', {})
+        except:
+            pass
+        return {}
+
+    def save(self):
+        """Write the cache atomically"""
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump({'key': self.key, 'entries': self.entries}, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Error saving inventory cache: {e}")
+
+    def get(self, name, probe, keep=None):
+        """Return a cached entry, running probe and storing its result on a miss
+
+        keep can reject results that should be probed again next time,
+        such as fallbacks used when a privileged command was refused.
+        """
+        with self.lock:
+            if name in self.entries:
+                return self.entries[name]
+        
+        value = probe()
+        if keep is None or keep(value):
+            with self.lock:
+                self.entries[name] = value
+                self.save()
+        return value
+
+def draw_grid(cr, width, height):
+    """Draw a graph background with horizontal grid lines"""
+    cr.set_source_rgb(0.96, 0.96, 0.96)
+    cr.rectangle(0, 0, width, height)
+    cr.fill()
+    
+    cr.set_source_rgb(0.9, 0.9, 0.9)
+    cr.set_line_width(1)
+    for i in range(5):
+        y = height * i / 4
+        cr.move_to(0, y)
+        cr.line_to(width, y)
+        cr.stroke()
+
+def nice_scale(value):
+    """Smallest 1, 2 or 5 times a power of ten that is at least value"""
+    if value <= 0:
+        return 1.0
+    magnitude = 10 ** math.floor(math.log10(value))
+    for step in (1, 2, 5, 10):
+        if value <= step * magnitude:
+            return step * magnitude
+    return 10 * magnitude
+
+def draw_points(cr, height, points, scale, rgb):
+    """Draw (x, value) points as a line with a filled area under it
+
+    NaN values are gaps in the history and break the line. Several
+    points may share a column, such as the min and max of merged slots.
+    """
+    # Split into runs of consecutive samples
+    runs = []
+    run = []
+    for x, value in points:
+        if value != value:
+            if run:
+                runs.append(run)
+                run = []
+            continue
+        run.append((x, height - (value / scale * height * 0.9)))
+    if run:
+        runs.append(run)
+    runs = [run for run in runs if len(run) > 1]
+    if not runs:
+        return
+    
+    # Draw graph line
+    cr.set_source_rgb(*rgb)
+    cr.set_line_width(2)
+    for run in runs:
+        cr.move_to(*run[0])
+        for x, y in run[1:]:
+            cr.line_to(x, y)
+    cr.stroke()
+    
+    # Fill area under curve
+    cr.set_source_rgba(*rgb, 0.2)
+    for run in runs:
+        cr.move_to(run[0][0], height)
+        for x, y in run:
+            cr.line_to(x, y)
+        cr.line_to(run[-1][0], height)
+        cr.close_path()
+    cr.fill()
+
+class HistoryGraph(Gtk.DrawingArea):
+    """Graph of one or more MetricHistory series that only draws what changed
+
+    The background and grid are rendered once per size into an image
+    surface, and the plot into a second one. When new samples arrive the
+    plot is scrolled left by their columns and only the newest segments
+    are drawn. Everything is redrawn when the widget is resized or the
+    span, scale or histories change.
+
+    Spans with more slots than pixels are reduced by the history to at
+    most one min/max pair per pixel column, drawn as an envelope, so
+    long spans cost no more to draw than short ones.
+
+    Each source is a (get_history, rgb) pair; all sources share the
+    vertical scale.
+    """
+
+    def __init__(self, get_span, *sources):
+        super().__init__()
+        self.get_span = get_span
+        self.sources = sources
+        self.size = None
+        self.background = None
+        self.plot = None
+        self.state = None
+        self.connect('draw', self.on_draw)
+    
+    def create_surface(self, width, height):
+        """Image surface matching the widget's size and scale factor"""
+        scale = self.get_scale_factor()
+        return self.get_window().create_similar_image_surface(cairo.FORMAT_ARGB32, width * scale, height * scale, scale)
+    
+    def on_draw(self, widget, cr):
+        width = self.get_allocated_width()
+        height = self.get_allocated_height()
+        if width < 2 or height < 2:
+            return False
+        
+        if self.size != (width, height):
+            self.size = (width, height)
+            self.background = self.create_surface(width, height)
+            draw_grid(cairo.Context(self.background), width, height)
+            self.state = None
+        
+        histories = [get_history() for get_history, rgb in self.sources]
+        span = self.get_span()
+        lanes, end = self.lanes(histories, span, width)
+        values = [value for source_lanes in lanes for value in source_lanes[-1] if value == value]
+        scale = nice_scale(max(values)) if values else 1.0
+        
+        if not self.update_plot(histories, span, lanes, end, scale):
+            self.redraw_plot(histories, span, lanes, end, scale)
+        
+        cr.set_source_surface(self.background, 0, 0)
+        cr.paint()
+        cr.set_source_surface(self.plot, 0, 0)
+        cr.paint()
+        return False
+    
+    def lanes(self, histories, span, width):
+        """Arrays to draw for each history and the number of their last point"""
+        lanes = []
+        end = None
+        for history in histories:
+            series = history.series(span, columns=width)
+            if series['factor'] > 1:
+                lanes.append((series['min'], series['max']))
+            else:
+                lanes.append((series['mean'],))
+            # Histories sampled together share their last slot; the
+            # newest one sets the time axis
+            end = series['end'] if end is None else max(end, series['end'])
+        return lanes, end
+    
+    def refresh(self):
+        """Queue a redraw unless the plot would look the same"""
+        state = self.state
+        if state is not None and state['span'] == self.get_span():
+            histories = [get_history() for get_history, rgb in self.sources]
+            if all(history is old for history, old in zip(histories, state['histories'])):
+                lanes, end = self.lanes(histories, state['span'], self.size[0])
+                if all(lane.tobytes() == old.tobytes()
+                       for source_lanes, old_lanes in zip(lanes, state['lanes'])
+                       for lane, old in zip(source_lanes, old_lanes)):
+                    return
+        self.queue_draw()
+    
+    def x_of(self, index, end):
+        """Horizontal position of a series point in the plot surface"""
+        state = self.state
+        return (end - state['first_end'] + index) * state['step'] - state['shift']
+    
+    def points(self, lanes, end, first, last):
+        """(x, value) points for series indexes first to last, in drawing order"""
+        return [
+            (self.x_of(i, end), lane[i])
+            for i in range(first, last)
+            for lane in lanes
+        ]
+    
+    def draw_sources(self, cr, lanes, end, first):
+        """Draw every source from series index first onwards"""
+        height = self.size[1]
+        for source_lanes, (get_history, rgb) in zip(lanes, self.sources):
+            count = len(source_lanes[0])
+            draw_points(cr, height, self.points(source_lanes, end, first, count), self.state['scale'], rgb)
+    
+    def redraw_plot(self, histories, span, lanes, end, scale):
+        """Draw the whole plot"""
+        width, height = self.size
+        count = max(len(source_lanes[0]) for source_lanes in lanes)
+        self.plot = self.create_surface(width, height)
+        self.state = {
+            'histories': histories,
+            'span': span,
+            'scale': scale,
+            'lanes': lanes,
+            'end': end,
+            'first_end': end,
+            'step': width / max(count - 1, 1),
+            'shift': 0,
+        }
+        self.draw_sources(cairo.Context(self.plot), lanes, end, 0)
+    
+    def update_plot(self, histories, span, lanes, end, scale):
+        """Scroll the plot and draw the new samples
+
+        Returns False when the plot has to be redrawn instead.
+        """
+        state = self.state
+        if (state is None or state['span'] != span or state['scale'] != scale
+                or any(history is not old for history, old in zip(histories, state['histories']))):
+            return False
+        
+        pairs = [
+            (lane, old)
+            for source_lanes, old_lanes in zip(lanes, state['lanes'])
+            if len(source_lanes) == len(old_lanes)
+            for lane, old in zip(source_lanes, old_lanes)
+        ]
+        count = len(lanes[0][0])
+        if len(pairs) != sum(len(source_lanes) for source_lanes in lanes) or any(
+                len(lane) != count or len(old) != count for lane, old in pairs):
+            return False
+        
+        # Points before the last drawn one must be unchanged, only shifted;
+        # the last drawn slot may still be collecting samples
+        advance = end - state['end']
+        kept = count - advance - 1
+        if advance < 0 or kept < 1:
+            return False
+        for lane, old in pairs:
+            if lane[:kept].tobytes() != old[advance:advance + kept].tobytes():
+                return False
+        if advance == 0 and all(lane[kept] == old[kept] for lane, old in pairs):
+            return True
+        
+        width, height = self.size
+        shift = round((end - state['first_end']) * state['step'])
+        plot = self.create_surface(width, height)
+        cr = cairo.Context(plot)
+        cr.set_source_surface(self.plot, state['shift'] - shift, 0)
+        cr.paint()
+        
+        state.update({'lanes': lanes, 'end': end, 'shift': shift})
+        self.plot = plot
+        
+        # Clear from the last unchanged point and draw from the one before
+        # it, clipped, so its line cap is restored without painting twice
+        start = kept - 1
+        clip_x = math.floor(self.x_of(start, end))
+        cr.rectangle(clip_x, 0, width - clip_x, height)
+        cr.clip()
+        cr.set_operator(cairo.OPERATOR_CLEAR)
+        cr.paint()
+        cr.set_operator(cairo.OPERATOR_OVER)
+        self.draw_sources(cr, lanes, end, max(start - 1, 0))
+        return True
+
+def sync_list_store(store, rows, key_column=0):
+    """Update a ListStore in place from rows keyed by one column
+
+    Changed rows are updated, new keys appended and missing keys removed,
+    so scrolling, selection and sorting survive a refresh.
+    """
+    wanted = {row[key_column]: row for row in rows}
+    
+    # Take the rows before changing any: on a sorted store set() moves the
+    # row, and iterating the store meanwhile would skip or revisit rows.
+    # ListStore iters stay valid while rows move or others are removed.
+    entries = [(model_row.iter, model_row[key_column]) for model_row in store]
+    
+    updates = []
+    stale = []
+    for tree_iter, key in entries:
+        row = wanted.pop(key, None)
+        if row is None:
+            stale.append(tree_iter)
+            continue
+        changed = [i for i, value in enumerate(row) if store.get_value(tree_iter, i) != value]
+        if changed:
+            updates.append((tree_iter, changed, [row[i] for i in changed]))
+    
+    for tree_iter, columns, values in updates:
+        store.set(tree_iter, columns, values)
+    
+    for tree_iter in stale:
+        store.remove(tree_iter)
+    
+    for row in wanted.values():
+        store.append(row)
+
+def run_in_background(func, callback):
+    """Run func in a worker thread and hand its result to callback on the main loop"""
+    def worker():
+        try:
+            result = func()
+        except Exception as e:
+            print(f"Background task failed: {e}")
+            result = None
+        GLib.idle_add(callback, result)
+    
+    threading.Thread(target=worker, daemon=True).start()
+
 class SysStatsWindow(Gtk.Window):
     def __init__(self):
         super().__init__(title=_('title'))
@@ -136,14 +724,30 @@ class SysStatsWindow(Gtk.Window):
         self.set_default_size(900, 550)
         self.set_position(Gtk.WindowPosition.CENTER)
         
-        # Network history for graphs
-        self.net_download_history = deque(maxlen=60)
-        self.net_upload_history = deque(maxlen=60)
-        self.last_net_io = psutil.net_io_counters()
+        # Network and disk activity history for graphs
+        self.histories = self.create_histories()
+        
+        # Time span shown by the graphs of each page
+        self.graph_spans = {
+            'cpu': VIEW_SPANS['1m'],
+            'memory': VIEW_SPANS['1m'],
+            'disk': VIEW_SPANS['1m'],
+            'network': VIEW_SPANS['1m'],
+            'pressure': VIEW_SPANS['1m'],
+            'audio': VIEW_SPANS['1m'],
+        }
+        
+        # Wakeup latency is measured while enabled on the CPU page, also
+        # while the window is hidden
+        self.latency_enabled = False
+        self.latency = None
         
-        # Disk activity history
-        self.disk_activity_history = deque(maxlen=60)
-        self.last_disk_io = psutil.disk_io_counters()
+        # Pressure graphs show either the stall time measured each sample
+        # ('stall') or the kernel's 10 second average ('avg10')
+        self.pressure_view = 'stall'
+        
+        # Last collected memory usage, drawn by the module squares
+        self.memory_percent = 0
         
         # Apply miloOS styling
         css_provider = Gtk.CssProvider()
@@ -222,21 +826,58 @@ class SysStatsWindow(Gtk.Window):
         header = self.create_header()
         main_box.pack_start(header, False, False, 0)
         
+        # Static hardware facts survive restarts until the next reboot
+        self.inventory = InventoryCache()
+        
         # Content stack
         self.content_stack = Gtk.Stack()
         self.content_stack.set_transition_type(Gtk.StackTransitionType.CROSSFADE)
         main_box.pack_start(self.content_stack, True, True, 0)
         
-        # Create pages
-        self.create_overview_page()
-        self.create_cpu_page()
-        self.create_memory_page()
-        self.create_disk_page()
-        self.create_network_page()
-        self.create_processes_page()
-        
-        # Update timer - faster for network graphs
-        GLib.timeout_add(1000, self.update_stats)
+        # Pages are built the first time their tab is opened
+        self.page_builders = {
+            'overview': self.create_overview_page,
+            'cpu': self.create_cpu_page,
+            'memory': self.create_memory_page,
+            'disk': self.create_disk_page,
+            'network': self.create_network_page,
+            'pressure': self.create_pressure_page,
+            'audio': self.create_audio_page,
+            'interrupts': self.create_interrupts_page,
+            'threads': self.create_threads_page,
+            'processes': self.create_processes_page,
+        }
+        self.ensure_page('overview')
+        
+        # Sampling follows window activity: faster while focused, and only
+        # the graph counters while hidden
+        self.activity = None
+        self.window_state = Gdk.WindowState(0)
+        self.obscured = False
+        self.add_events(Gdk.EventMask.VISIBILITY_NOTIFY_MASK)
+        self.connect("window-state-event", self.on_window_state)
+        self.connect("visibility-notify-event", self.on_visibility)
+        self.connect("map-event", self.on_map_changed)
+        self.connect("unmap-event", self.on_map_changed)
+        self.connect("notify::is-active", self.on_active_changed)
+        
+        # Statistics come from the collector daemon, shared with other
+        # windows and scripts, and are applied on the main loop so drawing
+        # never waits on psutil. The client connects, starting the daemon
+        # if needed, in its own thread so the first paint does not wait;
+        # without the daemon they are collected by a thread of our own.
+        self.destroyed = False
+        self.history_recorder = None
+        self.sampler = CollectorClient(
+            self.on_snapshot, on_unavailable=lambda: GLib.idle_add(self.start_own_sampler))
+        self.connect("destroy", self.on_destroy)
+        self.sampler.start()
+        
+        # Earlier recordings are loaded in the background so the graphs
+        # start with past data
+        self.pending_samples = []
+        cutoff = time.time()
+        run_in_background(lambda: self.load_recorded_history(cutoff), self.on_recorded_history)
         
     def create_header(self):
         """Create header with tab buttons"""
@@ -274,6 +915,30 @@ class SysStatsWindow(Gtk.Window):
         self.network_btn.connect("toggled", self.on_tab_changed, "network")
         header_box.pack_start(self.network_btn, False, False, 0)
         
+        self.pressure_btn = Gtk.RadioButton(label=_('pressure'))
+        self.pressure_btn.join_group(self.overview_btn)
+        self.pressure_btn.get_style_context().add_class("tab-button")
+        self.pressure_btn.connect("toggled", self.on_tab_changed, "pressure")
+        header_box.pack_start(self.pressure_btn, False, False, 0)
+        
+        self.audio_btn = Gtk.RadioButton(label=_('audio'))
+        self.audio_btn.join_group(self.overview_btn)
+        self.audio_btn.get_style_context().add_class("tab-button")
+        self.audio_btn.connect("toggled", self.on_tab_changed, "audio")
+        header_box.pack_start(self.audio_btn, False, False, 0)
+        
+        self.interrupts_btn = Gtk.RadioButton(label=_('interrupts'))
+        self.interrupts_btn.join_group(self.overview_btn)
+        self.interrupts_btn.get_style_context().add_class("tab-button")
+        self.interrupts_btn.connect("toggled", self.on_tab_changed, "interrupts")
+        header_box.pack_start(self.interrupts_btn, False, False, 0)
+        
+        self.threads_btn = Gtk.RadioButton(label=_('rt_threads'))
+        self.threads_btn.join_group(self.overview_btn)
+        self.threads_btn.get_style_context().add_class("tab-button")
+        self.threads_btn.connect("toggled", self.on_tab_changed, "threads")
+        header_box.pack_start(self.threads_btn, False, False, 0)
+        
         self.processes_btn = Gtk.RadioButton(label=_('processes'))
         self.processes_btn.join_group(self.overview_btn)
         self.processes_btn.get_style_context().add_class("tab-button")
@@ -285,11 +950,132 @@ class SysStatsWindow(Gtk.Window):
     def on_tab_changed(self, button, page_name):
         """Handle tab change"""
         if button.get_active():
+            self.ensure_page(page_name)
             self.content_stack.set_visible_child_name(page_name)
-            self.update_stats()
+            if hasattr(self, 'sampler'):
+                self.request_samples()
+    
+    def ensure_page(self, page_name):
+        """Build a page if it has not been created yet"""
+        if self.content_stack.get_child_by_name(page_name) is None:
+            self.page_builders[page_name]()
+            self.content_stack.get_child_by_name(page_name).show_all()
+    
+    def on_window_state(self, widget, event):
+        self.window_state = event.new_window_state
+        self.update_activity()
+        return False
+    
+    def on_visibility(self, widget, event):
+        self.obscured = event.state == Gdk.VisibilityState.FULLY_OBSCURED
+        self.update_activity()
+        return False
+    
+    def on_map_changed(self, widget, event):
+        self.update_activity()
+        return False
+    
+    def on_active_changed(self, widget, pspec):
+        self.update_activity()
+    
+    def update_activity(self):
+        """Adapt sampling to whether the window is focused, visible or hidden"""
+        hidden_states = Gdk.WindowState.ICONIFIED | Gdk.WindowState.WITHDRAWN
+        if not self.get_mapped() or self.obscured or self.window_state & hidden_states:
+            activity = 'hidden'
+        elif self.is_active():
+            activity = 'focused'
+        else:
+            activity = 'visible'
+        
+        if activity != self.activity:
+            self.activity = activity
+            if hasattr(self, 'sampler'):
+                self.request_samples()
+    
+    def request_samples(self):
+        """Ask the sampler for the visible page at the current activity's rate"""
+        activity = self.activity or 'visible'
+        pages = [] if activity == 'hidden' else [self.content_stack.get_visible_child_name()]
+        if self.latency_enabled:
+            pages.append('latency')
+        self.sampler.set_pages(pages, SAMPLE_INTERVALS[activity])
+    
+    def create_histories(self):
+        """Create the histories backing the graphs"""
+        histories = {
+            'cpu': MetricHistory(),
+            'memory': MetricHistory(),
+            'net_recv': MetricHistory(),
+            'net_sent': MetricHistory(),
+            'disk': MetricHistory(),
+        }
+        for resource in PRESSURE_RESOURCES:
+            for kind in PRESSURE_KINDS:
+                histories[f'psi_{resource}_{kind}'] = MetricHistory()
+                histories[f'psi_{resource}_{kind}_avg10'] = MetricHistory()
+        histories['dsp_load'] = MetricHistory()
+        for name in ('cpu_freq_low', 'cpu_freq_high', 'cpu_temp', 'cpu_throttle'):
+            histories[name] = MetricHistory()
+        return histories
+    
+    def load_recorded_history(self, cutoff):
+        """Build histories from the ring file, up to cutoff"""
+        recorder = Recorder()
+        if not recorder.open_readonly():
+            return None
+        
+        histories = self.create_histories()
+        previous = None
+        try:
+            for sample in recorder.records():
+                if sample['time'] > cutoff:
+                    break
+                # Samples recorded less often than once a second cover the gap
+                duration = min(sample['time'] - previous, MAX_SAMPLE_GAP) if previous else 0.0
+                previous = sample['time']
+                histories['cpu'].add(sample['time'], sample['cpu'], duration)
+                histories['memory'].add(sample['time'], sample['memory'], duration)
+                histories['net_recv'].add(sample['time'], sample['net_recv'], duration)
+                histories['net_sent'].add(sample['time'], sample['net_sent'], duration)
+                histories['disk'].add(sample['time'], sample['disk_read'] + sample['disk_write'], duration)
+        finally:
+            recorder.close()
+        return histories
+    
+    def on_recorded_history(self, histories):
+        """Switch to the loaded histories, adding samples taken meanwhile"""
+        if histories:
+            for name, timestamp, value, duration in self.pending_samples:
+                histories[name].add(timestamp, value, duration)
+            self.histories = histories
+            for graph in ('download_graph', 'upload_graph', 'disk_activity_graph', 'dsp_load_graph',
+                          'cpu_usage_graph', 'cpu_freq_graph', 'cpu_temp_graph', 'memory_graph'):
+                if hasattr(self, graph):
+                    getattr(self, graph).queue_draw()
+            for widget in getattr(self, 'pressure_widgets', {}).values():
+                widget['graph'].queue_draw()
+        self.pending_samples = None
+        return False
+    
+    def start_own_sampler(self):
+        """Collect statistics in a thread of our own when no daemon can be reached"""
+        if not self.destroyed:
+            recorder = Recorder()
+            self.sampler = Sampler(self.on_snapshot, recorder=recorder if recorder.open() else None)
+            self.sampler.start()
+            self.request_samples()
+        return False
+    
+    def on_destroy(self, widget):
+        """Stop background sampling when the window is closed"""
+        self.destroyed = True
+        self.sampler.stop()
+        if self.history_recorder is not None:
+            self.history_recorder.close()
     
     def get_system_info(self):
-        """Get system information"""
+        """Get system information that is cheap to read"""
         info = {}
         
         # miloOS version and distributor
@@ -312,26 +1098,6 @@ class SysStatsWindow(Gtk.Window):
         # Desktop environment
         info['desktop'] = os.environ.get('XDG_CURRENT_DESKTOP', 'XFCE')
         
-        # XFCE version
-        try:
-            result = subprocess.run(['xfce4-about', '--version'], 
-                                  capture_output=True, text=True, timeout=2)
-            if result.returncode == 0:
-                for line in result.stdout.split('\n'):
-                    if 'xfce4-about' in line.lower():
-                        parts = line.split()
-                        if len(parts) >= 2:
-                            version = parts[-1].strip()
-                            # Remove any trailing parenthesis
-                            version = version.rstrip(')')
-                            info['xfce_version'] = version
-                            break
-        except:
-            pass
-        
-        if 'xfce_version' not in info:
-            info['xfce_version'] = 'N/A'
-        
         # GTK version
         info['gtk_version'] = f"{Gtk.get_major_version()}.{Gtk.get_minor_version()}.{Gtk.get_micro_version()}"
         
@@ -344,26 +1110,6 @@ class SysStatsWindow(Gtk.Window):
             elif os.environ.get('DISPLAY'):
                 info['window_system'] = 'X11'
         
-        # GPU
-        try:
-            result = subprocess.run(['lspci'], capture_output=True, text=True)
-            if result.returncode == 0:
-                for line in result.stdout.split('\n'):
-                    if 'VGA compatible controller' in line or 'Display controller' in line or '3D controller' in line:
-                        parts = line.split(':', 2)
-                        if len(parts) >= 3:
-                            gpu = parts[2].strip()
-                            # Clean up the GPU name
-                            if '(rev' in gpu:
-                                gpu = gpu.split('(rev')[0].strip()
-                            info['gpu'] = gpu
-                            break
-        except:
-            pass
-        
-        if 'gpu' not in info:
-            info['gpu'] = 'Unknown GPU'
-        
         # CPU
         try:
             with open('/proc/cpuinfo') as f:
@@ -391,11 +1137,41 @@ class SysStatsWindow(Gtk.Window):
         minutes = (uptime_seconds % 3600) // 60
         info['uptime'] = f"{days}d {hours}h {minutes}m"
         
-        # Packages
+        return info
+    
+    def get_hardware_info(self):
+        """Get system information that needs external commands"""
+        info = {}
+        
+        # XFCE version
         try:
-            result = subprocess.run(['dpkg', '-l'], capture_output=True, text=True)
-            info['packages'] = str(len([l for l in result.stdout.split('\n') if l.startswith('ii')]))
+            result = subprocess.run(['xfce4-about', '--version'], 
+                                  capture_output=True, text=True, timeout=2)
+            if result.returncode == 0:
+                for line in result.stdout.split('\n'):
+                    if 'xfce4-about' in line.lower():
+                        parts = line.split()
+                        if len(parts) >= 2:
+                            version = parts[-1].strip()
+                            # Remove any trailing parenthesis
+                            version = version.rstrip(')')
+                            info['xfce_version'] = version
+                            break
         except:
+            pass
+        
+        if 'xfce_version' not in info:
+            info['xfce_version'] = 'N/A'
+        
+        # GPU, read from sysfs and named from pci.ids
+        info['gpu'] = sysfs.get_gpu_name() or 'Unknown GPU'
+        
+        # Packages, read straight from the dpkg database
+        counts = dpkg.count_installed()
+        if counts:
+            info['packages'] = str(counts['total'])
+            info['package_counts'] = counts
+        else:
             info['packages'] = 'N/A'
         
         return info
@@ -405,8 +1181,12 @@ class SysStatsWindow(Gtk.Window):
         page = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
         page.get_style_context().add_class("content-area")
         
-        # Get system info
+        # Get system info; fields needing external commands are filled in
+        # by a background probe
         sys_info = self.get_system_info()
+        self.distributor = sys_info['distributor']
+        for key in ('xfce_version', 'gpu', 'packages'):
+            sys_info[key] = _('loading')
         
         # Create grid for info
         grid = Gtk.Grid()
@@ -436,35 +1216,57 @@ class SysStatsWindow(Gtk.Window):
         row += 1
         
         info_items = [
-            (_('milos_version'), sys_info['os']),
-            (_('kernel'), sys_info['kernel']),
-            (_('desktop_env'), sys_info['desktop']),
-            (_('xfce_version'), sys_info.get('xfce_version', 'N/A')),
-            (_('gtk_version'), sys_info.get('gtk_version', 'N/A')),
-            (_('window_system'), sys_info.get('window_system', 'N/A')),
-            (_('gpu'), sys_info.get('gpu', 'N/A')),
-            (_('processor'), sys_info.get('cpu', 'N/A')),
-            (_('total_memory'), sys_info.get('ram', 'N/A')),
-            (_('packages'), sys_info['packages']),
-            (_('uptime'), sys_info['uptime'])
+            ('os', _('milos_version')),
+            ('kernel', _('kernel')),
+            ('desktop', _('desktop_env')),
+            ('xfce_version', _('xfce_version')),
+            ('gtk_version', _('gtk_version')),
+            ('window_system', _('window_system')),
+            ('gpu', _('gpu')),
+            ('cpu', _('processor')),
+            ('ram', _('total_memory')),
+            ('packages', _('packages')),
+            ('uptime', _('uptime'))
         ]
         
-        for label_text, value_text in info_items:
+        self.overview_values = {}
+        for key, label_text in info_items:
             label = Gtk.Label()
             label.set_markup(f"<b>{label_text}:</b>")
             label.set_halign(Gtk.Align.END)
             label.set_valign(Gtk.Align.START)
             grid.attach(label, 0, row, 1, 1)
             
-            value = Gtk.Label(label=value_text)
+            value = Gtk.Label(label=sys_info.get(key, 'N/A'))
             value.set_halign(Gtk.Align.START)
             value.set_line_wrap(True)
             value.set_max_width_chars(50)
             grid.attach(value, 1, row, 1, 1)
+            self.overview_values[key] = value
             row += 1
         
         page.pack_start(grid, True, True, 0)
         self.content_stack.add_named(page, "overview")
+        
+        run_in_background(
+            lambda: self.inventory.get('hardware', self.get_hardware_info),
+            self.on_hardware_info
+        )
+    
+    def on_hardware_info(self, info):
+        """Fill in overview fields probed in the background"""
+        for key, value in (info or {}).items():
+            if key in self.overview_values:
+                self.overview_values[key].set_text(value)
+        
+        # Split by architecture and origin; packages without an Origin
+        # field come from the distributor's archive
+        counts = (info or {}).get('package_counts')
+        if counts:
+            by_arch = ', '.join(f"{arch or '?'}: {n}" for arch, n in sorted(counts['architectures'].items()))
+            by_origin = ', '.join(f"{origin or self.distributor}: {n}" for origin, n in sorted(counts['origins'].items()))
+            self.overview_values['packages'].set_tooltip_text(f"{by_arch}\n{by_origin}")
+        return False
     
     def get_cpu_name(self):
         """Get CPU model name"""
@@ -478,31 +1280,28 @@ class SysStatsWindow(Gtk.Window):
         return 'Unknown CPU'
     
     def draw_cpu_core(self, widget, cr, core_index):
-        """Draw CPU core usage square"""
+        """Draw CPU core usage square, stacked by kind of CPU time"""
         width = widget.get_allocated_width()
         height = widget.get_allocated_height()
         
-        # Get usage for this core
-        usage = self.cpu_core_widgets[core_index]['usage'] if core_index < len(self.cpu_core_widgets) else 0
+        # Get time breakdown for this core
+        times = self.cpu_core_widgets[core_index]['times'] if core_index < len(self.cpu_core_widgets) else {}
         
         # Background
         cr.set_source_rgb(0.9, 0.9, 0.9)
         cr.rectangle(0, 0, width, height)
         cr.fill()
         
-        # Usage fill (from bottom)
-        fill_height = height * (usage / 100.0)
-        
-        # Color based on usage
-        if usage < 50:
-            cr.set_source_rgb(0.2, 0.78, 0.35)  # Green
-        elif usage < 80:
-            cr.set_source_rgb(1.0, 0.77, 0.25)  # Orange
-        else:
-            cr.set_source_rgb(0.78, 0.15, 0.18)  # Red
-        
-        cr.rectangle(0, height - fill_height, width, fill_height)
-        cr.fill()
+        # One band per field, stacked from the bottom
+        bottom = height
+        for field in BREAKDOWN_FIELDS:
+            band = height * times.get(field, 0.0) / 100.0
+            if band <= 0:
+                continue
+            cr.set_source_rgb(*CPU_TIME_COLORS[field])
+            cr.rectangle(0, bottom - band, width, band)
+            cr.fill()
+            bottom -= band
         
         # Border
         cr.set_source_rgb(0.7, 0.7, 0.7)
@@ -559,10 +1358,17 @@ class SysStatsWindow(Gtk.Window):
             percent_label.get_style_context().add_class("stat-value")
             core_box.pack_start(percent_label, False, False, 0)
             
+            # Current frequency, when cpufreq reports it
+            freq_label = Gtk.Label(label="")
+            freq_label.get_style_context().add_class("stat-value")
+            core_box.pack_start(freq_label, False, False, 0)
+            
             self.cpu_core_widgets.append({
                 'drawing': drawing,
                 'label': percent_label,
-                'usage': 0
+                'freq_label': freq_label,
+                'usage': 0,
+                'times': {}
             })
             
             row_pos = i // cols
@@ -570,7 +1376,26 @@ class SysStatsWindow(Gtk.Window):
             self.cpu_cores_grid.attach(core_box, col_pos, row_pos, 1, 1)
         
         cores_box.pack_start(self.cpu_cores_grid, False, False, 0)
-        page.pack_start(cores_box, False, False, 0)
+        
+        # Legend for the stacked CPU time fields
+        legend = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=12)
+        legend.set_halign(Gtk.Align.CENTER)
+        for field in BREAKDOWN_FIELDS:
+            r, g, b = (int(channel * 255) for channel in CPU_TIME_COLORS[field])
+            item = Gtk.Label()
+            item.set_markup(f"<span foreground='#{r:02x}{g:02x}{b:02x}'>■</span> {_('cpu_' + field)}")
+            item.get_style_context().add_class("stat-value")
+            legend.pack_start(item, False, False, 0)
+        cores_box.pack_start(legend, False, False, 0)
+        
+        # Wakeup latency next to the core squares
+        usage_row = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=30)
+        usage_row.set_halign(Gtk.Align.CENTER)
+        usage_row.pack_start(cores_box, False, False, 0)
+        usage_row.pack_start(self.create_latency_box(), False, False, 0)
+        page.pack_start(usage_row, False, False, 0)
+        
+        page.pack_start(self.create_thermal_box(), False, False, 0)
         
         # Separator
         sep = Gtk.Separator(orientation=Gtk.Orientation.HORIZONTAL)
@@ -643,6 +1468,17 @@ class SysStatsWindow(Gtk.Window):
             grid.attach(value, 1, row, 1, 1)
             row += 1
         
+        # Governor
+        label = Gtk.Label()
+        label.set_markup(f"<b>{_('governor')}:</b>")
+        label.set_halign(Gtk.Align.END)
+        grid.attach(label, 0, row, 1, 1)
+        
+        self.cpu_governor_label = Gtk.Label(label="–")
+        self.cpu_governor_label.set_halign(Gtk.Align.START)
+        grid.attach(self.cpu_governor_label, 1, row, 1, 1)
+        row += 1
+        
         # Usage
         label = Gtk.Label()
         label.set_markup(f"<b>{_('usage')}:</b>")
@@ -656,6 +1492,156 @@ class SysStatsWindow(Gtk.Window):
         page.pack_start(grid, True, True, 0)
         self.content_stack.add_named(page, "cpu")
     
+    def create_thermal_box(self):
+        """Create the frequency and temperature graphs"""
+        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=8)
+        
+        title = Gtk.Label()
+        title.set_markup(f"<span size='11000' weight='bold'>{_('thermal')}</span>")
+        box.pack_start(title, False, False, 0)
+        
+        graphs_row = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=20, homogeneous=True)
+        self.thermal_labels = {}
+        graphs = []
+        for name, series in (
+            ('usage', (('usage', 'cpu'),)),
+            ('frequency', (('slowest_core', 'cpu_freq_low'), ('fastest_core', 'cpu_freq_high'))),
+            ('temperature', (('temperature', 'cpu_temp'), ('throttling', 'cpu_throttle'))),
+        ):
+            column = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=6)
+            
+            legend = Gtk.Label()
+            legend.set_markup('    '.join(
+                "<span foreground='#{:02x}{:02x}{:02x}'>■</span> {}".format(
+                    *(int(channel * 255) for channel in THERMAL_COLORS[key]), _(key))
+                for key, history in series
+            ))
+            legend.get_style_context().add_class("stat-value")
+            legend.set_halign(Gtk.Align.START)
+            column.pack_start(legend, False, False, 0)
+            
+            graph = HistoryGraph(lambda: self.graph_spans['cpu'], *[
+                (lambda history=history: self.histories[history], THERMAL_COLORS[key])
+                for key, history in series
+            ])
+            graph.set_size_request(-1, 90)
+            column.pack_start(graph, False, False, 0)
+            graphs.append(graph)
+            
+            label = Gtk.Label(label="–")
+            label.get_style_context().add_class("stat-value")
+            label.set_halign(Gtk.Align.START)
+            column.pack_start(label, False, False, 0)
+            self.thermal_labels[name] = label
+            
+            graphs_row.pack_start(column, True, True, 0)
+        self.cpu_usage_graph, self.cpu_freq_graph, self.cpu_temp_graph = graphs
+        self.add_process_tooltip(self.cpu_usage_graph, 'cpu', 'cpu')
+        self.thermal_labels['usage'].set_text(_('history_hint'))
+        self.thermal_labels['usage'].set_line_wrap(True)
+        box.pack_start(graphs_row, False, False, 0)
+        
+        box.pack_start(self.create_span_selector('cpu', graphs), False, False, 0)
+        return box
+    
+    def add_process_tooltip(self, graph, history_name, page_name):
+        """Show the busiest processes recorded at the time under the pointer"""
+        graph.set_has_tooltip(True)
+        graph.connect('query-tooltip', self.on_history_tooltip, history_name, page_name)
+    
+    def on_history_tooltip(self, widget, x, y, keyboard, tooltip, history_name, page_name):
+        history = self.histories[history_name]
+        if history.last_time is None:
+            return False
+        if self.history_recorder is None or self.history_recorder.map is None:
+            # Opened on first use; the ring file may not exist yet
+            self.history_recorder = Recorder()
+            self.history_recorder.open_readonly()
+        
+        # The right edge of the graph is the newest sample
+        span = self.graph_spans[page_name]
+        timestamp = history.last_time - span * (1 - x / max(widget.get_allocated_width(), 1))
+        sample = self.history_recorder.record_at(timestamp)
+        if sample is None or timestamp - sample['time'] > MAX_SAMPLE_GAP:
+            return False
+        
+        when = time.strftime('%H:%M:%S' if span < VIEW_SPANS['24h'] else '%a %H:%M', time.localtime(sample['time']))
+        lines = [f"{when}   {_('cpu')} {sample['cpu']:.0f}%   {_('memory')} {sample['memory']:.0f}%"]
+        lines += [
+            f"{name} ({pid}): {_('cpu')} {cpu:.0f}%, {_('memory')} {memory:.1f}%"
+            for pid, name, cpu, memory in sample['processes']
+        ]
+        tooltip.set_text('\n'.join(lines))
+        return True
+    
+    def create_latency_box(self):
+        """Create the wakeup latency histogram and figures"""
+        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
+        
+        title = Gtk.Label()
+        title.set_markup(f"<span size='11000' weight='bold'>{_('sched_latency')}</span>")
+        box.pack_start(title, False, False, 0)
+        
+        toggle = Gtk.CheckButton(label=_('measure_latency'))
+        toggle.set_active(self.latency_enabled)
+        toggle.connect("toggled", self.on_latency_toggled)
+        box.pack_start(toggle, False, False, 0)
+        
+        self.latency_histogram = Gtk.DrawingArea()
+        self.latency_histogram.set_size_request(240, 100)
+        self.latency_histogram.connect('draw', self.draw_latency_histogram)
+        box.pack_start(self.latency_histogram, False, False, 0)
+        
+        self.latency_label = Gtk.Label(label="")
+        self.latency_label.get_style_context().add_class("stat-value")
+        self.latency_label.set_halign(Gtk.Align.START)
+        box.pack_start(self.latency_label, False, False, 0)
+        
+        return box
+    
+    def on_latency_toggled(self, button):
+        """Start or stop the latency probe"""
+        self.latency_enabled = button.get_active()
+        if not self.latency_enabled:
+            self.latency = None
+            self.latency_label.set_text("")
+            self.latency_histogram.queue_draw()
+        self.request_samples()
+    
+    def draw_latency_histogram(self, widget, cr):
+        """Draw wakeup latency buckets, heights on a log scale"""
+        width = widget.get_allocated_width()
+        height = widget.get_allocated_height() - 14
+        draw_grid(cr, width, height)
+        
+        histogram = self.latency['histogram'] if self.latency else []
+        if histogram:
+            top = math.log10(max(histogram) + 1) or 1.0
+            bar = width / len(histogram)
+            for bucket, count in enumerate(histogram):
+                if not count:
+                    continue
+                # Bucket limits are 2^bucket us: green to 256 us, orange to 2 ms
+                limit = 1 << bucket
+                if limit <= 256:
+                    cr.set_source_rgb(0.2, 0.78, 0.35)
+                elif limit <= 2048:
+                    cr.set_source_rgb(1.0, 0.58, 0.0)
+                else:
+                    cr.set_source_rgb(1.0, 0.23, 0.19)
+                bar_height = height * math.log10(count + 1) / top
+                cr.rectangle(bucket * bar + 1, height - bar_height, bar - 2, bar_height)
+                cr.fill()
+            
+            cr.set_source_rgb(0.4, 0.4, 0.4)
+            cr.set_font_size(9)
+            # Bucket n starts at 2^(n-1) us
+            for bucket, text in ((1, '1µs'), (6, '32µs'), (11, '1ms'), (16, '32ms')):
+                cr.move_to(bucket * bar + 1, height + 11)
+                cr.show_text(text)
+        
+        return False
+    
     def get_memory_info(self):
         """Get memory hardware info"""
         info = {'modules': [], 'total': format_bytes(psutil.virtual_memory().total)}
@@ -744,6 +1730,7 @@ class SysStatsWindow(Gtk.Window):
         
         # If no modules found, create generic entries based on total memory
         if not info['modules']:
+            info['estimated'] = True
             mem = psutil.virtual_memory()
             total_gb = mem.total / (1024**3)
             
@@ -774,8 +1761,6 @@ class SysStatsWindow(Gtk.Window):
         page = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=20)
         page.get_style_context().add_class("content-area")
         
-        mem_info = self.get_memory_info()
-        
         # Memory modules visualization (squares)
         modules_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
         modules_box.set_halign(Gtk.Align.CENTER)
@@ -784,46 +1769,16 @@ class SysStatsWindow(Gtk.Window):
         modules_label.set_markup(f"<span size='11000' weight='bold'>{_('memory_modules')}</span>")
         modules_box.pack_start(modules_label, False, False, 0)
         
-        # Grid for memory module squares
+        # Grid for memory module squares, filled in once dmidecode returns
         self.memory_modules_grid = Gtk.Grid()
         self.memory_modules_grid.set_column_spacing(15)
         self.memory_modules_grid.set_row_spacing(8)
         self.memory_modules_grid.set_halign(Gtk.Align.CENTER)
-        
-        # Create squares for each module
         self.memory_module_widgets = []
-        for i, module in enumerate(mem_info['modules']):
-            module_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=4)
-            
-            # Drawing area for the square
-            drawing = Gtk.DrawingArea()
-            drawing.set_size_request(80, 80)
-            drawing.connect('draw', self.draw_memory_module, i)
-            module_box.pack_start(drawing, False, False, 0)
-            
-            # Label with module info
-            module_text = f"Módulo {i+1}" if get_language() == 'es' else f"Module {i+1}"
-            label = Gtk.Label(label=module_text)
-            label.get_style_context().add_class("stat-value")
-            module_box.pack_start(label, False, False, 0)
-            
-            # Size label
-            size_label = Gtk.Label(label=module.get('size', 'N/A'))
-            size_label.get_style_context().add_class("stat-value")
-            module_box.pack_start(size_label, False, False, 0)
-            
-            # Type and speed
-            if module.get('type') and module.get('speed'):
-                type_label = Gtk.Label(label=f"{module['type']} @ {module['speed']}")
-                type_label.get_style_context().add_class("stat-value")
-                module_box.pack_start(type_label, False, False, 0)
-            
-            self.memory_module_widgets.append({
-                'drawing': drawing,
-                'usage': 0
-            })
-            
-            self.memory_modules_grid.attach(module_box, i, 0, 1, 1)
+        
+        loading_label = Gtk.Label(label=_('loading'))
+        loading_label.get_style_context().add_class("stat-value")
+        self.memory_modules_grid.attach(loading_label, 0, 0, 1, 1)
         
         modules_box.pack_start(self.memory_modules_grid, False, False, 0)
         page.pack_start(modules_box, False, False, 0)
@@ -835,10 +1790,10 @@ class SysStatsWindow(Gtk.Window):
         page.pack_start(sep, False, False, 0)
         
         # Detailed memory info
-        info_grid = Gtk.Grid()
-        info_grid.set_column_spacing(30)
-        info_grid.set_row_spacing(8)
-        info_grid.set_halign(Gtk.Align.CENTER)
+        self.memory_info_grid = Gtk.Grid()
+        self.memory_info_grid.set_column_spacing(30)
+        self.memory_info_grid.set_row_spacing(8)
+        self.memory_info_grid.set_halign(Gtk.Align.CENTER)
         
         row = 0
         
@@ -846,64 +1801,126 @@ class SysStatsWindow(Gtk.Window):
         label = Gtk.Label()
         label.set_markup(f"<b>{_('total_memory')}:</b>")
         label.set_halign(Gtk.Align.END)
-        info_grid.attach(label, 0, row, 1, 1)
+        self.memory_info_grid.attach(label, 0, row, 1, 1)
         
-        value = Gtk.Label(label=mem_info['total'])
+        value = Gtk.Label(label=format_bytes(psutil.virtual_memory().total))
         value.set_halign(Gtk.Align.START)
-        info_grid.attach(value, 1, row, 1, 1)
+        self.memory_info_grid.attach(value, 1, row, 1, 1)
         row += 1
         
         # Current usage
         label = Gtk.Label()
         label.set_markup(f"<b>{_('usage')}:</b>")
         label.set_halign(Gtk.Align.END)
-        info_grid.attach(label, 0, row, 1, 1)
+        self.memory_info_grid.attach(label, 0, row, 1, 1)
         
         self.memory_usage_label = Gtk.Label(label="0%")
         self.memory_usage_label.set_halign(Gtk.Align.START)
-        info_grid.attach(self.memory_usage_label, 1, row, 1, 1)
-        row += 1
+        self.memory_info_grid.attach(self.memory_usage_label, 1, row, 1, 1)
         
-        # Module details
-        if mem_info['modules']:
-            for i, module in enumerate(mem_info['modules'], 1):
-                # Module header
-                label = Gtk.Label()
-                module_text = f"Módulo {i}" if get_language() == 'es' else f"Module {i}"
-                label.set_markup(f"<b>{module_text}:</b>")
-                label.set_halign(Gtk.Align.END)
-                info_grid.attach(label, 0, row, 1, 1)
-                
-                # Module info
-                module_info = []
-                if module.get('size'):
-                    module_info.append(module['size'])
-                if module.get('type'):
-                    module_info.append(module['type'])
-                if module.get('speed'):
-                    module_info.append(module['speed'])
-                if module.get('manufacturer'):
-                    module_info.append(module['manufacturer'])
-                
-                value = Gtk.Label(label=' - '.join(module_info))
-                value.set_halign(Gtk.Align.START)
-                value.set_line_wrap(True)
-                value.set_max_width_chars(50)
-                info_grid.attach(value, 1, row, 1, 1)
-                row += 1
+        page.pack_start(self.memory_info_grid, False, False, 0)
         
-        page.pack_start(info_grid, False, False, 0)
+        # Usage over time, with the busiest processes recorded
+        history_label = Gtk.Label()
+        history_label.set_markup(f"<span size='10000' weight='bold'>{_('memory_history')}</span>")
+        page.pack_start(history_label, False, False, 0)
+        
+        self.memory_graph = HistoryGraph(
+            lambda: self.graph_spans['memory'], (lambda: self.histories['memory'], (0.2, 0.78, 0.35)))
+        self.memory_graph.set_size_request(-1, 100)
+        self.add_process_tooltip(self.memory_graph, 'memory', 'memory')
+        page.pack_start(self.memory_graph, False, False, 0)
+        page.pack_start(self.create_span_selector('memory', [self.memory_graph]), False, False, 0)
         
         self.content_stack.add_named(page, "memory")
+        
+        run_in_background(
+            lambda: self.inventory.get('memory', self.get_memory_info,
+                                       keep=lambda info: not info.get('estimated')),
+            self.on_memory_info
+        )
+    
+    def on_memory_info(self, mem_info):
+        """Show memory modules probed in the background"""
+        if not mem_info:
+            return False
+        
+        for child in self.memory_modules_grid.get_children():
+            child.destroy()
+        
+        # Create squares for each module
+        for i, module in enumerate(mem_info['modules']):
+            module_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=4)
+            
+            # Drawing area for the square
+            drawing = Gtk.DrawingArea()
+            drawing.set_size_request(80, 80)
+            drawing.connect('draw', self.draw_memory_module, i)
+            module_box.pack_start(drawing, False, False, 0)
+            
+            # Label with module info
+            module_text = f"Módulo {i+1}" if get_language() == 'es' else f"Module {i+1}"
+            label = Gtk.Label(label=module_text)
+            label.get_style_context().add_class("stat-value")
+            module_box.pack_start(label, False, False, 0)
+            
+            # Size label
+            size_label = Gtk.Label(label=module.get('size', 'N/A'))
+            size_label.get_style_context().add_class("stat-value")
+            module_box.pack_start(size_label, False, False, 0)
+            
+            # Type and speed
+            if module.get('type') and module.get('speed'):
+                type_label = Gtk.Label(label=f"{module['type']} @ {module['speed']}")
+                type_label.get_style_context().add_class("stat-value")
+                module_box.pack_start(type_label, False, False, 0)
+            
+            self.memory_module_widgets.append({
+                'drawing': drawing,
+                'usage': 0
+            })
+            
+            self.memory_modules_grid.attach(module_box, i, 0, 1, 1)
+        
+        # Module details, below total and usage
+        row = 2
+        for i, module in enumerate(mem_info['modules'], 1):
+            # Module header
+            label = Gtk.Label()
+            module_text = f"Módulo {i}" if get_language() == 'es' else f"Module {i}"
+            label.set_markup(f"<b>{module_text}:</b>")
+            label.set_halign(Gtk.Align.END)
+            self.memory_info_grid.attach(label, 0, row, 1, 1)
+            
+            # Module info
+            module_info = []
+            if module.get('size'):
+                module_info.append(module['size'])
+            if module.get('type'):
+                module_info.append(module['type'])
+            if module.get('speed'):
+                module_info.append(module['speed'])
+            if module.get('manufacturer'):
+                module_info.append(module['manufacturer'])
+            
+            value = Gtk.Label(label=' - '.join(module_info))
+            value.set_halign(Gtk.Align.START)
+            value.set_line_wrap(True)
+            value.set_max_width_chars(50)
+            self.memory_info_grid.attach(value, 1, row, 1, 1)
+            row += 1
+        
+        self.memory_modules_grid.show_all()
+        self.memory_info_grid.show_all()
+        return False
     
     def draw_memory_module(self, widget, cr, module_index):
         """Draw memory module usage square"""
         width = widget.get_allocated_width()
         height = widget.get_allocated_height()
         
-        # Get overall memory usage (same for all modules since we can't get per-module usage)
-        mem = psutil.virtual_memory()
-        usage = mem.percent
+        # Overall memory usage (same for all modules since we can't get per-module usage)
+        usage = self.memory_percent
         
         # Background
         cr.set_source_rgb(0.9, 0.9, 0.9)
@@ -945,62 +1962,28 @@ class SysStatsWindow(Gtk.Window):
         """Get disk hardware info"""
         disks = []
         
-        try:
-            # Get disk info from lsblk with better parsing
-            result = subprocess.run(['lsblk', '-d', '-n', '-o', 'NAME,MODEL,SIZE,ROTA,TYPE'], 
-                                  capture_output=True, text=True)
-            if result.returncode == 0:
-                lines = result.stdout.strip().split('\n')
-                for line in lines:
-                    if not line.strip():
-                        continue
-                    
-                    parts = line.split()
-                    if len(parts) < 3:
-                        continue
-                    
-                    name = parts[0]
-                    
-                    # Skip loop devices, ram, and other virtual devices
-                    if name.startswith('loop') or name.startswith('ram') or name.startswith('sr'):
-                        continue
-                    
-                    # Last part should be 'disk'
-                    if parts[-1] != 'disk':
-                        continue
-                    
-                    # ROTA is second to last
-                    rota = parts[-2]
-                    disk_type = 'HDD' if rota == '1' else 'SSD'
-                    
-                    # Size is third to last
-                    size = parts[-3]
-                    
-                    # Model is everything between name and size
-                    # parts[0] = name, parts[1:-3] = model, parts[-3] = size, parts[-2] = rota, parts[-1] = type
-                    if len(parts) > 3:
-                        model = ' '.join(parts[1:-3])
-                    else:
-                        model = 'Generic Disk'
-                    
-                    # Determine interface
-                    interface = 'SATA'
-                    if 'nvme' in name.lower():
-                        interface = 'NVMe'
-                        disk_type = 'NVMe SSD'
-                    elif 'mmc' in name.lower():
-                        interface = 'eMMC'
-                        disk_type = 'eMMC'
-                    
-                    disks.append({
-                        'name': name,
-                        'model': model if model else f'{name.upper()} Drive',
-                        'size': size,
-                        'type': disk_type,
-                        'interface': interface
-                    })
-        except Exception as e:
-            print(f"Error getting disk info: {e}")
+        for disk in sysfs.list_block_devices():
+            name = disk['name']
+            disk_type = 'HDD' if disk['rotational'] else 'SSD'
+            
+            # Determine interface
+            interface = 'SATA'
+            if 'nvme' in name.lower():
+                interface = 'NVMe'
+                disk_type = 'NVMe SSD'
+            elif 'mmc' in name.lower():
+                interface = 'eMMC'
+                disk_type = 'eMMC'
+            elif disk['usb']:
+                interface = 'USB'
+            
+            disks.append({
+                'name': name,
+                'model': disk['model'] or f'{name.upper()} Drive',
+                'size': format_bytes(disk['size']),
+                'type': disk_type,
+                'interface': interface
+            })
         
         # If no disks found, try to get at least the root partition info
         if not disks:
@@ -1025,7 +2008,8 @@ class SysStatsWindow(Gtk.Window):
         page = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=20)
         page.get_style_context().add_class("content-area")
         
-        disks = self.get_disk_info()
+        disks = self.inventory.get('disks', self.get_disk_info, keep=bool)
+        self.disk_widgets = []
         
         if not disks:
             # Show message if no disks found
@@ -1049,7 +2033,6 @@ class SysStatsWindow(Gtk.Window):
             self.disks_grid.set_halign(Gtk.Align.CENTER)
             
             # Create squares for each disk
-            self.disk_widgets = []
             for i, disk in enumerate(disks):
                 disk_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=4)
                 
@@ -1083,9 +2066,16 @@ class SysStatsWindow(Gtk.Window):
                 usage_label.get_style_context().add_class("stat-value")
                 disk_box.pack_start(usage_label, False, False, 0)
                 
+                # Average wait and utilization, like iostat -x
+                io_label = Gtk.Label(label="–")
+                io_label.get_style_context().add_class("stat-value")
+                disk_box.pack_start(io_label, False, False, 0)
+                
                 self.disk_widgets.append({
                     'drawing': drawing,
                     'usage_label': usage_label,
+                    'io_label': io_label,
+                    'io': None,
                     'name': disk['name'],
                     'usage': 0
                 })
@@ -1119,9 +2109,10 @@ class SysStatsWindow(Gtk.Window):
             activity_label.set_margin_top(10)
             summary_box.pack_start(activity_label, False, False, 0)
             
-            self.disk_activity_graph = Gtk.DrawingArea()
+            self.disk_activity_graph = HistoryGraph(
+                lambda: self.graph_spans['disk'], (lambda: self.histories['disk'], (0.6, 0.4, 0.8)))
             self.disk_activity_graph.set_size_request(600, 100)
-            self.disk_activity_graph.connect('draw', self.draw_disk_activity)
+            summary_box.pack_start(self.create_span_selector('disk', [self.disk_activity_graph]), False, False, 0)
             summary_box.pack_start(self.disk_activity_graph, False, False, 0)
             
             self.disk_activity_label = Gtk.Label(label="0 KB/s")
@@ -1129,6 +2120,20 @@ class SysStatsWindow(Gtk.Window):
             summary_box.pack_start(self.disk_activity_label, False, False, 0)
             
             page.pack_start(summary_box, False, False, 0)
+            
+            # Per-device read/write split and IOPS
+            breakdown_box, self.disk_breakdown = self.create_breakdown([
+                (_('device'), None),
+                (_('read'), self.format_speed),
+                (_('write'), self.format_speed),
+                (_('read_iops'), self.format_ops),
+                (_('write_iops'), self.format_ops),
+                (_('await'), self.format_duration),
+                (_('service_time'), self.format_duration),
+                (_('queue_depth'), self.format_ratio),
+                (_('utilization'), self.format_percent),
+            ])
+            page.pack_start(breakdown_box, False, False, 0)
         
         self.content_stack.add_named(page, "disk")
     
@@ -1176,80 +2181,9 @@ class SysStatsWindow(Gtk.Window):
         
         return False
     
-    def draw_disk_activity(self, widget, cr):
-        """Draw disk activity graph"""
-        width = widget.get_allocated_width()
-        height = widget.get_allocated_height()
-        
-        # Background
-        cr.set_source_rgb(0.96, 0.96, 0.96)
-        cr.rectangle(0, 0, width, height)
-        cr.fill()
-        
-        # Get data
-        data = list(self.disk_activity_history)
-        
-        if not data or len(data) < 2:
-            return False
-        
-        # Find max value for scaling
-        max_val = max(data) if max(data) > 0 else 1
-        
-        # Draw grid lines
-        cr.set_source_rgb(0.9, 0.9, 0.9)
-        cr.set_line_width(1)
-        for i in range(5):
-            y = height * i / 4
-            cr.move_to(0, y)
-            cr.line_to(width, y)
-            cr.stroke()
-        
-        # Draw graph line
-        cr.set_source_rgb(0.6, 0.4, 0.8)  # Purple color
-        cr.set_line_width(2)
-        
-        step = width / (len(data) - 1)
-        for i, value in enumerate(data):
-            x = i * step
-            y = height - (value / max_val * height * 0.9)
-            
-            if i == 0:
-                cr.move_to(x, y)
-            else:
-                cr.line_to(x, y)
-        
-        cr.stroke()
-        
-        # Fill area under curve
-        cr.set_source_rgba(0.6, 0.4, 0.8, 0.2)
-        step = width / (len(data) - 1)
-        cr.move_to(0, height)
-        for i, value in enumerate(data):
-            x = i * step
-            y = height - (value / max_val * height * 0.9)
-            cr.line_to(x, y)
-        cr.line_to(width, height)
-        cr.close_path()
-        cr.fill()
-        
-        return False
-    
     def get_active_network_interface(self):
         """Get the active network interface connected to internet"""
-        try:
-            # Get default route
-            result = subprocess.run(['ip', 'route', 'show', 'default'], 
-                                  capture_output=True, text=True)
-            if result.returncode == 0 and result.stdout:
-                # Parse: default via 192.168.1.1 dev wlan0 ...
-                parts = result.stdout.split()
-                if 'dev' in parts:
-                    dev_index = parts.index('dev')
-                    if dev_index + 1 < len(parts):
-                        return parts[dev_index + 1]
-        except:
-            pass
-        return None
+        return sysfs.get_default_route_interface()
     
     def get_network_card_info(self):
         """Get network card model for active interface"""
@@ -1258,47 +2192,11 @@ class SysStatsWindow(Gtk.Window):
         if not active_interface:
             return "No active network connection"
         
-        try:
-            # Get interface info - try with pkexec first
-            result = None
-            try:
-                result = subprocess.run(['pkexec', 'ethtool', '-i', active_interface], 
-                                      capture_output=True, text=True, timeout=5)
-            except:
-                result = subprocess.run(['ethtool', '-i', active_interface], 
-                                      capture_output=True, text=True)
-            
-            if result and result.returncode == 0:
-                driver = None
-                for line in result.stdout.split('\n'):
-                    if line.startswith('driver:'):
-                        driver = line.split(':')[1].strip()
-                        break
-                
-                # Try to get more detailed info from lspci
-                if driver:
-                    lspci_result = subprocess.run(['lspci', '-v'], 
-                                                capture_output=True, text=True)
-                    if lspci_result.returncode == 0:
-                        in_network_section = False
-                        for line in lspci_result.stdout.split('\n'):
-                            if 'Network controller' in line or 'Ethernet controller' in line:
-                                in_network_section = True
-                                # Extract model name
-                                parts = line.split(':', 2)
-                                if len(parts) >= 3:
-                                    model = parts[2].strip()
-                            elif in_network_section and 'Kernel driver in use:' in line:
-                                if driver in line:
-                                    return f"{model} ({active_interface})"
-                                in_network_section = False
-                
-                # Fallback: just show interface and driver
-                return f"{active_interface} ({driver})"
-        except:
-            pass
-        
-        # Final fallback
+        card = sysfs.get_interface_info(active_interface)
+        if card['model']:
+            return f"{card['model']} ({active_interface})"
+        if card['driver']:
+            return f"{active_interface} ({card['driver']})"
         return f"{active_interface}"
     
     def create_network_page(self):
@@ -1314,9 +2212,9 @@ class SysStatsWindow(Gtk.Window):
         download_label.set_halign(Gtk.Align.START)
         download_box.pack_start(download_label, False, False, 0)
         
-        self.download_graph = Gtk.DrawingArea()
+        self.download_graph = HistoryGraph(
+            lambda: self.graph_spans['network'], (lambda: self.histories['net_recv'], (0.0, 0.48, 1.0)))
         self.download_graph.set_size_request(-1, 150)
-        self.download_graph.connect('draw', self.draw_network_graph, 'download')
         download_box.pack_start(self.download_graph, False, False, 0)
         
         self.download_speed_label = Gtk.Label(label="0 KB/s")
@@ -1333,9 +2231,9 @@ class SysStatsWindow(Gtk.Window):
         upload_label.set_halign(Gtk.Align.START)
         upload_box.pack_start(upload_label, False, False, 0)
         
-        self.upload_graph = Gtk.DrawingArea()
+        self.upload_graph = HistoryGraph(
+            lambda: self.graph_spans['network'], (lambda: self.histories['net_sent'], (0.0, 0.48, 1.0)))
         self.upload_graph.set_size_request(-1, 150)
-        self.upload_graph.connect('draw', self.draw_network_graph, 'upload')
         upload_box.pack_start(self.upload_graph, False, False, 0)
         
         self.upload_speed_label = Gtk.Label(label="0 KB/s")
@@ -1344,78 +2242,354 @@ class SysStatsWindow(Gtk.Window):
         
         page.pack_start(upload_box, False, False, 0)
         
-        # Network card info
-        network_card = self.get_network_card_info()
-        network_card_label = Gtk.Label()
-        network_card_label.set_markup(f"<span size='9000'><b>{_('model')}:</b> {network_card}</span>")
-        network_card_label.set_halign(Gtk.Align.START)
-        network_card_label.set_line_wrap(True)
-        network_card_label.set_max_width_chars(60)
-        page.pack_start(network_card_label, False, False, 0)
+        # Graph time span
+        page.pack_start(self.create_span_selector('network', [self.download_graph, self.upload_graph]), False, False, 0)
+        
+        # Network card info, probed in the background
+        self.network_card_label = Gtk.Label()
+        self.network_card_label.set_markup(f"<span size='9000'><b>{_('model')}:</b> {_('loading')}</span>")
+        self.network_card_label.set_halign(Gtk.Align.START)
+        self.network_card_label.set_line_wrap(True)
+        self.network_card_label.set_max_width_chars(60)
+        page.pack_start(self.network_card_label, False, False, 0)
+        
+        # Per-interface traffic, packets, errors and drops
+        breakdown_box, self.net_breakdown = self.create_breakdown([
+            (_('interface'), None),
+            (_('download'), self.format_speed),
+            (_('upload'), self.format_speed),
+            (_('packets_recv'), self.format_ops),
+            (_('packets_sent'), self.format_ops),
+            (_('errors'), self.format_count),
+            (_('drops'), self.format_count),
+        ])
+        page.pack_start(breakdown_box, False, False, 0)
         
         self.content_stack.add_named(page, "network")
+        
+        run_in_background(
+            lambda: self.inventory.get('network_card', self.get_network_card_info,
+                                       keep=lambda card: card != "No active network connection"),
+            self.on_network_card_info
+        )
     
-    def draw_network_graph(self, widget, cr, graph_type):
-        """Draw network activity graph"""
-        width = widget.get_allocated_width()
-        height = widget.get_allocated_height()
+    def on_network_card_info(self, network_card):
+        """Show the network card model probed in the background"""
+        if network_card:
+            self.network_card_label.set_markup(f"<span size='9000'><b>{_('model')}:</b> {network_card}</span>")
+        return False
+    
+    def create_span_selector(self, page_name, graphs):
+        """Create buttons switching the time span shown by a page's graphs"""
+        box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL)
+        box.set_halign(Gtk.Align.CENTER)
+        
+        group = None
+        for view, span in VIEW_SPANS.items():
+            button = Gtk.RadioButton(label=view, group=group)
+            button.set_mode(False)
+            button.get_style_context().add_class("tab-button")
+            button.set_active(self.graph_spans[page_name] == span)
+            button.connect("toggled", self.on_span_changed, page_name, span, graphs)
+            box.pack_start(button, False, False, 0)
+            group = group or button
+        
+        return box
+    
+    def on_span_changed(self, button, page_name, span, graphs):
+        """Redraw a page's graphs over a new time span"""
+        if button.get_active():
+            self.graph_spans[page_name] = span
+            for graph in graphs:
+                graph.queue_draw()
+    
+    def create_pressure_page(self):
+        """Create pressure stall information page"""
+        page = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=12)
+        page.get_style_context().add_class("content-area")
         
-        # Background
-        cr.set_source_rgb(0.96, 0.96, 0.96)
-        cr.rectangle(0, 0, width, height)
-        cr.fill()
+        self.pressure_unavailable_label = Gtk.Label(label=_('psi_unavailable'))
+        self.pressure_unavailable_label.get_style_context().add_class("stat-value")
+        self.pressure_unavailable_label.set_no_show_all(True)
+        page.pack_start(self.pressure_unavailable_label, False, False, 0)
+        
+        # Stall time per sample or the kernel's 10 s average
+        view_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL)
+        view_box.set_halign(Gtk.Align.CENTER)
+        group = None
+        for view, label in (('stall', 'stall_time'), ('avg10', 'psi_avg10')):
+            button = Gtk.RadioButton(label=_(label), group=group)
+            button.set_mode(False)
+            button.get_style_context().add_class("tab-button")
+            button.set_active(self.pressure_view == view)
+            button.connect("toggled", self.on_pressure_view_changed, view)
+            view_box.pack_start(button, False, False, 0)
+            group = group or button
+        page.pack_start(view_box, False, False, 0)
+        
+        # One graph per resource, some and full overlaid
+        self.pressure_widgets = {}
+        for resource in PRESSURE_RESOURCES:
+            box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=6)
+            
+            title = Gtk.Label()
+            title.set_markup(f"<b>{_(resource)}</b>")
+            title.set_halign(Gtk.Align.START)
+            box.pack_start(title, False, False, 0)
+            
+            graph = HistoryGraph(lambda: self.graph_spans['pressure'], *[
+                (lambda resource=resource, kind=kind: self.pressure_history(resource, kind), PRESSURE_COLORS[kind])
+                for kind in PRESSURE_KINDS
+            ])
+            graph.set_size_request(-1, 90)
+            box.pack_start(graph, False, False, 0)
+            
+            values_label = Gtk.Label(label="")
+            values_label.get_style_context().add_class("stat-value")
+            values_label.set_halign(Gtk.Align.START)
+            box.pack_start(values_label, False, False, 0)
+            
+            page.pack_start(box, False, False, 0)
+            self.pressure_widgets[resource] = {'graph': graph, 'values_label': values_label, 'pressure': None}
+        
+        # Graph time span
+        graphs = [widget['graph'] for widget in self.pressure_widgets.values()]
+        page.pack_start(self.create_span_selector('pressure', graphs), False, False, 0)
+        
+        # Per-cgroup 10 s averages
+        breakdown_box, self.cgroup_breakdown = self.create_breakdown([
+            (_('cgroup'), None),
+            (f"{_('cpu')} {_('psi_some')}", self.format_percent),
+            (f"{_('memory')} {_('psi_some')}", self.format_percent),
+            (f"{_('memory')} {_('psi_full')}", self.format_percent),
+            (f"{_('io')} {_('psi_some')}", self.format_percent),
+            (f"{_('io')} {_('psi_full')}", self.format_percent),
+        ], 'cgroup_breakdown')
+        page.pack_start(breakdown_box, False, False, 0)
+        
+        self.content_stack.add_named(page, "pressure")
+    
+    def pressure_history(self, resource, kind):
+        """History shown by a pressure graph in the current view"""
+        suffix = '_avg10' if self.pressure_view == 'avg10' else ''
+        return self.histories[f'psi_{resource}_{kind}{suffix}']
+    
+    def on_pressure_view_changed(self, button, view):
+        """Switch the pressure graphs between stall time and 10 s average"""
+        if button.get_active():
+            self.pressure_view = view
+            for widget in self.pressure_widgets.values():
+                widget['graph'].queue_draw()
+    
+    def create_audio_page(self):
+        """Create PipeWire audio engine page"""
+        page = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=12)
+        page.get_style_context().add_class("content-area")
         
-        # Get data
-        if graph_type == 'download':
-            data = list(self.net_download_history)
-        else:
-            data = list(self.net_upload_history)
+        self.audio_unavailable_label = Gtk.Label(label=_('audio_unavailable'))
+        self.audio_unavailable_label.get_style_context().add_class("stat-value")
+        self.audio_unavailable_label.set_no_show_all(True)
+        page.pack_start(self.audio_unavailable_label, False, False, 0)
         
-        if not data or len(data) < 2:
-            return False
+        # Driver, quantum, rate and xruns
+        info_grid = Gtk.Grid()
+        info_grid.set_column_spacing(20)
+        info_grid.set_row_spacing(8)
+        self.audio_labels = {}
+        for row, key in enumerate(('driver', 'quantum', 'latency', 'dsp_load', 'xruns')):
+            label = Gtk.Label(label=f"{_(key)}:")
+            label.get_style_context().add_class("stat-label")
+            label.set_halign(Gtk.Align.END)
+            info_grid.attach(label, 0, row, 1, 1)
+            
+            value = Gtk.Label(label="–")
+            value.get_style_context().add_class("stat-value")
+            value.set_halign(Gtk.Align.START)
+            info_grid.attach(value, 1, row, 1, 1)
+            self.audio_labels[key] = value
+        page.pack_start(info_grid, False, False, 0)
         
-        # Find max value for scaling
-        max_val = max(data) if max(data) > 0 else 1
+        # DSP load graph
+        self.dsp_load_graph = HistoryGraph(
+            lambda: self.graph_spans['audio'], (lambda: self.histories['dsp_load'], (0.2, 0.78, 0.35)))
+        self.dsp_load_graph.set_size_request(-1, 120)
+        page.pack_start(self.dsp_load_graph, False, False, 0)
+        page.pack_start(self.create_span_selector('audio', [self.dsp_load_graph]), False, False, 0)
         
-        # Draw grid lines
-        cr.set_source_rgb(0.9, 0.9, 0.9)
-        cr.set_line_width(1)
-        for i in range(5):
-            y = height * i / 4
-            cr.move_to(0, y)
-            cr.line_to(width, y)
-            cr.stroke()
-        
-        # Draw graph line
-        cr.set_source_rgb(0.0, 0.48, 1.0)  # Blue color
-        cr.set_line_width(2)
-        
-        step = width / (len(data) - 1)
-        for i, value in enumerate(data):
-            x = i * step
-            y = height - (value / max_val * height * 0.9)
-            
-            if i == 0:
-                cr.move_to(x, y)
+        # Drivers and their followers as listed by pw-top; nodes that did
+        # not finish within their cycle are shown in red
+        scrolled = Gtk.ScrolledWindow()
+        scrolled.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
+        
+        self.audio_store = Gtk.ListStore(int, str, int, int, float, float, float, float, int, str)
+        tree = Gtk.TreeView(model=self.audio_store)
+        tree.get_style_context().add_class("process-list")
+        columns = [
+            ('ID', 0, None),
+            (_('node'), 1, None),
+            (_('quantum'), 2, None),
+            (_('sample_rate'), 3, None),
+            (_('wait'), 4, self.format_duration),
+            (_('busy'), 5, self.format_duration),
+            ('W/Q', 6, self.format_ratio),
+            ('B/Q', 7, self.format_ratio),
+            (_('xruns'), 8, None),
+        ]
+        for title, col_id, formatter in columns:
+            renderer = Gtk.CellRendererText()
+            if formatter:
+                column = Gtk.TreeViewColumn(title, renderer, foreground=9)
+                column.set_cell_data_func(renderer, formatter, col_id)
             else:
-                cr.line_to(x, y)
+                column = Gtk.TreeViewColumn(title, renderer, text=col_id, foreground=9)
+            column.set_resizable(True)
+            tree.append_column(column)
         
-        cr.stroke()
+        scrolled.add(tree)
+        page.pack_start(scrolled, True, True, 0)
         
-        # Fill area under curve
-        cr.set_source_rgba(0.0, 0.48, 1.0, 0.2)
-        step = width / (len(data) - 1)
-        cr.move_to(0, height)
-        for i, value in enumerate(data):
-            x = i * step
-            y = height - (value / max_val * height * 0.9)
-            cr.line_to(x, y)
-        cr.line_to(width, height)
-        cr.close_path()
-        cr.fill()
+        self.audio_xruns = 0
+        self.content_stack.add_named(page, "audio")
+    
+    def create_interrupts_page(self):
+        """Create interrupt and softirq rate page"""
+        page = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=12)
+        page.get_style_context().add_class("content-area")
+        
+        # Busiest sources by CPU, as a heat map
+        title = Gtk.Label()
+        title.set_markup(f"<b>{_('per_cpu_distribution')}</b>")
+        title.set_halign(Gtk.Align.START)
+        page.pack_start(title, False, False, 0)
+        
+        self.interrupts = None
+        self.interrupt_matrix = Gtk.DrawingArea()
+        self.interrupt_matrix.set_size_request(-1, 60)
+        self.interrupt_matrix.connect('draw', self.draw_interrupt_matrix)
+        page.pack_start(self.interrupt_matrix, False, False, 0)
+        
+        # Hardware interrupts with their affinity
+        title = Gtk.Label()
+        title.set_markup(f"<b>{_('hardware_irqs')}</b>")
+        title.set_halign(Gtk.Align.START)
+        page.pack_start(title, False, False, 0)
+        
+        scrolled = Gtk.ScrolledWindow()
+        scrolled.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
+        
+        self.interrupt_store = Gtk.ListStore(str, str, float, str, str, str)
+        tree = Gtk.TreeView(model=self.interrupt_store)
+        tree.get_style_context().add_class("process-list")
+        columns = [
+            ('IRQ', 0, None),
+            (_('source'), 1, None),
+            (_('irq_rate'), 2, self.format_ops),
+            (_('affinity'), 3, None),
+            (_('effective_affinity'), 4, None),
+            (_('busiest_cpu'), 5, None),
+        ]
+        for title, col_id, formatter in columns:
+            renderer = Gtk.CellRendererText()
+            if formatter:
+                column = Gtk.TreeViewColumn(title, renderer)
+                column.set_cell_data_func(renderer, formatter, col_id)
+            else:
+                column = Gtk.TreeViewColumn(title, renderer, text=col_id)
+            column.set_resizable(True)
+            column.set_sort_column_id(col_id)
+            tree.append_column(column)
+        self.interrupt_store.set_sort_column_id(2, Gtk.SortType.DESCENDING)
+        
+        scrolled.add(tree)
+        page.pack_start(scrolled, True, True, 0)
+        
+        self.content_stack.add_named(page, "interrupts")
+    
+    def draw_interrupt_matrix(self, widget, cr):
+        """Draw rates of the busiest sources per CPU, shaded on a log scale"""
+        width = widget.get_allocated_width()
+        interrupts = self.interrupts
+        if not interrupts:
+            return False
+        
+        rows = [(irq['irq'], irq['per_cpu'], False) for irq in interrupts['irqs']]
+        rows += [(softirq['name'], softirq['per_cpu'], True) for softirq in interrupts['softirqs']]
+        columns = max(len(interrupts['cpus']), len(interrupts['softirq_cpus']), 1)
+        label_width = 70
+        header = 14
+        row_height = 14
+        cell = max(min((width - label_width) / columns, 24), 2)
+        
+        top = max((rate for name, rates, soft in rows for rate in rates), default=0.0)
+        scale = math.log10(top + 1) or 1.0
+        
+        cr.set_font_size(9)
+        # CPU numbers, thinned out so they do not overlap
+        step = max(1, math.ceil(18 / cell))
+        cr.set_source_rgb(0.4, 0.4, 0.4)
+        for index, cpu in enumerate(interrupts['cpus']):
+            if index % step == 0:
+                cr.move_to(label_width + index * cell, header - 3)
+                cr.show_text(str(cpu))
+        
+        for row, (name, rates, soft) in enumerate(rows):
+            y = header + row * row_height
+            if soft:
+                cr.set_source_rgb(1.0, 0.58, 0.0)
+            else:
+                cr.set_source_rgb(0.2, 0.2, 0.2)
+            cr.move_to(0, y + row_height - 3)
+            cr.show_text(name[:12])
+            
+            for index, rate in enumerate(rates):
+                level = math.log10(rate + 1) / scale
+                cr.set_source_rgb(0.96 - 0.96 * level, 0.96 - 0.48 * level, 0.96 + 0.04 * level)
+                cr.rectangle(label_width + index * cell, y + 1, max(cell - 1, 1), row_height - 2)
+                cr.fill()
         
         return False
     
+    def create_threads_page(self):
+        """Create real-time thread audit page"""
+        page = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=12)
+        page.get_style_context().add_class("content-area")
+        
+        self.threads_filter = Gtk.CheckButton(label=_('only_rt_threads'))
+        self.threads_filter.set_active(True)
+        page.pack_start(self.threads_filter, False, False, 0)
+        
+        scrolled = Gtk.ScrolledWindow()
+        scrolled.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
+        
+        # Audio threads are shown in blue, and in red when they have a problem
+        self.threads_store = Gtk.ListStore(int, int, str, str, str, int, int, str, int, str, str)
+        tree = Gtk.TreeView(model=self.threads_store)
+        tree.get_style_context().add_class("process-list")
+        columns = [
+            (_('tid'), 0),
+            (_('pid'), 1),
+            (_('process_name'), 2),
+            (_('thread'), 3),
+            (_('policy'), 4),
+            (_('rt_priority'), 5),
+            (_('nice'), 6),
+            (_('affinity'), 7),
+            (_('last_cpu'), 8),
+            (_('problem'), 9),
+        ]
+        for title, col_id in columns:
+            renderer = Gtk.CellRendererText()
+            column = Gtk.TreeViewColumn(title, renderer, text=col_id, foreground=10)
+            column.set_resizable(True)
+            column.set_sort_column_id(col_id)
+            tree.append_column(column)
+        self.threads_store.set_sort_column_id(5, Gtk.SortType.DESCENDING)
+        
+        scrolled.add(tree)
+        page.pack_start(scrolled, True, True, 0)
+        
+        self.content_stack.add_named(page, "threads")
+    
     def create_processes_page(self):
         """Create processes list page"""
         page = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
@@ -1455,31 +2629,162 @@ class SysStatsWindow(Gtk.Window):
         
         self.content_stack.add_named(page, "processes")
     
+    def create_breakdown(self, columns, label='breakdown'):
+        """Create a per-device table hidden behind a toggle
+
+        columns is a list of (title, formatter); the first column holds the
+        device name and the others hold floats shown through formatter.
+        """
+        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=8)
+        
+        toggle = Gtk.CheckButton(label=_(label))
+        box.pack_start(toggle, False, False, 0)
+        
+        store = Gtk.ListStore(str, *[float] * (len(columns) - 1))
+        tree = Gtk.TreeView(model=store)
+        for col_id, (title, formatter) in enumerate(columns):
+            renderer = Gtk.CellRendererText()
+            if formatter:
+                column = Gtk.TreeViewColumn(title, renderer)
+                column.set_cell_data_func(renderer, formatter, col_id)
+            else:
+                column = Gtk.TreeViewColumn(title, renderer, text=col_id)
+            column.set_resizable(True)
+            column.set_sort_column_id(col_id)
+            tree.append_column(column)
+        
+        scrolled = Gtk.ScrolledWindow()
+        scrolled.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
+        scrolled.set_min_content_height(120)
+        scrolled.add(tree)
+        
+        revealer = Gtk.Revealer()
+        revealer.add(scrolled)
+        box.pack_start(revealer, False, False, 0)
+        
+        toggle.connect("toggled", lambda button: revealer.set_reveal_child(button.get_active()))
+        
+        return box, {'toggle': toggle, 'store': store}
+    
+    def format_speed(self, column, cell, model, iter, col_id):
+        """Format byte rates"""
+        cell.set_property('text', f"{format_bytes(model.get_value(iter, col_id))}/s")
+    
+    def format_ops(self, column, cell, model, iter, col_id):
+        """Format operation and packet rates"""
+        cell.set_property('text', f"{model.get_value(iter, col_id):.1f}/s")
+    
+    def format_count(self, column, cell, model, iter, col_id):
+        """Format counters"""
+        cell.set_property('text', f"{model.get_value(iter, col_id):.0f}")
+    
+    def format_duration(self, column, cell, model, iter, col_id):
+        """Format profiler times in seconds; negative means not measured"""
+        value = model.get_value(iter, col_id)
+        if value < 0:
+            text = "---"
+        elif value < 1e-3:
+            text = f"{value * 1e6:.1f} µs"
+        else:
+            text = f"{value * 1e3:.2f} ms"
+        cell.set_property('text', text)
+    
+    def format_ratio(self, column, cell, model, iter, col_id):
+        """Format ratios such as shares of a cycle; negative means not measured"""
+        value = model.get_value(iter, col_id)
+        cell.set_property('text', f"{value:.2f}" if value >= 0 else "---")
+    
     def format_percent(self, column, cell, model, iter, col_id):
         """Format percentage values"""
         value = model.get_value(iter, col_id)
         cell.set_property('text', f'{value:.1f}%')
     
-    def update_stats(self):
-        """Update all statistics"""
-        visible_page = self.content_stack.get_visible_child_name()
-        
-        if visible_page == "cpu":
-            self.update_cpu_stats()
-        elif visible_page == "memory":
-            self.update_memory_stats()
-        elif visible_page == "disk":
-            self.update_disk_stats()
-        elif visible_page == "network":
-            self.update_network_stats()
-        elif visible_page == "processes":
-            self.update_processes()
+    def on_snapshot(self, snapshot):
+        """Pass a snapshot from the sampler thread to the main loop"""
+        GLib.idle_add(self.update_stats, snapshot)
+    
+    def update_stats(self, snapshot):
+        """Apply a snapshot collected by the sampler thread"""
+        # Counter rates are recorded whatever page is shown
+        self.update_rates(snapshot)
+        
+        # Snapshots without data for the visible page only feed the graphs,
+        # and nothing is drawn while the window is hidden
+        page = self.content_stack.get_visible_child_name()
+        if page not in snapshot['pages'] or self.activity == 'hidden':
+            return False
         
-        return True
+        if page == "cpu":
+            self.update_cpu_stats(snapshot)
+        elif page == "memory":
+            self.update_memory_stats(snapshot)
+        elif page == "disk":
+            self.update_disk_stats(snapshot)
+        elif page == "network":
+            self.update_network_stats(snapshot)
+        elif page == "pressure":
+            self.update_pressure_stats(snapshot)
+        elif page == "audio":
+            self.update_audio_stats(snapshot)
+        elif page == "interrupts":
+            self.update_interrupt_stats(snapshot)
+        elif page == "threads":
+            self.update_threads(snapshot)
+        elif page == "processes":
+            self.update_processes(snapshot)
+        
+        return False
     
-    def update_disk_stats(self):
+    def update_rates(self, snapshot):
+        """Record the rates and readings behind the graphs in their histories"""
+        samples = []
+        timestamp = snapshot['time']
+        duration = min(snapshot['elapsed'] or 0.0, MAX_SAMPLE_GAP)
+        samples.append(('cpu', timestamp, snapshot['cpu_percent'], duration))
+        samples.append(('memory', timestamp, snapshot['memory']['percent'], duration))
+        
+        net_rates = snapshot['net_rates']
+        if net_rates:
+            samples.append(('net_recv', timestamp, net_rates['bytes_recv'], duration))
+            samples.append(('net_sent', timestamp, net_rates['bytes_sent'], duration))
+        
+        disk_rates = snapshot['disk_rates']
+        if disk_rates:
+            samples.append(('disk', timestamp, disk_rates['read_bytes'] + disk_rates['write_bytes'], duration))
+        
+        for resource, kinds in (snapshot.get('pressure') or {}).items():
+            for kind, values in kinds.items():
+                if f'psi_{resource}_{kind}' not in self.histories:
+                    continue
+                if values['stall'] is not None:
+                    samples.append((f'psi_{resource}_{kind}', timestamp, values['stall'], duration))
+                samples.append((f'psi_{resource}_{kind}_avg10', timestamp, values['avg10'], duration))
+        
+        thermal = snapshot.get('thermal')
+        if thermal:
+            freq = [value for value in thermal['freq'] if value]
+            if freq:
+                samples.append(('cpu_freq_low', timestamp, min(freq), duration))
+                samples.append(('cpu_freq_high', timestamp, max(freq), duration))
+            if thermal['temps']:
+                samples.append(('cpu_temp', timestamp, max(value for label, value, critical in thermal['temps']), duration))
+            if thermal['throttle']:
+                samples.append(('cpu_throttle', timestamp, thermal['throttle']['percent'], duration))
+        
+        audio = snapshot.get('audio')
+        if audio and audio['available']:
+            samples.append(('dsp_load', timestamp, audio['dsp_load'], duration))
+        
+        for name, timestamp, value, duration in samples:
+            self.histories[name].add(timestamp, value, duration)
+        
+        # Kept until the recorded history has been loaded
+        if self.pending_samples is not None:
+            self.pending_samples.extend(samples)
+    
+    def update_disk_stats(self, snapshot):
         """Update disk statistics"""
-        partitions = psutil.disk_partitions()
+        partitions = snapshot['partitions']
         
         # Calculate total disk space
         total_space = 0
@@ -1493,27 +2798,32 @@ class SysStatsWindow(Gtk.Window):
             total_usage = 0
             partition_count = 0
             
-            for partition in partitions:
+            for device, usage in partitions:
                 # Check if partition belongs to this disk
-                if disk_name in partition.device:
-                    try:
-                        usage = psutil.disk_usage(partition.mountpoint)
-                        total_usage += usage.percent
-                        partition_count += 1
-                        
-                        # Add to totals
-                        total_space += usage.total
-                        used_space += usage.used
-                        free_space += usage.free
-                    except:
-                        pass
+                if disk_name in device:
+                    total_usage += usage['percent']
+                    partition_count += 1
+                    
+                    # Add to totals
+                    total_space += usage['total']
+                    used_space += usage['used']
+                    free_space += usage['free']
             
             # Calculate average usage
             if partition_count > 0:
                 avg_usage = total_usage / partition_count
-                widget['usage'] = avg_usage
                 widget['usage_label'].set_text(f"{avg_usage:.1f}%")
-                widget['drawing'].queue_draw()
+                if avg_usage != widget['usage']:
+                    widget['usage'] = avg_usage
+                    widget['drawing'].queue_draw()
+            
+            # Latency and utilization of the device
+            rates = snapshot['disk_devices'].get(disk_name)
+            if rates:
+                io = (round(rates['await'], 1), round(rates['util']), rates['queue'], rates['in_flight'])
+                if io != widget['io']:
+                    widget['io'] = io
+                    self.update_disk_io_label(widget, rates)
         
         # Update disk space summary
         if hasattr(self, 'disk_summary_label'):
@@ -1525,95 +2835,287 @@ class SysStatsWindow(Gtk.Window):
             self.disk_summary_label.set_text(summary)
         
         # Update disk activity
-        if hasattr(self, 'disk_activity_graph'):
-            disk_io = psutil.disk_io_counters()
-            if disk_io and self.last_disk_io:
-                # Calculate bytes per second
-                time_delta = 1.0
-                read_speed = (disk_io.read_bytes - self.last_disk_io.read_bytes) / time_delta
-                write_speed = (disk_io.write_bytes - self.last_disk_io.write_bytes) / time_delta
-                total_speed = read_speed + write_speed
-                
-                # Update history
-                self.disk_activity_history.append(total_speed)
-                
-                # Update label
-                self.disk_activity_label.set_text(f"{format_bytes(total_speed)}/s")
-                
-                # Redraw graph
-                self.disk_activity_graph.queue_draw()
-                
-                # Save current values
-                self.last_disk_io = disk_io
+        if hasattr(self, 'disk_activity_graph') and snapshot['disk_rates']:
+            total_speed = self.histories['disk'].last_value
+            
+            # Update label
+            self.disk_activity_label.set_text(f"{format_bytes(total_speed)}/s")
+            
+            # Redraw graph
+            self.disk_activity_graph.refresh()
+        
+        # Update per-device breakdown
+        if hasattr(self, 'disk_breakdown') and self.disk_breakdown['toggle'].get_active():
+            sync_list_store(self.disk_breakdown['store'], [
+                [name, rates['read_bytes'], rates['write_bytes'], rates['read_count'], rates['write_count'],
+                 rates['await'] / 1000.0, rates['svctm'] / 1000.0, rates['queue'], rates['util']]
+                for name, rates in snapshot['disk_devices'].items()
+            ])
     
-    def update_cpu_stats(self):
+    def update_disk_io_label(self, widget, rates):
+        """Show a disk's average wait and utilization, red when requests wait long"""
+        text = f"{_('await')} {rates['await']:.1f} ms · {rates['util']:.0f}%"
+        if rates['await'] >= SLOW_DISK_AWAIT:
+            widget['io_label'].set_markup(f"<span foreground='#FF3B30'><b>{text}</b></span>")
+        else:
+            widget['io_label'].set_text(text)
+        widget['io_label'].set_tooltip_text('\n'.join([
+            f"{_('read_await')}: {rates['r_await']:.2f} ms",
+            f"{_('write_await')}: {rates['w_await']:.2f} ms",
+            f"{_('service_time')}: {rates['svctm']:.2f} ms",
+            f"{_('queue_depth')}: {rates['queue']:.2f}",
+            f"{_('in_flight')}: {rates['in_flight']}",
+            f"{_('utilization')}: {rates['util']:.1f}%",
+        ]))
+    
+    def update_cpu_stats(self, snapshot):
         """Update CPU statistics"""
-        cpu_percent = psutil.cpu_percent(interval=0.1)
+        cpu_percent = snapshot['cpu_percent']
         self.cpu_usage_label.set_text(f"{cpu_percent:.1f}%")
         
-        # Update per-core usage
-        per_cpu = psutil.cpu_percent(interval=0.1, percpu=True)
-        for i, usage in enumerate(per_cpu):
-            if i < len(self.cpu_core_widgets):
-                self.cpu_core_widgets[i]['usage'] = usage
-                self.cpu_core_widgets[i]['label'].set_text(f"{usage:.0f}%")
-                self.cpu_core_widgets[i]['drawing'].queue_draw()
+        # Frequency, limits and governor of each core, by core number
+        thermal = snapshot.get('thermal') or {}
+        core_freq = {}
+        for index, cpu in enumerate(thermal.get('cpus', [])):
+            limits = thermal['limits'][index] if 'limits' in thermal else None
+            governor = thermal['governors'][index] if 'governors' in thermal else None
+            core_freq[cpu] = (thermal['freq'][index], limits, governor)
+        
+        # Update per-core usage and time breakdown
+        for i, times in enumerate(snapshot['per_cpu_times']):
+            if i < len(self.cpu_core_widgets) and times != self.cpu_core_widgets[i]['times']:
+                widget = self.cpu_core_widgets[i]
+                widget['usage'] = times['busy']
+                widget['times'] = times
+                widget['label'].set_text(f"{times['busy']:.0f}%")
+                tooltip = [f"{_('cpu_' + field)}: {times[field]:.1f}%" for field in BREAKDOWN_FIELDS]
+                if i in core_freq:
+                    freq, limits, governor = core_freq[i]
+                    widget['freq_label'].set_text(f"{freq / 1000:.2f} GHz")
+                    line = f"{_('frequency')}: {freq:.0f} MHz"
+                    if limits:
+                        line += f" ({limits[0]:.0f}–{limits[1]:.0f}, {_('max_freq')} {limits[2]:.0f})"
+                    if governor:
+                        line += f", {governor}"
+                    tooltip.append(line)
+                widget['drawing'].set_tooltip_text('\n'.join(tooltip))
+                widget['drawing'].queue_draw()
+        
+        self.update_latency_stats(snapshot)
+        self.update_thermal_stats(thermal)
         
         # Update frequency if available
         if hasattr(self, 'cpu_freq_label'):
-            cpu_freq = psutil.cpu_freq()
+            cpu_freq = snapshot['cpu_freq']
             if cpu_freq:
-                self.cpu_freq_label.set_text(f"{cpu_freq.current:.0f} MHz")
+                self.cpu_freq_label.set_text(f"{cpu_freq['current']:.0f} MHz")
     
-    def update_memory_stats(self):
+    def update_thermal_stats(self, thermal):
+        """Update the frequency and temperature graphs and figures"""
+        governors = sorted(set(thermal.get('governors') or []) - {''})
+        if governors:
+            self.cpu_governor_label.set_text(', '.join(governors))
+        
+        freq = [value for value in thermal.get('freq', []) if value]
+        if freq:
+            self.thermal_labels['frequency'].set_text(
+                f"{_('slowest_core')}: {min(freq):.0f} MHz   {_('fastest_core')}: {max(freq):.0f} MHz")
+        
+        temps = thermal.get('temps') or []
+        throttle = thermal.get('throttle')
+        parts = []
+        if temps:
+            label, value, critical = max(temps, key=lambda sensor: sensor[1])
+            parts.append(f"{_('hottest_sensor')}: {label} {value:.0f} °C")
+            self.thermal_labels['temperature'].set_tooltip_text('\n'.join(
+                f"{label}: {value:.1f} °C" + (f" (crit {critical:.0f} °C)" if critical else "")
+                for label, value, critical in temps
+            ))
+        elif thermal:
+            parts.append(_('no_sensors'))
+        if throttle:
+            parts.append(f"{_('throttling')}: {throttle['percent']:.0f}%, "
+                         f"{throttle['core_events'] + throttle['package_events']:.1f} {_('throttle_events')}")
+        if parts:
+            self.thermal_labels['temperature'].set_text('   '.join(parts))
+        
+        self.cpu_usage_graph.refresh()
+        self.cpu_freq_graph.refresh()
+        self.cpu_temp_graph.refresh()
+    
+    def update_latency_stats(self, snapshot):
+        """Update the wakeup latency figures and histogram"""
+        latency = snapshot.get('latency')
+        if not self.latency_enabled or not latency or latency == self.latency:
+            return
+        self.latency = latency
+        policy = 'SCHED_FIFO' if latency['policy'] == 'fifo' else _('policy_other')
+        p99 = f"≤ {latency['p99']} µs" if latency['p99'] is not None else "–"
+        self.latency_label.set_text(
+            f"{_('maximum')}: {latency['max']:.0f} µs   p99: {p99}\n"
+            f"{_('wakeups')}: {latency['count']}   {_('policy')}: {policy}"
+        )
+        self.latency_histogram.queue_draw()
+    
+    def update_memory_stats(self, snapshot):
         """Update memory statistics"""
-        mem = psutil.virtual_memory()
-        self.memory_usage_label.set_markup(f"<b>{_('usage')}:</b> {mem.percent:.1f}% ({format_bytes(mem.used)} / {format_bytes(mem.total)})")
+        mem = snapshot['memory']
+        self.memory_usage_label.set_markup(f"<b>{_('usage')}:</b> {mem['percent']:.1f}% ({format_bytes(mem['used'])} / {format_bytes(mem['total'])})")
+        
+        self.memory_graph.refresh()
         
         # Update memory module squares
-        for widget in self.memory_module_widgets:
-            widget['drawing'].queue_draw()
+        if mem['percent'] != self.memory_percent:
+            self.memory_percent = mem['percent']
+            for widget in self.memory_module_widgets:
+                widget['drawing'].queue_draw()
     
-    def update_network_stats(self):
+    def update_network_stats(self, snapshot):
         """Update network statistics with graphs"""
-        net_io = psutil.net_io_counters()
+        net_rates = snapshot['net_rates']
+        if not net_rates:
+            return
         
-        # Calculate speed (bytes per second)
-        time_delta = 1.0  # 1 second update interval
-        download_speed = (net_io.bytes_recv - self.last_net_io.bytes_recv) / time_delta
-        upload_speed = (net_io.bytes_sent - self.last_net_io.bytes_sent) / time_delta
-        
-        # Update history
-        self.net_download_history.append(download_speed)
-        self.net_upload_history.append(upload_speed)
+        download_speed = net_rates['bytes_recv']
+        upload_speed = net_rates['bytes_sent']
         
         # Update labels
         self.download_speed_label.set_text(f"{format_bytes(download_speed)}/s")
         self.upload_speed_label.set_text(f"{format_bytes(upload_speed)}/s")
         
         # Redraw graphs
-        self.download_graph.queue_draw()
-        self.upload_graph.queue_draw()
-        
-        # Save current values
-        self.last_net_io = net_io
+        self.download_graph.refresh()
+        self.upload_graph.refresh()
+        
+        # Update per-interface breakdown
+        if self.net_breakdown['toggle'].get_active():
+            sync_list_store(self.net_breakdown['store'], [
+                [name, rates['bytes_recv'], rates['bytes_sent'], rates['packets_recv'],
+                 rates['packets_sent'], float(rates['errors']), float(rates['drops'])]
+                for name, rates in snapshot['net_interfaces'].items()
+            ])
     
-    def update_processes(self):
-        """Update process list"""
-        self.process_store.clear()
-        
-        for proc in psutil.process_iter(['pid', 'name', 'username', 'cpu_percent', 'memory_percent']):
-            try:
-                info = proc.info
-                self.process_store.append([
-                    info['pid'],
-                    info['name'],
-                    info['username'] or '',
-                    info['cpu_percent'] or 0.0,
-                    info['memory_percent'] or 0.0
+    def update_pressure_stats(self, snapshot):
+        """Update pressure stall graphs and averages"""
+        pressure = snapshot.get('pressure')
+        self.pressure_unavailable_label.set_visible(not pressure)
+        if not pressure:
+            return
+        
+        for resource, widget in self.pressure_widgets.items():
+            widget['graph'].refresh()
+            kinds = pressure.get(resource)
+            if not kinds or kinds == widget['pressure']:
+                continue
+            widget['pressure'] = kinds
+            parts = []
+            for kind in PRESSURE_KINDS:
+                if kind not in kinds:
+                    continue
+                values = kinds[kind]
+                r, g, b = (int(channel * 255) for channel in PRESSURE_COLORS[kind])
+                stall = f"{values['stall']:.1f}%" if values['stall'] is not None else "–"
+                parts.append(
+                    f"<span foreground='#{r:02x}{g:02x}{b:02x}'>■</span> <b>{_('psi_' + kind)}:</b> {stall}  "
+                    f"({values['avg10']:.2f} / {values['avg60']:.2f} / {values['avg300']:.2f})"
+                )
+            widget['values_label'].set_markup('    '.join(parts))
+        
+        # Update per-cgroup breakdown
+        if self.cgroup_breakdown['toggle'].get_active():
+            sync_list_store(self.cgroup_breakdown['store'], [
+                [name] + [
+                    float(readings.get(resource, {}).get(kind, 0.0))
+                    for resource, kind in (('cpu', 'some'), ('memory', 'some'), ('memory', 'full'), ('io', 'some'), ('io', 'full'))
+                ]
+                for name, readings in snapshot.get('cgroup_pressure') or []
+            ])
+    
+    def update_audio_stats(self, snapshot):
+        """Update PipeWire driver figures, DSP load graph and node list"""
+        audio = snapshot.get('audio')
+        if audio is None:
+            return
+        # No error while pw-top has not printed its first refresh
+        self.audio_unavailable_label.set_visible(not audio['available'] and audio['error'] is not None)
+        if not audio['available']:
+            return
+        
+        running = [driver for driver in audio['drivers'] if driver['state'] == 'R' and driver['rate']]
+        if running:
+            driver = max(running, key=lambda driver: driver['busy_q'] or 0.0)
+            self.audio_labels['driver'].set_text(driver['description'] or driver['name'])
+            self.audio_labels['quantum'].set_text(f"{driver['quantum']} / {driver['rate']} Hz")
+            self.audio_labels['latency'].set_text(f"{driver['quantum'] * 1000.0 / driver['rate']:.2f} ms")
+        self.audio_labels['dsp_load'].set_text(f"{audio['dsp_load']:.1f}%")
+        self.audio_xruns += audio['xruns']
+        self.audio_labels['xruns'].set_text(f"{self.audio_xruns} ({audio['errors']} {_('node_errors')})")
+        
+        self.dsp_load_graph.refresh()
+        
+        rows = []
+        for driver in audio['drivers']:
+            for node in [driver] + driver['followers']:
+                name = node['description'] or node['name']
+                rows.append([
+                    node['id'],
+                    f"    {name}" if node['follower'] else name,
+                    node['quantum'],
+                    node['rate'],
+                    node['wait'] if node['wait'] is not None else -1.0,
+                    node['busy'] if node['busy'] is not None else -1.0,
+                    node['wait_q'] if node['wait_q'] is not None else -1.0,
+                    node['busy_q'] if node['busy_q'] is not None else -1.0,
+                    node['errors'],
+                    '#FF3B30' if node['over_budget'] else '#333333',
                 ])
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                pass
+        sync_list_store(self.audio_store, rows)
+    
+    def update_interrupt_stats(self, snapshot):
+        """Update the interrupt matrix and table"""
+        interrupts = snapshot.get('interrupts')
+        if not interrupts:
+            return
+        
+        rows = len(interrupts['irqs']) + len(interrupts['softirqs'])
+        if not self.interrupts or rows != len(self.interrupts['irqs']) + len(self.interrupts['softirqs']):
+            self.interrupt_matrix.set_size_request(-1, 14 + rows * 14)
+        self.interrupts = interrupts
+        self.interrupt_matrix.queue_draw()
+        
+        cpus = interrupts['cpus']
+        sync_list_store(self.interrupt_store, [
+            [
+                irq['irq'],
+                irq['description'],
+                irq['rate'],
+                irq['affinity'] or '–',
+                irq['effective'] or '–',
+                f"CPU{cpus[max(range(len(irq['per_cpu'])), key=irq['per_cpu'].__getitem__)]}",
+            ]
+            for irq in interrupts['irqs']
+        ])
+    
+    def update_threads(self, snapshot):
+        """Update the thread audit list"""
+        only_realtime = self.threads_filter.get_active()
+        rows = []
+        for tid, pid, process, thread, policy, rt_priority, nice, affinity, cpu, audio, problem in snapshot['threads']:
+            if only_realtime and not audio and policy not in ('FIFO', 'RR', 'DEADLINE'):
+                continue
+            if problem == 'not_realtime':
+                problem_text = _('not_realtime')
+            elif problem:
+                problem_text = f"{_('preempted_by')} {problem[len('irq:'):]}"
+            else:
+                problem_text = ''
+            color = '#FF3B30' if problem else '#007AFF' if audio else '#333333'
+            rows.append([tid, pid, process, thread, policy, rt_priority, nice, affinity, cpu, problem_text, color])
+        sync_list_store(self.threads_store, rows)
+    
+    def update_processes(self, snapshot):
+        """Update process list in place, keyed by PID"""
+        sync_list_store(self.process_store, snapshot['processes'])
 
 def main():
     win = SysStatsWindow()
@@ -0,0 +1,5 @@
+"""
+miloOS System Statistics Monitor - collectors
+Data sources shared by the SysStats window and its command-line tools.
+Nothing in this package imports GTK.
+"""
@@ -0,0 +1,76 @@
+"""
+Command-line mode
+Prints collector snapshots as newline-delimited JSON, for use over SSH
+and in shell pipelines. GTK is never imported.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from sysstats_lib.collector import Collector, PAGES
+
+DEFAULT_PAGES = ('cpu', 'memory', 'disk', 'network')
+
+# The first snapshot's rates are measured over this long, so it is
+# printed without waiting a whole interval
+PRIME_INTERVAL = 0.1
+
+def parse_pages(value):
+    pages = [page.strip() for page in value.split(',') if page.strip()]
+    unknown = set(pages) - set(PAGES)
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown page: {', '.join(sorted(unknown))} (choose from {', '.join(PAGES)})")
+    return pages
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='sysstats',
+        description="miloOS System Statistics Monitor. Without options the window is opened.",
+    )
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument('--json', action='store_true', help="print one snapshot as JSON and exit")
+    mode.add_argument('--watch', action='store_true', help="print a JSON snapshot per line every interval")
+    parser.add_argument('--interval', type=float, default=1.0,
+                        help="seconds between snapshots; rates are measured over this time, "
+                             f"the first snapshot's over {PRIME_INTERVAL:g} s (default 1)")
+    parser.add_argument('--count', type=int, default=None, help="stop after this many snapshots in --watch mode")
+    parser.add_argument('--pages', type=parse_pages, default=list(DEFAULT_PAGES),
+                        help=f"comma-separated data to include (default {','.join(DEFAULT_PAGES)})")
+    return parser
+
+def write(snapshot):
+    sys.stdout.write(json.dumps(snapshot, separators=(',', ':')) + '\n')
+    sys.stdout.flush()
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.interval <= 0:
+        print("sysstats: --interval must be positive", file=sys.stderr)
+        return 2
+
+    count = 1 if args.json else args.count
+    collector = Collector()
+    collector.prime()
+    deadline = time.monotonic() + min(PRIME_INTERVAL, args.interval)
+
+    try:
+        written = 0
+        while count is None or written < count:
+            time.sleep(max(deadline - time.monotonic(), 0))
+            write(collector.collect(args.pages))
+            written += 1
+            # Fixed deadlines keep the interval from drifting by the collection time
+            deadline += args.interval
+    except KeyboardInterrupt:
+        return 130
+    except BrokenPipeError:
+        # Reader went away, e.g. piped into head; silence the flush at exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    finally:
+        # Stops the latency probe and pw-top if the pages started them
+        collector.close()
+    return 0
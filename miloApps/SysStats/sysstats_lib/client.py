@@ -0,0 +1,140 @@
+"""
+Collector daemon client
+Subscribes to the collector socket and hands snapshots to a callback,
+starting the daemon when it is not running.
+"""
+
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+from sysstats_lib import protocol
+
+# Directory that holds the sysstats_lib package, for starting the daemon
+LIB_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# A daemon started on demand exits this long after its last client
+SPAWN_LINGER = 60
+
+def spawn_collector(path=protocol.SOCKET_PATH):
+    """Start a collector daemon detached from the calling process"""
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [LIB_DIR, env.get('PYTHONPATH')]))
+    subprocess.Popen(
+        [sys.executable, '-m', 'sysstats_lib.daemon', '--socket', path, '--linger', str(SPAWN_LINGER)],
+        env=env, cwd='/',
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+class CollectorClient(threading.Thread):
+    """Receives snapshots from the collector daemon in a background thread
+
+    The callback is called from the client thread with each snapshot.
+    If the daemon goes away the client reconnects, starting a new one.
+    Connecting, and starting the daemon, happen in the client thread. If
+    no daemon can be reached at all, on_unavailable is called from the
+    client thread, which then exits; without it the client keeps trying.
+    """
+
+    def __init__(self, callback, pages=('overview',), path=protocol.SOCKET_PATH, on_unavailable=None):
+        super().__init__(name='sysstats-client', daemon=True)
+        self.callback = callback
+        self.on_unavailable = on_unavailable
+        self.pages = list(pages)
+        self.interval = None
+        self.path = path
+        self.sock = None
+        self._send_lock = threading.Lock()
+        self._running = True
+
+    def connect(self, spawn=False, timeout=2.0):
+        """Connect and subscribe; returns False if no daemon could be reached"""
+        sock = self.try_connect()
+        if sock is None and spawn:
+            try:
+                spawn_collector(self.path)
+            except OSError:
+                return False
+            deadline = time.monotonic() + timeout
+            while sock is None and time.monotonic() < deadline:
+                time.sleep(0.05)
+                sock = self.try_connect()
+        if sock is None:
+            return False
+
+        self.sock = sock
+        self.send({'type': 'subscribe', 'pages': self.pages, 'interval': self.interval})
+        return True
+
+    def try_connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.path)
+            return sock
+        except OSError:
+            sock.close()
+            return None
+
+    def send(self, message):
+        with self._send_lock:
+            if self.sock is None:
+                return
+            try:
+                self.sock.sendall(protocol.encode(message))
+            except OSError:
+                pass
+
+    def set_pages(self, pages, interval=None):
+        """Select the pages to receive data for and the interval wanted"""
+        self.pages = list(pages)
+        self.interval = interval
+        self.send({'type': 'subscribe', 'pages': self.pages, 'interval': self.interval})
+
+    def stop(self):
+        """Disconnect and stop the client thread"""
+        self._running = False
+        sock = self.sock
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def run(self):
+        decoder = protocol.FrameDecoder()
+        connected = False
+        while self._running:
+            if self.sock is None:
+                if not self.connect(spawn=True):
+                    if not connected and self.on_unavailable is not None:
+                        if self._running:
+                            self.on_unavailable()
+                        return
+                    time.sleep(1.0)
+                    continue
+                connected = True
+                decoder = protocol.FrameDecoder()
+
+            try:
+                data = self.sock.recv(65536)
+                messages = decoder.feed(data) if data else None
+            except (OSError, ValueError):
+                messages = None
+
+            if messages is None:
+                with self._send_lock:
+                    self.sock.close()
+                    self.sock = None
+                continue
+
+            for message in messages:
+                if message.get('type') == 'snapshot':
+                    self.callback(message['snapshot'])
+
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
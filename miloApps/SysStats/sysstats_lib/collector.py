@@ -0,0 +1,275 @@
+"""
+System statistics collector
+Samples psutil, /proc and sysfs into snapshots made of plain dicts and
+lists, so they can be sent over a socket or written out as JSON.
+"""
+
+import threading
+import time
+
+import psutil
+
+from sysstats_lib import diskstats, procscan, sysfs
+from sysstats_lib.cpustat import CpuTimes
+from sysstats_lib.interrupts import InterruptMonitor
+from sysstats_lib.latency import LatencyMonitor
+from sysstats_lib.pipewire import AudioMonitor
+from sysstats_lib.procscan import ProcessScanner
+from sysstats_lib.psi import PressureMonitor
+from sysstats_lib.rates import RateEngine
+from sysstats_lib.recorder import RECORD_INTERVAL, TOP_PROCESSES
+from sysstats_lib.thermal import ThermalMonitor
+from sysstats_lib.threads import ThreadScanner
+
+# Pages a consumer can ask data for
+PAGES = ('overview', 'cpu', 'memory', 'disk', 'network', 'pressure', 'audio', 'interrupts', 'threads', 'processes', 'latency')
+
+# Snapshot keys only collected for one page; every other key is common
+PAGE_KEYS = {
+    'cpu': ('per_cpu', 'per_cpu_times', 'cpu_freq'),
+    'disk': ('partitions',),
+    'pressure': ('cgroup_pressure',),
+    'audio': ('audio',),
+    'interrupts': ('interrupts',),
+    'threads': ('threads',),
+    'processes': ('processes',),
+    'latency': ('latency',),
+}
+
+# Kept for the recorder and the metrics exporter, not sent to consumers
+PRIVATE_KEYS = ('top_processes',)
+
+# Shortest sampling interval a consumer can ask for, in seconds
+MIN_INTERVAL = 0.25
+
+def for_pages(snapshot, pages):
+    """A copy of snapshot holding only the data a consumer of pages needs"""
+    dropped = set(PRIVATE_KEYS)
+    for page, keys in PAGE_KEYS.items():
+        if page not in pages:
+            dropped.update(keys)
+    filtered = {key: value for key, value in snapshot.items() if key not in dropped}
+    filtered['pages'] = sorted(set(snapshot['pages']) & set(pages))
+    return filtered
+
+class Collector:
+    """Samples the system for any number of consumers
+
+    CPU, memory, network and disk counters are sampled on every call,
+    so their rates and graphs stay continuous; page-specific data is only
+    collected for the pages asked for. When a writable recorder is given
+    snapshots are also appended to it, at most one per RECORD_INTERVAL.
+    """
+
+    def __init__(self, recorder=None):
+        self.recorder = recorder
+        self.rates = RateEngine()
+        self.cpu_times = CpuTimes()
+        self.core_times = []
+        self.process_scanner = ProcessScanner()
+        self.pressure = PressureMonitor()
+        self.thermal = ThermalMonitor()
+        self.audio = AudioMonitor()
+        self.latency = LatencyMonitor()
+        self.interrupts = InterruptMonitor()
+        self.thread_scanner = ThreadScanner()
+        self.total_memory = psutil.virtual_memory().total
+        self.last_collect = None
+        self.last_record = 0.0
+
+    @property
+    def recording(self):
+        return self.recorder is not None and self.recorder.writable
+
+    def prime(self):
+        """Take the first counter readings so the next snapshot has rates"""
+        self.collect_counters()
+
+    def collect_counters(self, pages=()):
+        """Sample the cheap system-wide counters and turn them into rates
+
+        Frequency limits and governors are only read for the CPU page.
+        """
+        now = time.monotonic()
+        # CPU percentages are measured since the previous call, from a
+        # single read of /proc/stat
+        cpu_times = self.cpu_times.update()
+        total_times, self.core_times = cpu_times or (None, [])
+        snapshot = {
+            'time': time.time(),
+            # Seconds the rates were measured over
+            'elapsed': now - self.last_collect if self.last_collect is not None else None,
+            'cpu_percent': total_times['busy'] if total_times else 0.0,
+            'cpu_times': total_times,
+            'memory': psutil.virtual_memory()._asdict(),
+            'net_rates': self.rates.update('net', psutil.net_io_counters(), now),
+            'disk_rates': self.rates.update('disk', psutil.disk_io_counters(), now),
+            'disk_devices': {},
+            'net_interfaces': {},
+            # Stall-time rates need a reading every tick, like the counters
+            'pressure': self.pressure.system(now),
+            # Throttling is caught as it happens, whatever page is shown
+            'thermal': self.thermal.sample(now, details='cpu' in pages),
+        }
+        sources = {'net', 'disk'}
+
+        # Per-device breakdown with iostat -x figures, physical disks only
+        physical_disks = set(sysfs.physical_disk_names())
+        for name, counters in diskstats.read_diskstats(physical_disks).items():
+            in_flight = counters.pop('in_flight')
+            sources.add(f'disk:{name}')
+            rates = self.rates.update(f'disk:{name}', counters, now, wrap=diskstats.COUNTER_WRAP)
+            if rates:
+                rates.update(diskstats.extended_stats(rates, in_flight))
+                snapshot['disk_devices'][name] = rates
+
+        # Per-interface breakdown; errors and drops are totals since boot
+        for name, counters in psutil.net_io_counters(pernic=True).items():
+            if name == 'lo':
+                continue
+            sources.add(f'net:{name}')
+            rates = self.rates.update(f'net:{name}', counters, now)
+            if rates:
+                rates['errors'] = counters.errin + counters.errout
+                rates['drops'] = counters.dropin + counters.dropout
+                snapshot['net_interfaces'][name] = rates
+
+        self.rates.discard(sources)
+        self.last_collect = now
+        return snapshot
+
+    def collect(self, pages, top_processes=False):
+        """Collect a snapshot with the data needed by the given pages
+
+        The busiest processes are included when a record is due or when
+        top_processes is set.
+        """
+        pages = set(pages)
+        snapshot = {'pages': sorted(pages)}
+        snapshot.update(self.collect_counters(pages))
+
+        # Allow for timer jitter so 1 s sampling records every sample
+        record_due = self.recording and snapshot['time'] - self.last_record >= RECORD_INTERVAL - 0.1
+
+        # Processes are scanned once, whether shown, recorded or both, and
+        # not at all on ticks that need neither
+        top_processes = top_processes or record_due
+        if 'processes' in pages or top_processes:
+            process_snapshot, process_cpu = self.process_scanner.scan()
+            if 'processes' in pages:
+                snapshot['processes'] = self.process_scanner.rows(process_snapshot, process_cpu, self.total_memory)
+            if top_processes:
+                snapshot['top_processes'] = procscan.top(process_snapshot, process_cpu, self.total_memory, TOP_PROCESSES)
+
+        if 'cpu' in pages:
+            cpu_freq = psutil.cpu_freq()
+            snapshot['per_cpu'] = [core['busy'] for core in self.core_times]
+            snapshot['per_cpu_times'] = self.core_times
+            snapshot['cpu_freq'] = cpu_freq._asdict() if cpu_freq else None
+
+        if 'pressure' in pages:
+            snapshot['cgroup_pressure'] = self.pressure.cgroups()
+
+        # pw-top only runs while the audio page is wanted
+        if 'audio' in pages:
+            snapshot['audio'] = self.audio.sample(time.monotonic())
+        else:
+            self.audio.close()
+
+        if 'threads' in pages:
+            snapshot['threads'] = self.thread_scanner.audit()
+
+        # Rates are measured since the previous request, however long ago
+        if 'interrupts' in pages:
+            snapshot['interrupts'] = self.interrupts.sample()
+
+        # The latency probe measures from when it is first asked for until
+        # nobody asks any more
+        if 'latency' in pages and self.latency.start():
+            snapshot['latency'] = self.latency.sample()
+        elif self.latency.running:
+            self.latency.stop()
+
+        if 'disk' in pages:
+            partitions = []
+            for partition in psutil.disk_partitions():
+                try:
+                    partitions.append((partition.device, psutil.disk_usage(partition.mountpoint)._asdict()))
+                except OSError:
+                    pass
+            snapshot['partitions'] = partitions
+
+        if record_due:
+            self.record(snapshot)
+            self.last_record = snapshot['time']
+
+        return snapshot
+
+    def record(self, snapshot):
+        """Append a snapshot to the on-disk history"""
+        net_rates = snapshot['net_rates'] or {}
+        disk_rates = snapshot['disk_rates'] or {}
+        self.recorder.append({
+            'time': snapshot['time'],
+            'cpu': snapshot['cpu_percent'],
+            'memory': snapshot['memory']['percent'],
+            'disk_read': disk_rates.get('read_bytes'),
+            'disk_write': disk_rates.get('write_bytes'),
+            'net_recv': net_rates.get('bytes_recv'),
+            'net_sent': net_rates.get('bytes_sent'),
+            'processes': snapshot.get('top_processes'),
+        })
+
+    def close(self):
+        """Release the recorder and stop pw-top and the latency probe"""
+        self.audio.close()
+        self.latency.stop()
+        if self.recorder:
+            self.recorder.close()
+
+class Sampler(threading.Thread):
+    """Runs a Collector in a background thread
+
+    Used when no collector daemon is available. The callback is called
+    from the sampler thread with each snapshot.
+    """
+
+    def __init__(self, callback, interval=1.0, recorder=None, pages=('overview',)):
+        super().__init__(name='sysstats-sampler', daemon=True)
+        self.callback = callback
+        self.base_interval = interval
+        self.interval = interval
+        self.collector = Collector(recorder)
+        self.pages = list(pages)
+        self._wakeup = threading.Event()
+        self._running = True
+
+    def set_pages(self, pages, interval=None):
+        """Select the pages and sampling interval and sample right away"""
+        self.pages = list(pages)
+        self.interval = max(interval or self.base_interval, MIN_INTERVAL)
+        self._wakeup.set()
+
+    def stop(self):
+        """Stop the sampler thread"""
+        self._running = False
+        self._wakeup.set()
+
+    def run(self):
+        self.collector.prime()
+
+        while self._running:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            if not self._running:
+                break
+
+            try:
+                snapshot = self.collector.collect(self.pages)
+            except Exception as e:
+                print(f"Error collecting stats: {e}")
+                continue
+
+            self.callback(snapshot)
+
+        self.collector.close()
@@ -0,0 +1,79 @@
+"""
+Per-core CPU time breakdown
+Reads /proc/stat once per tick and splits the time of every core into
+user, nice, system, iowait, irq, softirq and steal percentages.
+"""
+
+# Columns of the cpu lines in /proc/stat, in order. guest and guest_nice
+# follow but are already counted in user and nice.
+STAT_FIELDS = ('user', 'nice', 'system', 'idle', 'iowait', 'irq', 'softirq', 'steal')
+
+# Fields reported, in the order they are stacked
+BREAKDOWN_FIELDS = ('user', 'nice', 'system', 'irq', 'softirq', 'steal', 'iowait')
+
+# Time not counted as busy, as in top and psutil
+IDLE_FIELDS = ('idle', 'iowait')
+
+def read_stat(path='/proc/stat'):
+    """CPU time counters by line: 'cpu' for all CPUs, then each core by number"""
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    total = None
+    cores = {}
+    for line in data.split(b'\n'):
+        if not line.startswith(b'cpu'):
+            # The cpu lines come first
+            if cores:
+                break
+            continue
+        fields = line.split()
+        values = tuple(int(value) for value in fields[1:len(STAT_FIELDS) + 1])
+        values += (0,) * (len(STAT_FIELDS) - len(values))
+        name = fields[0][3:]
+        if name:
+            cores[int(name)] = values
+        else:
+            total = values
+    return total, cores
+
+def breakdown(current, previous):
+    """Percentages of each field between two counter tuples, plus 'busy'"""
+    deltas = [max(now - before, 0) for now, before in zip(current, previous)]
+    elapsed = sum(deltas)
+    if not elapsed:
+        result = {field: 0.0 for field in BREAKDOWN_FIELDS}
+        result['busy'] = 0.0
+        return result
+
+    by_field = dict(zip(STAT_FIELDS, deltas))
+    result = {field: 100.0 * by_field[field] / elapsed for field in BREAKDOWN_FIELDS}
+    idle = sum(by_field[field] for field in IDLE_FIELDS)
+    result['busy'] = 100.0 * (elapsed - idle) / elapsed
+    return result
+
+class CpuTimes:
+    """Turns successive /proc/stat readings into per-core breakdowns"""
+
+    def __init__(self, path='/proc/stat'):
+        self.path = path
+        self.previous = None
+
+    def update(self):
+        """Breakdown of all CPUs and of each online core since the last call
+
+        Returns (total, cores), where cores is a list ordered by core
+        number, or None on the first call.
+        """
+        total, cores = read_stat(self.path)
+        previous, self.previous = self.previous, (total, cores)
+        if previous is None:
+            return None
+
+        previous_total, previous_cores = previous
+        # A core brought online since the last reading starts from zero
+        zero = (0,) * len(STAT_FIELDS)
+        return (
+            breakdown(total, previous_total),
+            [breakdown(cores[number], previous_cores.get(number, zero)) for number in sorted(cores)],
+        )
@@ -0,0 +1,298 @@
+"""
+SysStats collector daemon
+Samples the system once per tick and publishes each snapshot to every
+subscriber on a Unix domain socket, recording it to the history ring.
+
+Run with: python3 -m sysstats_lib.daemon [--interval SECONDS]
+"""
+
+import argparse
+import os
+import selectors
+import signal
+import socket
+import time
+
+from sysstats_lib import openmetrics, protocol
+from sysstats_lib.collector import Collector, MIN_INTERVAL, PAGES, for_pages
+from sysstats_lib.recorder import RECORD_INTERVAL, Recorder
+
+# Snapshots are skipped for a client with this much unsent data
+MAX_BACKLOG = 4 * 1024 * 1024
+
+class Subscriber:
+    """A connected client and the pages it wants data for"""
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.decoder = protocol.FrameDecoder()
+        self.pages = set()
+        self.interval = None
+        self.outbuf = bytearray()
+
+class CollectorServer:
+    """Publishes snapshots from one Collector to any number of clients
+
+    Messages from clients:
+        {'type': 'subscribe', 'pages': [...], 'interval': seconds or None}
+            select the pages to collect and the sampling interval wanted
+    Messages to clients:
+        {'type': 'snapshot', 'snapshot': {...}}  sent on every tick, holding
+            only the pages that client subscribed to
+
+    The data collected each tick is the union of what subscribers asked
+    for, so extra clients cost a send, not another pass over /proc. The
+    sampling interval is the shortest one asked for, or the daemon's own
+    when no client has a preference.
+    With an exporter, per-core CPU and top processes are always
+    collected and every snapshot is handed to it as well. With latency
+    set the latency probe runs whether or not a client asks for it, so
+    its histogram covers the whole session.
+    """
+
+    def __init__(self, path=protocol.SOCKET_PATH, interval=1.0, recorder=None, linger=None, exporter=None, latency=False):
+        self.path = path
+        self.base_interval = interval
+        self.linger = linger
+        self.latency = latency
+        self.exporter = exporter
+        self.collector = Collector(recorder)
+        self.selector = selectors.DefaultSelector()
+        self.listener = None
+        self.subscribers = {}
+        self.next_tick = 0.0
+        self.running = True
+
+    def bind(self):
+        """Listen on the socket path
+
+        Returns False when another collector already serves it.
+        """
+        os.makedirs(os.path.dirname(self.path), mode=0o700, exist_ok=True)
+        if os.path.exists(self.path):
+            if protocol.is_alive(self.path):
+                return False
+            # Left behind by a collector that did not exit cleanly
+            os.unlink(self.path)
+
+        self.listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self.listener.bind(self.path)
+        except OSError:
+            self.listener.close()
+            self.listener = None
+            return False
+        os.chmod(self.path, 0o600)
+        self.listener.listen()
+        self.listener.setblocking(False)
+        self.selector.register(self.listener, selectors.EVENT_READ, self.accept)
+        return True
+
+    def pages(self):
+        """Pages wanted by at least one subscriber"""
+        pages = set()
+        for subscriber in self.subscribers.values():
+            pages |= subscriber.pages
+        return pages
+
+    def interval(self):
+        """Sampling interval wanted by the subscribers
+
+        Never longer than the recording interval while recording, so the
+        history ring has no gaps when every client asks for slow updates.
+        """
+        wanted = [subscriber.interval for subscriber in self.subscribers.values() if subscriber.interval]
+        interval = max(min(wanted), MIN_INTERVAL) if wanted else self.base_interval
+        if self.collector.recording:
+            interval = min(interval, RECORD_INTERVAL)
+        return interval
+
+    def accept(self, sock, mask):
+        conn, _ = sock.accept()
+        conn.setblocking(False)
+        subscriber = Subscriber(conn)
+        self.subscribers[conn] = subscriber
+        self.selector.register(conn, selectors.EVENT_READ, self.service)
+
+    def drop(self, subscriber):
+        """Disconnect a subscriber"""
+        self.selector.unregister(subscriber.sock)
+        subscriber.sock.close()
+        del self.subscribers[subscriber.sock]
+
+    def service(self, sock, mask):
+        subscriber = self.subscribers[sock]
+        if mask & selectors.EVENT_READ:
+            try:
+                data = sock.recv(65536)
+                if not data:
+                    raise ConnectionResetError
+                messages = subscriber.decoder.feed(data)
+            except (OSError, ValueError):
+                self.drop(subscriber)
+                return
+            for message in messages:
+                if not self.handle(subscriber, message):
+                    # Not a client of ours; the others are unaffected
+                    self.drop(subscriber)
+                    return
+        if mask & selectors.EVENT_WRITE:
+            self.flush(subscriber)
+
+    def handle(self, subscriber, message):
+        """Act on a message from a subscriber
+
+        Returns False for a malformed message.
+        """
+        if not isinstance(message, dict):
+            return False
+        if message.get('type') == 'subscribe':
+            pages = message.get('pages') or ()
+            if not isinstance(pages, (list, tuple)) or not all(isinstance(page, str) for page in pages):
+                return False
+            before = self.pages()
+            subscriber.pages = set(pages) & set(PAGES)
+            interval = message.get('interval')
+            subscriber.interval = float(interval) if isinstance(interval, (int, float)) and interval > 0 else None
+            # Collect right away when a page nobody had asked for is opened
+            if self.pages() - before:
+                self.next_tick = time.monotonic()
+            else:
+                self.next_tick = min(self.next_tick, time.monotonic() + self.interval())
+        return True
+
+    def flush(self, subscriber):
+        """Send as much pending data as the socket accepts"""
+        try:
+            sent = subscriber.sock.send(subscriber.outbuf)
+        except BlockingIOError:
+            sent = 0
+        except OSError:
+            self.drop(subscriber)
+            return
+        del subscriber.outbuf[:sent]
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if subscriber.outbuf else 0)
+        self.selector.modify(subscriber.sock, events, self.service)
+
+    def publish(self, snapshot):
+        """Queue a snapshot for every subscriber that keeps up
+
+        Each subscriber gets the pages it asked for; the frame is encoded
+        once per distinct set of pages.
+        """
+        frames = {}
+        for subscriber in list(self.subscribers.values()):
+            if len(subscriber.outbuf) > MAX_BACKLOG:
+                continue
+            pages = frozenset(subscriber.pages)
+            if pages not in frames:
+                frames[pages] = protocol.encode({'type': 'snapshot', 'snapshot': for_pages(snapshot, pages)})
+            subscriber.outbuf += frames[pages]
+            self.flush(subscriber)
+
+    def tick(self):
+        pages = self.pages()
+        if self.exporter:
+            pages.add('cpu')
+        if self.latency:
+            pages.add('latency')
+        try:
+            snapshot = self.collector.collect(pages, top_processes=self.exporter is not None)
+        except Exception as e:
+            print(f"Error collecting stats: {e}")
+            return
+        if self.exporter:
+            self.exporter.update(snapshot)
+        if self.subscribers:
+            self.publish(snapshot)
+
+    def stop(self, *args):
+        self.running = False
+
+    def serve_forever(self):
+        """Sample and publish until stopped, or idle for linger seconds"""
+        self.collector.prime()
+        self.next_tick = time.monotonic() + self.interval()
+        idle_since = time.monotonic()
+
+        while self.running:
+            timeout = max(self.next_tick - time.monotonic(), 0)
+            for key, mask in self.selector.select(timeout):
+                key.data(key.fileobj, mask)
+
+            now = time.monotonic()
+            if now >= self.next_tick:
+                self.tick()
+                interval = self.interval()
+                self.next_tick += interval
+                if self.next_tick <= now:
+                    # Fell behind, e.g. after a suspend; do not catch up
+                    self.next_tick = now + interval
+
+            if self.subscribers:
+                idle_since = None
+            elif idle_since is None:
+                idle_since = now
+            elif self.linger is not None and not (self.exporter or self.latency) and now - idle_since >= self.linger:
+                break
+
+        self.close()
+
+    def close(self):
+        for subscriber in list(self.subscribers.values()):
+            self.drop(subscriber)
+        if self.listener:
+            self.selector.unregister(self.listener)
+            self.listener.close()
+            self.listener = None
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+        if self.exporter:
+            self.exporter.stop()
+        self.collector.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SysStats collector daemon")
+    parser.add_argument('--socket', default=protocol.SOCKET_PATH, help="socket path")
+    parser.add_argument('--interval', type=float, default=1.0, help="seconds between samples")
+    parser.add_argument('--linger', type=float, default=None,
+                        help="exit after this many seconds without clients")
+    parser.add_argument('--no-record', action='store_true', help="do not write the history ring")
+    parser.add_argument('--metrics-port', type=int, default=None,
+                        help=f"serve OpenMetrics over HTTP on this port (usually {openmetrics.DEFAULT_PORT})")
+    parser.add_argument('--metrics-address', default=openmetrics.DEFAULT_ADDRESS,
+                        help="address for the metrics endpoint")
+    parser.add_argument('--latency', action='store_true',
+                        help="keep measuring scheduling latency while no client asks for it")
+    args = parser.parse_args(argv)
+
+    recorder = None
+    if not args.no_record:
+        recorder = Recorder()
+        if not recorder.open():
+            recorder = None
+
+    server = CollectorServer(args.socket, args.interval, recorder, args.linger, latency=args.latency)
+    if not server.bind():
+        print(f"A collector is already running on {args.socket}")
+        server.collector.close()
+        return 1
+
+    if args.metrics_port is not None:
+        try:
+            server.exporter = openmetrics.MetricsExporter(args.metrics_address, args.metrics_port)
+        except OSError as e:
+            print(f"Cannot serve metrics on {args.metrics_address}:{args.metrics_port}: {e}")
+            server.close()
+            return 1
+        server.exporter.start()
+
+    signal.signal(signal.SIGTERM, server.stop)
+    signal.signal(signal.SIGINT, server.stop)
+    server.serve_forever()
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
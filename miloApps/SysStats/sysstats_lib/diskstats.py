@@ -0,0 +1,69 @@
+"""
+Disk latency, queue depth and utilization
+Reads /proc/diskstats and derives the extended statistics iostat -x
+shows from the rates of its time fields: average wait per request,
+service time, average queue size and the share of time the device was
+busy.
+"""
+
+DISKSTATS_PATH = '/proc/diskstats'
+
+# /proc/diskstats counts in 512-byte sectors whatever the device's own
+# sector size
+SECTOR_SIZE = 512
+
+# Counters after major, minor and name, named as psutil names them;
+# times are in milliseconds. in_flight is a gauge, not a counter.
+FIELDS = ('read_count', 'read_merged_count', 'read_sectors', 'read_time',
+          'write_count', 'write_merged_count', 'write_sectors', 'write_time',
+          'in_flight', 'busy_time', 'weighted_time')
+
+# The kernel prints the time fields as 32-bit milliseconds, so they wrap;
+# weighted_time on a busy device within days
+COUNTER_WRAP = {name: 2 ** 32 for name in ('read_time', 'write_time', 'busy_time', 'weighted_time')}
+
+def read_diskstats(names=None, path=DISKSTATS_PATH):
+    """{device: counters} from /proc/diskstats, for the given devices or all
+
+    Sectors are also returned as read_bytes and write_bytes.
+    """
+    try:
+        with open(path) as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return {}
+
+    devices = {}
+    for line in lines:
+        fields = line.split()
+        if len(fields) < 3 + len(FIELDS) or (names is not None and fields[2] not in names):
+            continue
+        counters = dict(zip(FIELDS, map(int, fields[3:3 + len(FIELDS)])))
+        counters['read_bytes'] = counters['read_sectors'] * SECTOR_SIZE
+        counters['write_bytes'] = counters['write_sectors'] * SECTOR_SIZE
+        devices[fields[2]] = counters
+    return devices
+
+def extended_stats(rates, in_flight):
+    """iostat -x figures from the per-second rates of a device's counters
+
+    await, r_await, w_await and svctm are in milliseconds, util is a
+    percentage and queue the average number of requests waiting or being
+    served (aqu-sz). Devices that serve requests in parallel, such as
+    NVMe drives, can be at 100% util with capacity to spare; await and
+    queue still show how long requests waited.
+    """
+    def per_request(time_rate, count_rate):
+        return time_rate / count_rate if count_rate else 0.0
+
+    requests = rates['read_count'] + rates['write_count']
+    return {
+        'await': per_request(rates['read_time'] + rates['write_time'], requests),
+        'r_await': per_request(rates['read_time'], rates['read_count']),
+        'w_await': per_request(rates['write_time'], rates['write_count']),
+        'svctm': per_request(rates['busy_time'], requests),
+        # Milliseconds per second, so 1000 means busy all the time
+        'util': min(rates['busy_time'] / 10.0, 100.0),
+        'queue': rates['weighted_time'] / 1000.0,
+        'in_flight': in_flight,
+    }
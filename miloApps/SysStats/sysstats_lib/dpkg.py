@@ -0,0 +1,74 @@
+"""
+Installed package counter
+Streams the dpkg status database instead of running dpkg -l.
+"""
+
+import os
+
+DPKG_STATUS = '/var/lib/dpkg/status'
+
+# Results keyed by path, with the (mtime, size) they were computed for
+_counts_cache = {}
+
+def parse_status(path=DPKG_STATUS):
+    """Count installed packages, split by architecture and origin
+
+    Only the fields needed for counting are looked at, so the database is
+    read in a single pass without building per-package records.
+    """
+    counts = {'total': 0, 'architectures': {}, 'origins': {}}
+
+    # Packages without an Origin field are counted under ''
+    installed = False
+    arch = ''
+    origin = ''
+
+    def finish():
+        if installed:
+            counts['total'] += 1
+            counts['architectures'][arch] = counts['architectures'].get(arch, 0) + 1
+            counts['origins'][origin] = counts['origins'].get(origin, 0) + 1
+
+    with open(path, 'rb') as f:
+        for line in f:
+            first = line[:1]
+            if first == b'\n':
+                # Blank line ends a stanza
+                finish()
+                installed = False
+                arch = ''
+                origin = ''
+            elif first == b'S' and line.startswith(b'Status:'):
+                # Status: <want> <flag> <status>; counted when dpkg -l
+                # shows "ii", so held or removed packages are left out
+                fields = line.split()
+                installed = len(fields) == 4 and fields[1] == b'install' and fields[3] == b'installed'
+            elif first == b'A' and line.startswith(b'Architecture:'):
+                arch = line[13:].strip().decode('utf-8', 'replace')
+            elif first == b'O' and line.startswith(b'Origin:'):
+                origin = line[7:].strip().decode('utf-8', 'replace')
+
+    # The last stanza may not be followed by a blank line
+    finish()
+
+    return counts
+
+def count_installed(path=DPKG_STATUS):
+    """Installed package counts, memoized against the database mtime"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _counts_cache.get(path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+
+    try:
+        counts = parse_status(path)
+    except OSError:
+        return None
+
+    _counts_cache[path] = (stamp, counts)
+    return counts
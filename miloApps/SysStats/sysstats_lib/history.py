@@ -0,0 +1,182 @@
+"""
+Fixed-memory multi-resolution metric history
+Every sample is folded into a set of ring buffers of increasing slot
+width, each keeping the min, max and mean of the samples in a slot.
+"""
+
+import math
+import time
+from array import array
+
+# (seconds per slot, number of slots): 1 s for 10 minutes,
+# 10 s for 6 hours, 1 min for 7 days
+DEFAULT_TIERS = [(1, 600), (10, 2160), (60, 10080)]
+
+# Graph views offered by the GUI, in seconds
+VIEW_SPANS = {'1m': 60, '1h': 3600, '24h': 86400}
+
+class Tier:
+    """Ring buffer of aggregated slots at one resolution"""
+
+    def __init__(self, resolution, capacity):
+        self.resolution = resolution
+        self.capacity = capacity
+        # Absolute slot number stored at each position; -1 means empty
+        self.slots = array('q', [-1]) * capacity
+        self.mins = array('f', [0.0]) * capacity
+        self.maxs = array('f', [0.0]) * capacity
+        self.means = array('f', [0.0]) * capacity
+        self.counts = array('I', [0]) * capacity
+
+    @property
+    def span(self):
+        """Seconds of history this tier covers"""
+        return self.resolution * self.capacity
+
+    def add(self, timestamp, value, duration=0.0):
+        """Fold a sample into its slot
+
+        A sample that covers duration seconds, such as a rate measured
+        over a long sampling interval, also fills the slots before it.
+        """
+        last = int(timestamp // self.resolution)
+        first = min(int((timestamp - duration) // self.resolution) + 1, last)
+        for slot in range(max(first, last - self.capacity + 1), last + 1):
+            self.fold(slot, value)
+
+    def fold(self, slot, value):
+        """Add a value to a slot"""
+        pos = slot % self.capacity
+        if self.slots[pos] != slot:
+            # Slot reused for a newer period
+            self.slots[pos] = slot
+            self.mins[pos] = value
+            self.maxs[pos] = value
+            self.means[pos] = value
+            self.counts[pos] = 1
+            return
+
+        count = self.counts[pos] + 1
+        self.counts[pos] = count
+        if value < self.mins[pos]:
+            self.mins[pos] = value
+        if value > self.maxs[pos]:
+            self.maxs[pos] = value
+        self.means[pos] += (value - self.means[pos]) / count
+
+    def ordered(self, values, first, points):
+        """points entries of a backing array starting at slot first"""
+        start = first % self.capacity
+        if start + points <= self.capacity:
+            return values[start:start + points]
+        return values[start:] + values[:start + points - self.capacity]
+
+    def series(self, points, end):
+        """The last points slots up to end, as min, max and mean arrays
+
+        Slots without samples are NaN, and 'gaps' counts them. 'end' is
+        the number of the last slot, which advances by one per
+        resolution seconds.
+        """
+        last = int(end // self.resolution)
+        first = last - points + 1
+        slots = self.ordered(self.slots, first, points)
+        mins = self.ordered(self.mins, first, points)
+        maxs = self.ordered(self.maxs, first, points)
+        means = self.ordered(self.means, first, points)
+
+        # Usually every slot holds its own period, and the slices are used
+        # as they are; otherwise stale or empty slots become NaN
+        gaps = 0
+        expected = array('q', range(first, last + 1))
+        if slots != expected:
+            for i, (slot, wanted) in enumerate(zip(slots, expected)):
+                if slot != wanted:
+                    mins[i] = maxs[i] = means[i] = math.nan
+                    gaps += 1
+        return {'min': mins, 'max': maxs, 'mean': means, 'end': last, 'gaps': gaps, 'factor': 1}
+
+def decimate(series, factor):
+    """Merge every factor slots of a series into one point
+
+    Groups are aligned on absolute slot numbers, so a group keeps its
+    values as the window moves and only the newest one changes. Each
+    group keeps the lowest min, the highest max and the average mean.
+    """
+    mins, maxs, means = series['min'], series['max'], series['mean']
+    starts = range(0, len(means), factor)
+    if not series['gaps']:
+        out_mins = array('f', [min(mins[i:i + factor]) for i in starts])
+        out_maxs = array('f', [max(maxs[i:i + factor]) for i in starts])
+        out_means = array('f', [sum(means[i:i + factor]) / len(means[i:i + factor]) for i in starts])
+    else:
+        out_mins = array('f')
+        out_maxs = array('f')
+        out_means = array('f')
+        for i in starts:
+            valid = [j for j in range(i, min(i + factor, len(means))) if means[j] == means[j]]
+            if valid:
+                out_mins.append(min(mins[j] for j in valid))
+                out_maxs.append(max(maxs[j] for j in valid))
+                out_means.append(sum(means[j] for j in valid) / len(valid))
+            else:
+                out_mins.append(math.nan)
+                out_maxs.append(math.nan)
+                out_means.append(math.nan)
+    return {
+        'min': out_mins,
+        'max': out_maxs,
+        'mean': out_means,
+        'end': series['end'] // factor,
+        'gaps': series['gaps'],
+        'factor': factor,
+    }
+
+class MetricHistory:
+    """History of one metric at several resolutions in constant memory"""
+
+    def __init__(self, tiers=DEFAULT_TIERS):
+        self.tiers = [Tier(resolution, capacity) for resolution, capacity in tiers]
+        self.last_time = None
+        self.last_value = None
+
+    def add(self, timestamp, value, duration=0.0):
+        """Record a sample taken at a wall-clock timestamp
+
+        duration is the time the value was measured over, for rates
+        sampled less often than once per slot.
+        """
+        for tier in self.tiers:
+            tier.add(timestamp, value, duration)
+        self.last_time = timestamp
+        self.last_value = value
+
+    def tier_for(self, span):
+        """Finest tier that covers span seconds"""
+        for tier in self.tiers:
+            if tier.span >= span:
+                return tier
+        return self.tiers[-1]
+
+    def series(self, span, end=None, columns=None):
+        """min/max/mean arrays covering the last span seconds
+
+        The finest tier that covers the span is used, so a 1 minute view
+        has one point per second and a 24 hour view one per minute. With
+        columns, slots are merged so there are at most that many points,
+        such as one min/max pair per pixel of a graph.
+        """
+        if end is None:
+            end = self.last_time if self.last_time is not None else time.time()
+        tier = self.tier_for(span)
+        points = min(max(int(span // tier.resolution), 1), tier.capacity)
+        if not columns or points <= columns:
+            return tier.series(points, end)
+
+        # Whole groups only, so the first point does not change as the
+        # window moves; the last group may still be filling
+        factor = -(-points // columns)
+        groups = points // factor
+        last = int(end // tier.resolution)
+        first = (last // factor - groups + 1) * factor
+        return decimate(tier.series(last - first + 1, end), factor)
@@ -0,0 +1,172 @@
+"""
+Interrupt and softirq rates
+Diffs /proc/interrupts and /proc/softirqs between ticks into per-CPU
+rates and reports the busiest sources with their smp_affinity from
+/proc/irq.
+"""
+
+import os
+import time
+
+from sysstats_lib.rates import counter_delta
+
+INTERRUPTS_PATH = '/proc/interrupts'
+SOFTIRQS_PATH = '/proc/softirqs'
+IRQ_DIR = '/proc/irq'
+
+# Sources reported per snapshot, busiest first
+TOP_SOURCES = 12
+
+# Per-CPU counts are printed as 32-bit values and wrap on busy sources
+COUNTER_WRAP = 2 ** 32
+
+def read_table(path):
+    """(cpu numbers, {source: raw line}) from /proc/interrupts or /proc/softirqs
+
+    Lines are kept unparsed: most sources do not fire between two ticks,
+    and a line equal to the previous one can be skipped without parsing
+    its counters.
+    """
+    with open(path, 'rb') as f:
+        lines = f.read().split(b'\n')
+    cpus = [int(name[3:]) for name in lines[0].split()]
+    rows = {}
+    for line in lines[1:]:
+        source, sep, rest = line.partition(b':')
+        if sep:
+            rows[source.strip().decode()] = rest
+    return cpus, rows
+
+def parse_row(rest, width):
+    """(per-CPU counters, description) of a row
+
+    Rows such as ERR and MIS have a single counter for all CPUs; it is
+    returned as the first CPU's.
+    """
+    fields = rest.split(None, width)
+    counts = []
+    for field in fields[:width]:
+        if not field.isdigit():
+            break
+        counts.append(int(field))
+    description = b' '.join(b' '.join(fields[len(counts):]).split()).decode(errors='replace')
+    counts += [0] * (width - len(counts))
+    return counts, description
+
+def read_affinity(irq, name, irq_dir=IRQ_DIR):
+    """CPU list from /proc/irq/<irq>/<name>, such as '0-3,8', or None"""
+    try:
+        with open(os.path.join(irq_dir, irq, name)) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+class RateTable:
+    """Per-CPU rates of the rows of one /proc table between readings"""
+
+    def __init__(self, path):
+        self.path = path
+        self.cpus = None
+        self.raw = {}
+        self.counts = {}
+        self.descriptions = {}
+        self.last_time = None
+
+    def update(self, now):
+        """[(source, description, total rate, per-CPU rates)] of the rows that changed
+
+        Returns None for the first reading and after CPUs came or went.
+        """
+        cpus, rows = read_table(self.path)
+        width = len(cpus)
+        elapsed = now - self.last_time if self.last_time is not None else None
+        reset = cpus != self.cpus
+        self.cpus = cpus
+        self.last_time = now
+
+        changed = []
+        for source, rest in rows.items():
+            if not reset and self.raw.get(source) == rest:
+                continue
+            self.raw[source] = rest
+            counts, description = parse_row(rest, width)
+            previous = None if reset else self.counts.get(source)
+            self.counts[source] = counts
+            self.descriptions[source] = description
+            if previous is not None and elapsed:
+                rates = [
+                    counter_delta(now_count, before, COUNTER_WRAP) / elapsed
+                    for now_count, before in zip(counts, previous)
+                ]
+                total = sum(rates)
+                if total:
+                    changed.append((source, description, total, rates))
+
+        # Sources that disappeared, e.g. a device unbound from its driver
+        for source in list(self.raw):
+            if source not in rows:
+                del self.raw[source]
+                del self.counts[source]
+                del self.descriptions[source]
+
+        if reset or elapsed is None:
+            return None
+        return changed
+
+class InterruptMonitor:
+    """Busiest hardware interrupts and softirqs since the previous call"""
+
+    def __init__(self, interrupts_path=INTERRUPTS_PATH, softirqs_path=SOFTIRQS_PATH, irq_dir=IRQ_DIR):
+        self.irq_dir = irq_dir
+        self.interrupts = RateTable(interrupts_path)
+        self.softirqs = RateTable(softirqs_path)
+
+    def sample(self, now=None, count=TOP_SOURCES):
+        """Top sources with per-CPU rates, or None until there are two readings
+
+        {'cpus': [cpu numbers], 'irqs': [...], 'softirq_cpus': [...],
+         'softirqs': [...], 'per_cpu': [total interrupt rate of each CPU]}
+
+        /proc/softirqs lists every possible CPU and /proc/interrupts
+        only the online ones, so each has its own CPU numbers.
+        """
+        if now is None:
+            now = time.monotonic()
+        try:
+            irqs = self.interrupts.update(now)
+            softirqs = self.softirqs.update(now)
+        except OSError:
+            return None
+        if irqs is None or softirqs is None:
+            return None
+
+        per_cpu = [0.0] * len(self.interrupts.cpus)
+        for source, description, total, rates in irqs:
+            for index, rate in enumerate(rates):
+                per_cpu[index] += rate
+
+        top_irqs = []
+        for source, description, total, rates in sorted(irqs, key=lambda row: row[2], reverse=True)[:count]:
+            # Named rows such as LOC or RES have no /proc/irq entry
+            numbered = source.isdigit()
+            top_irqs.append({
+                'irq': source,
+                'description': description,
+                'rate': total,
+                'per_cpu': rates,
+                'affinity': read_affinity(source, 'smp_affinity_list', self.irq_dir) if numbered else None,
+                'effective': read_affinity(source, 'effective_affinity_list', self.irq_dir) if numbered else None,
+            })
+
+        top_softirqs = [
+            {'name': source, 'rate': total, 'per_cpu': rates}
+            for source, description, total, rates in sorted(softirqs, key=lambda row: row[2], reverse=True)[:count]
+        ]
+
+        return {
+            'cpus': self.interrupts.cpus,
+            'irqs': top_irqs,
+            'softirq_cpus': self.softirqs.cpus,
+            'softirqs': top_softirqs,
+            'per_cpu': per_cpu,
+        }
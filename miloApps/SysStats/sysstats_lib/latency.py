@@ -0,0 +1,233 @@
+"""
+Scheduling latency monitor
+Measures wakeup latency the way cyclictest does: a task sleeps until
+fixed deadlines and records how late it woke each time, in a histogram
+with power-of-two microsecond buckets.
+
+The measuring loop runs in a child process so the collector's own work
+and the GIL do not show up as latency. It shares its counters with the
+parent through a memory-mapped temporary file.
+
+Run with: python3 -m sysstats_lib.latency --fd FD --parent PID [--period MICROSECONDS]
+"""
+
+import argparse
+import mmap
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+# Directory that holds the sysstats_lib package, for starting the child
+LIB_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Wakeup period; cyclictest's default is 1000 us, doubled to halve the cost
+DEFAULT_PERIOD = 2000
+
+# SCHED_FIFO priority: low, so audio threads are never preempted by us
+DEFAULT_PRIORITY = 1
+
+# Bucket 0 holds wakeups under 1 us, bucket n those from 2^(n-1) to
+# 2^n us, and the last one everything from about 0.26 s
+BUCKETS = 20
+
+# Worst wakeups are also kept per second of the monotonic clock for this
+# many seconds, so the parent reads recent maxima without resetting
+# anything the child writes
+RECENT_SECONDS = 64
+
+# Shared counters: policy (1 = SCHED_FIFO), wakeups, maximum, the
+# buckets, then the seconds and maxima of the recent slots; all in
+# nanoseconds. Only the child writes them.
+POLICY, COUNT, MAX, FIRST_BUCKET = range(4)
+RECENT_SECOND = FIRST_BUCKET + BUCKETS
+RECENT_MAX = RECENT_SECOND + RECENT_SECONDS
+SLOTS = RECENT_MAX + RECENT_SECONDS
+
+def bucket_of(overshoot_ns):
+    """Histogram bucket for a wakeup latency"""
+    return min((overshoot_ns // 1000).bit_length(), BUCKETS - 1)
+
+def bucket_limit(bucket):
+    """Upper bound of a bucket in microseconds"""
+    return 1 << bucket
+
+def percentile(histogram, fraction):
+    """Upper bound in microseconds of the bucket holding a percentile"""
+    total = sum(histogram)
+    if not total:
+        return None
+    wanted = total * fraction
+    seen = 0
+    for bucket, count in enumerate(histogram):
+        seen += count
+        if seen >= wanted:
+            return bucket_limit(bucket)
+    return bucket_limit(len(histogram) - 1)
+
+def note_recent(counters, now, overshoot):
+    """Raise the maximum of the second now falls in"""
+    second = now // 1_000_000_000
+    slot = second % RECENT_SECONDS
+    if counters[RECENT_SECOND + slot] != second:
+        # The slot held a second that has rolled out; the value goes
+        # first so a reader never pairs the new second with the old value
+        counters[RECENT_MAX + slot] = overshoot
+        counters[RECENT_SECOND + slot] = second
+    elif overshoot > counters[RECENT_MAX + slot]:
+        counters[RECENT_MAX + slot] = overshoot
+
+def recent_max(counters, since, until):
+    """Worst wakeup in the seconds from since to until, both included"""
+    worst = 0
+    for slot in range(RECENT_SECONDS):
+        if since <= counters[RECENT_SECOND + slot] <= until:
+            worst = max(worst, counters[RECENT_MAX + slot])
+    return worst
+
+def set_realtime(priority):
+    """Switch the calling process to SCHED_FIFO; False when not permitted"""
+    try:
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(priority))
+        return True
+    except (OSError, AttributeError):
+        return False
+
+def measure(counters, period_ns, parent):
+    """Sleep to fixed deadlines and record the overshoot until the parent exits"""
+    clock = time.monotonic_ns
+    deadline = clock() + period_ns
+    checked = deadline
+    while True:
+        delay = deadline - clock()
+        if delay > 0:
+            time.sleep(delay / 1e9)
+        now = clock()
+        overshoot = now - deadline
+        if overshoot >= 0:
+            counters[COUNT] += 1
+            if overshoot > counters[MAX]:
+                counters[MAX] = overshoot
+            note_recent(counters, now, overshoot)
+            counters[FIRST_BUCKET + bucket_of(overshoot)] += 1
+        deadline += period_ns
+        if deadline <= now:
+            # Missed whole periods, e.g. after a suspend; do not catch up
+            deadline = now + period_ns
+        if now - checked >= 1_000_000_000:
+            checked = now
+            if os.getppid() != parent:
+                return
+
+class LatencyMonitor:
+    """Starts the measuring process and reads its histogram"""
+
+    def __init__(self, period=DEFAULT_PERIOD, priority=DEFAULT_PRIORITY):
+        self.period = period
+        self.priority = priority
+        self.process = None
+        self.file = None
+        self.map = None
+        self.counters = None
+        self.started = None
+        self.recent_since = None
+
+    @property
+    def running(self):
+        return self.process is not None
+
+    def start(self):
+        """Start measuring; returns False if the child could not be started"""
+        if self.process is not None:
+            return True
+        self.file = tempfile.TemporaryFile()
+        self.file.truncate(SLOTS * 8)
+        self.map = mmap.mmap(self.file.fileno(), SLOTS * 8)
+        self.counters = memoryview(self.map).cast('Q')
+
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [LIB_DIR, env.get('PYTHONPATH')]))
+        fd = self.file.fileno()
+        try:
+            self.process = subprocess.Popen(
+                [sys.executable, '-m', 'sysstats_lib.latency', '--fd', str(fd), '--parent', str(os.getpid()),
+                 '--period', str(self.period), '--priority', str(self.priority)],
+                env=env, cwd='/', pass_fds=(fd,),
+                stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            )
+        except OSError:
+            self.stop()
+            return False
+        self.started = time.time()
+        self.recent_since = time.monotonic_ns() // 1_000_000_000
+        return True
+
+    def sample(self):
+        """Histogram and figures since the start, in microseconds
+
+        recent_max is the worst wakeup since the previous call, counted
+        in whole seconds: the second of the previous call is read again,
+        so a wakeup late in it can be reported twice but is never missed.
+        Calls more than RECENT_SECONDS apart only see the last ones.
+        """
+        if self.process is None:
+            return None
+        counters = self.counters
+        now = time.monotonic_ns() // 1_000_000_000
+        worst = recent_max(counters, self.recent_since, now)
+        self.recent_since = now
+        histogram = counters[FIRST_BUCKET:RECENT_SECOND].tolist()
+        return {
+            'policy': 'fifo' if counters[POLICY] else 'other',
+            'period': self.period,
+            'since': self.started,
+            'count': counters[COUNT],
+            'max': counters[MAX] / 1000.0,
+            'recent_max': worst / 1000.0,
+            'p99': percentile(histogram, 0.99),
+            'histogram': histogram,
+        }
+
+    def stop(self):
+        """Stop measuring and forget the histogram"""
+        if self.process is not None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=1)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+            self.process = None
+        if self.counters is not None:
+            self.counters.release()
+            self.counters = None
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        self.started = None
+        self.recent_since = None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SysStats scheduling latency probe")
+    parser.add_argument('--fd', type=int, required=True, help="file descriptor of the shared counters")
+    parser.add_argument('--parent', type=int, help="process to stop with (default the parent at startup)")
+    parser.add_argument('--period', type=int, default=DEFAULT_PERIOD, help="wakeup period in microseconds")
+    parser.add_argument('--priority', type=int, default=DEFAULT_PRIORITY, help="SCHED_FIFO priority")
+    args = parser.parse_args(argv)
+
+    shared = mmap.mmap(args.fd, SLOTS * 8)
+    counters = memoryview(shared).cast('Q')
+    counters[POLICY] = 1 if set_realtime(args.priority) else 0
+    try:
+        # Our parent at startup may already be gone, leaving init as parent
+        measure(counters, args.period * 1000, args.parent or os.getppid())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
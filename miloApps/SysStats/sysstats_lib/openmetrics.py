@@ -0,0 +1,209 @@
+"""
+OpenMetrics exporter
+Serves the latest collector snapshot over HTTP in the OpenMetrics text
+format, for Prometheus and compatible scrapers.
+"""
+
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from sysstats_lib.cpustat import BREAKDOWN_FIELDS
+
+CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+
+DEFAULT_ADDRESS = '127.0.0.1'
+DEFAULT_PORT = 9596
+
+def escape(value):
+    """Escape a label value"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def format_value(value):
+    """A sample value as OpenMetrics writes it"""
+    value = float(value)
+    if math.isnan(value):
+        return 'NaN'
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(value)
+
+class MetricFamily:
+    """Samples of one metric, written with their TYPE, UNIT and HELP lines"""
+
+    def __init__(self, name, kind, help_text, unit=None):
+        self.name = name
+        self.kind = kind
+        self.help_text = help_text
+        self.unit = unit
+        self.samples = []
+
+    def add(self, value, suffix='', **labels):
+        self.samples.append((suffix, labels, value))
+
+    def lines(self):
+        yield f'# TYPE {self.name} {self.kind}'
+        if self.unit:
+            yield f'# UNIT {self.name} {self.unit}'
+        yield f'# HELP {self.name} {self.help_text}'
+        for suffix, labels, value in self.samples:
+            if labels:
+                label_text = ','.join(f'{key}="{escape(val)}"' for key, val in labels.items())
+                yield f'{self.name}{suffix}{{{label_text}}} {format_value(value)}'
+            else:
+                yield f'{self.name}{suffix} {format_value(value)}'
+
+def render(snapshot):
+    """OpenMetrics text for a collector snapshot"""
+    families = []
+
+    def family(*args, **kwargs):
+        metric = MetricFamily(*args, **kwargs)
+        families.append(metric)
+        return metric
+
+    timestamp = family('sysstats_sample_timestamp_seconds', 'gauge', "Time the sample was taken.", 'seconds')
+    timestamp.add(snapshot['time'])
+
+    cpu_total = family('sysstats_cpu_usage_total_percent', 'gauge', "CPU usage of all CPUs together over the last sampling interval.", 'percent')
+    cpu_total.add(snapshot['cpu_percent'])
+
+    cpu = family('sysstats_cpu_usage_percent', 'gauge', "CPU usage per CPU over the last sampling interval.", 'percent')
+    for index, usage in enumerate(snapshot.get('per_cpu') or []):
+        cpu.add(usage, cpu=index)
+
+    cpu_time = family('sysstats_cpu_time_percent', 'gauge', "Share of CPU time by mode over the last sampling interval.", 'percent')
+    for index, times in enumerate(snapshot.get('per_cpu_times') or []):
+        for mode in BREAKDOWN_FIELDS:
+            cpu_time.add(times[mode], cpu=index, mode=mode)
+
+    thermal = snapshot.get('thermal')
+    if thermal:
+        frequency = family('sysstats_cpu_frequency_hertz', 'gauge', "Current frequency per CPU.", 'hertz')
+        for cpu, value in zip(thermal['cpus'], thermal['freq']):
+            frequency.add(value * 1e6, cpu=cpu)
+        temperature = family('sysstats_temperature_celsius', 'gauge', "Temperature per thermal zone and hwmon sensor.", 'celsius')
+        for label, value, critical in thermal['temps']:
+            temperature.add(value, sensor=label)
+        if thermal['throttle']:
+            throttled = family('sysstats_cpu_throttled_percent', 'gauge', "Share of time the most throttled CPU spent throttled.", 'percent')
+            throttled.add(thermal['throttle']['percent'])
+            events = family('sysstats_cpu_throttle_events_per_second', 'gauge', "Thermal throttle events per second.")
+            events.add(thermal['throttle']['core_events'], scope='core')
+            events.add(thermal['throttle']['package_events'], scope='package')
+
+    memory = family('sysstats_memory_bytes', 'gauge', "Memory usage by kind.", 'bytes')
+    for kind in ('total', 'available', 'used', 'free', 'buffers', 'cached'):
+        if kind in snapshot['memory']:
+            memory.add(snapshot['memory'][kind], kind=kind)
+
+    disk_bytes = family('sysstats_disk_bytes_per_second', 'gauge', "Disk throughput per physical device.")
+    disk_ops = family('sysstats_disk_operations_per_second', 'gauge', "Disk operations per physical device.")
+    disk_await = family('sysstats_disk_await_seconds', 'gauge', "Average time requests took, queueing included, over the last sampling interval.", 'seconds')
+    disk_queue = family('sysstats_disk_queue_depth', 'gauge', "Average number of requests queued or in service.")
+    disk_util = family('sysstats_disk_utilization_percent', 'gauge', "Share of time the device had requests in service.", 'percent')
+    for device, rates in sorted(snapshot['disk_devices'].items()):
+        disk_bytes.add(rates['read_bytes'], device=device, direction='read')
+        disk_bytes.add(rates['write_bytes'], device=device, direction='write')
+        disk_ops.add(rates['read_count'], device=device, direction='read')
+        disk_ops.add(rates['write_count'], device=device, direction='write')
+        disk_await.add(rates['r_await'] / 1000.0, device=device, direction='read')
+        disk_await.add(rates['w_await'] / 1000.0, device=device, direction='write')
+        disk_queue.add(rates['queue'], device=device)
+        disk_util.add(rates['util'], device=device)
+
+    net_bytes = family('sysstats_network_bytes_per_second', 'gauge', "Network throughput per interface.")
+    net_packets = family('sysstats_network_packets_per_second', 'gauge', "Network packets per interface.")
+    net_errors = family('sysstats_network_errors', 'counter', "Network errors per interface since boot.")
+    net_drops = family('sysstats_network_drops', 'counter', "Dropped network packets per interface since boot.")
+    for interface, rates in sorted(snapshot['net_interfaces'].items()):
+        net_bytes.add(rates['bytes_recv'], interface=interface, direction='receive')
+        net_bytes.add(rates['bytes_sent'], interface=interface, direction='transmit')
+        net_packets.add(rates['packets_recv'], interface=interface, direction='receive')
+        net_packets.add(rates['packets_sent'], interface=interface, direction='transmit')
+        net_errors.add(rates['errors'], '_total', interface=interface)
+        net_drops.add(rates['drops'], '_total', interface=interface)
+
+    pressure_stall = family('sysstats_pressure_stall_percent', 'gauge', "Share of time tasks were stalled over the last sampling interval.", 'percent')
+    pressure_avg10 = family('sysstats_pressure_avg10_percent', 'gauge', "Kernel 10 second average of the share of time tasks were stalled.", 'percent')
+    for resource, kinds in sorted((snapshot.get('pressure') or {}).items()):
+        for kind, values in sorted(kinds.items()):
+            if values['stall'] is not None:
+                pressure_stall.add(values['stall'], resource=resource, kind=kind)
+            pressure_avg10.add(values['avg10'], resource=resource, kind=kind)
+
+    latency = snapshot.get('latency')
+    if latency:
+        wakeup_max = family('sysstats_wakeup_latency_max_microseconds', 'gauge', "Worst scheduling wakeup latency since the probe started.", 'microseconds')
+        wakeup_max.add(latency['max'], policy=latency['policy'])
+        wakeup_p99 = family('sysstats_wakeup_latency_p99_microseconds', 'gauge', "Upper bound of the 99th percentile wakeup latency bucket.", 'microseconds')
+        if latency['p99'] is not None:
+            wakeup_p99.add(latency['p99'], policy=latency['policy'])
+
+    process_cpu = family('sysstats_top_process_cpu_percent', 'gauge', "CPU usage of the busiest processes.", 'percent')
+    process_memory = family('sysstats_top_process_memory_percent', 'gauge', "Memory usage of the busiest processes.", 'percent')
+    for rank, (pid, name, cpu_usage, memory_usage) in enumerate(snapshot.get('top_processes') or []):
+        process_cpu.add(cpu_usage, rank=rank, pid=pid, name=name)
+        process_memory.add(memory_usage, rank=rank, pid=pid, name=name)
+
+    lines = []
+    for metric in families:
+        lines.extend(metric.lines())
+    lines.append('# EOF')
+    return '\n'.join(lines) + '\n'
+
+class MetricsExporter:
+    """HTTP endpoint for the latest snapshot
+
+    The sampler only swaps in a reference to each new snapshot; the text
+    is rendered by the first scrape after a tick and then served from
+    cache, so scrapes never slow down sampling and repeated scrapes cost
+    a single write.
+    """
+
+    def __init__(self, address=DEFAULT_ADDRESS, port=DEFAULT_PORT):
+        self.snapshot = None
+        self._cached_for = None
+        self._cached = b'# EOF\n'
+        self._lock = threading.Lock()
+
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = exporter.render()
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((address, port), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, name='sysstats-metrics', daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def update(self, snapshot):
+        """Publish a new snapshot; called from the sampler"""
+        self.snapshot = snapshot
+
+    def render(self):
+        """Encoded metrics for the latest snapshot, rendered once per tick"""
+        with self._lock:
+            snapshot = self.snapshot
+            if snapshot is not None and snapshot is not self._cached_for:
+                self._cached = render(snapshot).encode('utf-8')
+                self._cached_for = snapshot
+            return self._cached
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
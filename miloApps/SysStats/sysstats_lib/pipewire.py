@@ -0,0 +1,282 @@
+"""
+PipeWire audio engine statistics
+Follows the profiler data that pw-top shows: per-driver and per-node
+wait and busy times, quantum, rate and error (xrun) counts. pw-top runs
+in batch mode in a background thread and the newest complete refresh is
+kept for the collector. Recorded pw-top -b and pw-dump output can stand
+in for a running PipeWire.
+"""
+
+import json
+import os
+import re
+import shutil
+import subprocess
+import threading
+
+# Recorded output used instead of the live tools when set
+RECORDED_TOP = os.environ.get('SYSSTATS_PW_TOP')
+RECORDED_DUMP = os.environ.get('SYSSTATS_PW_DUMP')
+
+# Seconds between pw-dump runs for node descriptions and clock settings
+DUMP_INTERVAL = 30.0
+
+# Seconds before pw-top is started again after it exited
+RESTART_INTERVAL = 30.0
+
+TIME_UNITS = {'ns': 1e-9, 'us': 1e-6, 'ms': 1e-3, 's': 1.0}
+
+# The nine numeric columns before FORMAT, from S to ERR
+LEADING_FIELDS = re.compile(r'\s*(?:\S+\s+){8}\S+')
+
+def parse_time(text):
+    """Seconds from a pw-top time such as '26.2us'; None for '---'"""
+    for unit in ('ns', 'us', 'ms', 's'):
+        if text.endswith(unit):
+            try:
+                return float(text[:-len(unit)]) * TIME_UNITS[unit]
+            except ValueError:
+                return None
+    return None
+
+def parse_ratio(text):
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+def name_offset(header):
+    """Distance from the end of the ERR column to NAME in a pw-top header"""
+    return header.index('NAME') - (header.index('ERR') + len('ERR'))
+
+def parse_top_line(line, offset):
+    """Node dict from a pw-top row
+
+    FORMAT is a fixed-width column that may be blank or contain spaces,
+    so NAME is found at the header's offset from the end of ERR; long
+    times can push a row's columns right of the header's.
+    """
+    match = LEADING_FIELDS.match(line)
+    if not match:
+        return None
+    state, node_id, quantum, rate, wait, busy, wait_q, busy_q, errors = match.group().split()
+    rest = line[match.end():]
+    name = rest[offset:].strip()
+    follower = name.startswith('+ ')
+    try:
+        return {
+            'state': state,
+            'id': int(node_id),
+            'quantum': int(quantum),
+            'rate': int(rate),
+            'wait': parse_time(wait),
+            'busy': parse_time(busy),
+            'wait_q': parse_ratio(wait_q),
+            'busy_q': parse_ratio(busy_q),
+            'errors': int(errors),
+            'format': rest[:offset].strip(),
+            'name': name[2:].strip() if follower else name,
+            'follower': follower,
+        }
+    except ValueError:
+        return None
+
+def parse_top(text):
+    """Refreshes in pw-top -b output, each a list of node dicts in display order"""
+    blocks = []
+    offset = None
+    for line in text.splitlines():
+        if line.startswith('S ') and 'NAME' in line:
+            offset = name_offset(line)
+            blocks.append([])
+        elif offset is not None and line.strip():
+            node = parse_top_line(line, offset)
+            if node:
+                blocks[-1].append(node)
+    return blocks
+
+def parse_dump(text):
+    """Clock settings and node descriptions from pw-dump JSON
+
+    Returns {'settings': {...}, 'descriptions': {id: description}}.
+    """
+    try:
+        objects = json.loads(text)
+    except ValueError:
+        return None
+
+    settings = {}
+    descriptions = {}
+    for obj in objects if isinstance(objects, list) else []:
+        kind = obj.get('type', '')
+        if kind.endswith(':Metadata') and (obj.get('props') or {}).get('metadata.name') == 'settings':
+            for entry in obj.get('metadata') or []:
+                if entry.get('key', '').startswith('clock.'):
+                    settings[entry['key']] = entry.get('value')
+        elif kind.endswith(':Node'):
+            props = (obj.get('info') or {}).get('props') or {}
+            description = props.get('node.description') or props.get('node.nick')
+            if description:
+                descriptions[obj.get('id')] = description
+    return {'settings': settings, 'descriptions': descriptions}
+
+def group_drivers(nodes):
+    """Drivers with their followers, as listed by pw-top"""
+    drivers = []
+    for node in nodes:
+        if node['follower'] and drivers:
+            drivers[-1]['followers'].append(node)
+        else:
+            drivers.append(dict(node, followers=[]))
+    return drivers
+
+def over_budget(node):
+    """True when a node did not finish within its cycle"""
+    return (node['wait_q'] or 0.0) + (node['busy_q'] or 0.0) >= 1.0
+
+class AudioMonitor:
+    """Latest PipeWire profiler data, collected in a background thread
+
+    pw-top is started the first time data is asked for and runs until
+    close(). With recorded output, one refresh is replayed per call.
+    Until pw-top has printed a full refresh the sample is unavailable
+    with no error.
+    """
+
+    def __init__(self, top_file=RECORDED_TOP, dump_file=RECORDED_DUMP):
+        self.top_file = top_file
+        self.dump_file = dump_file
+        self.process = None
+        self.thread = None
+        self.started = None
+        self.latest = None
+        self.replay = None
+        self.replay_index = 0
+        self.dump = None
+        self.dump_time = None
+        self.errors = {}
+        self.error = None
+        self._lock = threading.Lock()
+
+    def start(self, now):
+        """Start following pw-top, or load the recorded output"""
+        self.started = now
+        self.error = None
+        if self.top_file:
+            try:
+                with open(self.top_file) as f:
+                    self.replay = parse_top(f.read())
+            except OSError as e:
+                self.error = str(e)
+            return
+
+        command = shutil.which('pw-top')
+        if command is None:
+            self.error = 'pw-top not found'
+            return
+        # pw-top only flushes when its output is a terminal
+        stdbuf = shutil.which('stdbuf')
+        argv = ([stdbuf, '-oL'] if stdbuf else []) + [command, '-b']
+        try:
+            self.process = subprocess.Popen(
+                argv, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                text=True, bufsize=1,
+            )
+        except OSError as e:
+            self.error = str(e)
+            return
+        self.thread = threading.Thread(target=self.follow, args=(self.process,), name='sysstats-pipewire', daemon=True)
+        self.thread.start()
+
+    def follow(self, process):
+        """Parse pw-top output, publishing each refresh once the next begins"""
+        offset = None
+        block = []
+        for line in process.stdout:
+            if process is not self.process:
+                # Stopped by close()
+                return
+            line = line.rstrip('\n')
+            if line.startswith('S ') and 'NAME' in line:
+                if offset is not None:
+                    with self._lock:
+                        self.latest = block
+                offset = name_offset(line)
+                block = []
+            elif offset is not None and line.strip():
+                node = parse_top_line(line, offset)
+                if node:
+                    block.append(node)
+        process.wait()
+        if process is self.process:
+            with self._lock:
+                self.latest = None
+            self.error = 'PipeWire is not running'
+
+    def read_dump(self, now):
+        """Clock settings and descriptions, refreshed every DUMP_INTERVAL"""
+        if self.dump_time is not None and (self.dump_file or now - self.dump_time < DUMP_INTERVAL):
+            return self.dump
+        self.dump_time = now
+        try:
+            if self.dump_file:
+                with open(self.dump_file) as f:
+                    text = f.read()
+            else:
+                text = subprocess.run(['pw-dump', '--no-colors'], capture_output=True, text=True, timeout=2).stdout
+            self.dump = parse_dump(text) or self.dump
+        except (OSError, subprocess.SubprocessError):
+            pass
+        return self.dump
+
+    def sample(self, now):
+        """Snapshot of the audio graph, or {'available': False, 'error': ...}"""
+        if self.started is None or (
+                self.thread is not None and not self.thread.is_alive() and now - self.started >= RESTART_INTERVAL):
+            self.start(now)
+
+        if self.replay:
+            nodes = self.replay[self.replay_index % len(self.replay)]
+            self.replay_index += 1
+        else:
+            with self._lock:
+                nodes = self.latest
+        if nodes is None:
+            return {'available': False, 'error': self.error}
+
+        dump = self.read_dump(now) or {'settings': {}, 'descriptions': {}}
+        drivers = group_drivers([dict(node) for node in nodes])
+        for node in [node for driver in drivers for node in [driver] + driver['followers']]:
+            node['description'] = dump['descriptions'].get(node['id'])
+            node['over_budget'] = over_budget(node)
+            # ERR counts since the node was created; report the new ones
+            previous = self.errors.get(node['id'])
+            node['xruns'] = max(node['errors'] - previous, 0) if previous is not None else 0
+        self.errors = {node['id']: node['errors'] for node in nodes}
+
+        running = [driver for driver in drivers if driver['state'] == 'R' and driver['busy_q'] is not None]
+        return {
+            'available': True,
+            'drivers': drivers,
+            'settings': dump['settings'],
+            # Share of the cycle the busiest driver's graph took to process
+            'dsp_load': max((driver['busy_q'] * 100.0 for driver in running), default=0.0),
+            'xruns': sum(node['xruns'] for driver in drivers for node in [driver] + driver['followers']),
+            'errors': sum(node['errors'] for node in nodes),
+        }
+
+    def close(self):
+        """Stop pw-top; the next sample starts it again"""
+        if self.process is not None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=1)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+            self.process = None
+        if self.thread is not None:
+            self.thread.join(timeout=1)
+            self.thread = None
+        self.started = None
+        self.latest = None
+        self.errors = {}
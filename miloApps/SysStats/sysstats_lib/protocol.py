@@ -0,0 +1,79 @@
+"""
+Collector socket protocol
+Messages are dicts sent as frames: a 5-byte header holding the payload
+format and length, then the payload. Payloads are msgpack when it is
+installed and compact JSON otherwise; receivers decode either.
+"""
+
+import json
+import os
+import socket
+import struct
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Per-user socket; XDG_RUNTIME_DIR is private to the user and cleared at logout
+SOCKET_DIR = os.path.join(os.environ['XDG_RUNTIME_DIR'], 'sysstats') if os.environ.get('XDG_RUNTIME_DIR') \
+    else f'/tmp/sysstats-{os.getuid()}'
+SOCKET_PATH = os.path.join(SOCKET_DIR, 'collector.sock')
+
+# format, payload length
+FRAME_HEADER = struct.Struct('>cI')
+FORMAT_JSON = b'J'
+FORMAT_MSGPACK = b'M'
+
+# A process table of a few thousand rows is well under this
+MAX_FRAME = 64 * 1024 * 1024
+
+def encode(message):
+    """Serialize a message into a frame"""
+    if msgpack is not None:
+        payload = msgpack.packb(message, use_bin_type=True)
+        kind = FORMAT_MSGPACK
+    else:
+        payload = json.dumps(message, separators=(',', ':')).encode('utf-8')
+        kind = FORMAT_JSON
+    return FRAME_HEADER.pack(kind, len(payload)) + payload
+
+def decode(kind, payload):
+    """Deserialize a frame payload"""
+    if kind == FORMAT_JSON:
+        return json.loads(payload)
+    if kind == FORMAT_MSGPACK and msgpack is not None:
+        return msgpack.unpackb(payload, raw=False)
+    raise ValueError(f"Unsupported frame format {kind!r}")
+
+class FrameDecoder:
+    """Splits a byte stream into messages, keeping partial frames"""
+
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def feed(self, data):
+        """Add received bytes and return the messages now complete"""
+        self.buffer += data
+        messages = []
+        while len(self.buffer) >= FRAME_HEADER.size:
+            kind, length = FRAME_HEADER.unpack_from(self.buffer)
+            if length > MAX_FRAME:
+                raise ValueError(f"Frame of {length} bytes is too large")
+            end = FRAME_HEADER.size + length
+            if len(self.buffer) < end:
+                break
+            messages.append(decode(kind, bytes(self.buffer[FRAME_HEADER.size:end])))
+            del self.buffer[:end]
+        return messages
+
+def is_alive(path=SOCKET_PATH):
+    """Whether a collector is accepting connections on path"""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
@@ -0,0 +1,116 @@
+"""
+Pressure stall information
+Reads /proc/pressure and the per-cgroup pressure files, and turns their
+stall-time totals into the share of time tasks spent waiting.
+"""
+
+import os
+
+from sysstats_lib.rates import RateEngine
+
+# Resources with a pressure file, in display order
+RESOURCES = ('cpu', 'memory', 'io')
+
+# Task groups in a pressure file: some = at least one task stalled,
+# full = all non-idle tasks stalled at once
+KINDS = ('some', 'full')
+
+PRESSURE_DIR = '/proc/pressure'
+CGROUP_ROOT = '/sys/fs/cgroup'
+
+def read_pressure(path):
+    """Parse a pressure file into {kind: {'avg10', 'avg60', 'avg300', 'total'}}
+
+    Returns None when the file is missing or PSI is disabled in the
+    kernel (reading then fails with EOPNOTSUPP).
+    """
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+
+    result = {}
+    for line in data.split(b'\n'):
+        fields = line.split()
+        if not fields:
+            continue
+        values = {}
+        for field in fields[1:]:
+            key, _, value = field.partition(b'=')
+            values[key.decode()] = int(value) if key == b'total' else float(value)
+        result[fields[0].decode()] = values
+    return result
+
+def cgroup_base(root=CGROUP_ROOT):
+    """cgroup v2 hierarchy root, also on hybrid setups that mount it below"""
+    for path in (root, os.path.join(root, 'unified')):
+        if os.path.exists(os.path.join(path, 'cgroup.controllers')):
+            return path
+    return None
+
+def cgroup_dirs(root=CGROUP_ROOT):
+    """(name, path) of the top-level cgroups that report pressure"""
+    base = cgroup_base(root)
+    if base is None:
+        return []
+    try:
+        entries = sorted(os.scandir(base), key=lambda entry: entry.name)
+    except OSError:
+        return []
+    return [
+        (entry.name, entry.path)
+        for entry in entries
+        if entry.is_dir(follow_symlinks=False) and os.path.exists(os.path.join(entry.path, 'cpu.pressure'))
+    ]
+
+class PressureMonitor:
+    """System-wide and per-cgroup pressure readings
+
+    The avg10/avg60/avg300 figures are the kernel's own running averages.
+    The stall share is measured from the microsecond totals between two
+    readings, so it covers exactly the last sampling interval.
+    """
+
+    def __init__(self, pressure_dir=PRESSURE_DIR, cgroup_root=CGROUP_ROOT):
+        self.pressure_dir = pressure_dir
+        self.cgroup_root = cgroup_root
+        self.rates = RateEngine()
+
+    def system(self, now=None):
+        """{resource: {kind: {'avg10', 'avg60', 'avg300', 'stall'}}}
+
+        stall is the percentage of time stalled since the previous call,
+        or None on the first one. Returns None when PSI is unavailable.
+        """
+        result = {}
+        for resource in RESOURCES:
+            pressure = read_pressure(os.path.join(self.pressure_dir, resource))
+            if not pressure:
+                continue
+            totals = {kind: values['total'] for kind, values in pressure.items()}
+            # Totals are in microseconds; per second, 10^4 is 1%
+            rates = self.rates.update(resource, totals, now) or {}
+            result[resource] = {
+                kind: {
+                    'avg10': values.get('avg10', 0.0),
+                    'avg60': values.get('avg60', 0.0),
+                    'avg300': values.get('avg300', 0.0),
+                    'stall': rates[kind] / 1e4 if kind in rates else None,
+                }
+                for kind, values in pressure.items()
+            }
+        return result or None
+
+    def cgroups(self):
+        """[(name, {resource: {kind: avg10}})] for the top-level cgroups"""
+        groups = []
+        for name, path in cgroup_dirs(self.cgroup_root):
+            readings = {}
+            for resource in RESOURCES:
+                pressure = read_pressure(os.path.join(path, f'{resource}.pressure'))
+                if pressure:
+                    readings[resource] = {kind: values.get('avg10', 0.0) for kind, values in pressure.items()}
+            if readings:
+                groups.append((name, readings))
+        return groups
@@ -0,0 +1,92 @@
+"""
+Counter-delta rate engine
+Turns cumulative kernel counters into per-second rates using the real
+time elapsed between samples.
+"""
+
+import time
+
+def counter_delta(value, previous, wrap=None):
+    """Increase of a cumulative counter, allowing for wraps and resets
+
+    A counter that goes backwards is treated as a wrap when a wrap width
+    is given and the drop is large enough, and as a reset (no increase)
+    otherwise.
+    """
+    delta = value - previous
+    if delta < 0:
+        if wrap and previous - value > wrap // 2:
+            delta += wrap
+        else:
+            # Counter reset, e.g. an interface or device re-created
+            delta = 0
+    return delta
+
+class RateCounter:
+    """Per-second rates for a set of cumulative counters
+
+    Every snapshot is stamped with time.monotonic(), so late timer ticks
+    and irregular sampling do not distort the rates. wrap is the width
+    of all the counters, or a dict of widths by counter name for sources
+    that mix 32 and 64-bit fields; see counter_delta.
+    """
+
+    def __init__(self, wrap=None):
+        self.wrap = wrap
+        self.last = None
+        self.last_time = None
+
+    def reset(self):
+        """Forget the previous snapshot"""
+        self.last = None
+        self.last_time = None
+
+    def update(self, counters, timestamp=None):
+        """Record a snapshot and return rates since the previous one
+
+        counters is a mapping or namedtuple of cumulative values. Returns
+        None for the first snapshot.
+        """
+        if timestamp is None:
+            timestamp = time.monotonic()
+        values = counters._asdict() if hasattr(counters, '_asdict') else dict(counters)
+
+        last, last_time = self.last, self.last_time
+        self.last, self.last_time = values, timestamp
+        if last is None or timestamp <= last_time:
+            return None
+
+        elapsed = timestamp - last_time
+        wrap = self.wrap
+        rates = {}
+        for name, value in values.items():
+            previous = last.get(name)
+            if previous is None:
+                continue
+            width = wrap.get(name) if isinstance(wrap, dict) else wrap
+            rates[name] = counter_delta(value, previous, width) / elapsed
+        return rates
+
+class RateEngine:
+    """A RateCounter per named source, such as 'net' or 'disk'"""
+
+    def __init__(self, wrap=None):
+        self.wrap = wrap
+        self.counters = {}
+
+    def update(self, name, counters, timestamp=None, wrap=None):
+        """Rates for a source since its previous snapshot
+
+        wrap overrides the engine's counter width for a new source.
+        """
+        if counters is None:
+            return None
+        if name not in self.counters:
+            self.counters[name] = RateCounter(self.wrap if wrap is None else wrap)
+        return self.counters[name].update(counters, timestamp)
+
+    def discard(self, keep):
+        """Drop sources that are not in keep, such as unplugged devices"""
+        for name in list(self.counters):
+            if name not in keep:
+                del self.counters[name]
@@ -0,0 +1,204 @@
+"""
+On-disk time-series recorder
+Appends fixed-size samples to a memory-mapped ring file, so history
+survives restarts in a bounded amount of disk space.
+"""
+
+import fcntl
+import mmap
+import os
+import struct
+
+DATA_DIR = os.path.join(os.environ.get('XDG_DATA_HOME', os.path.expanduser('~/.local/share')), 'sysstats')
+RECORD_FILE = os.path.join(DATA_DIR, 'history.ring')
+
+MAGIC = b'SYSSTREC'
+VERSION = 1
+
+# One sample per second for 24 hours, about 15 MB
+DEFAULT_CAPACITY = 86400
+
+# Seconds between recorded samples when sampling faster than this
+RECORD_INTERVAL = 1.0
+
+# Processes kept per sample, by CPU usage
+TOP_PROCESSES = 5
+
+# magic, version, top processes, record size, capacity, head
+HEADER = struct.Struct('<8sHHIIQ')
+HEADER_SIZE = 64
+
+# timestamp, cpu %, memory %, disk read/write B/s, net recv/sent B/s,
+# then pid, cpu %, memory % and name for each top process
+RECORD = struct.Struct('<d6f' + 'I2f16s' * TOP_PROCESSES)
+RECORD_TIME = struct.Struct('<d')
+
+FIELDS = ('cpu', 'memory', 'disk_read', 'disk_write', 'net_recv', 'net_sent')
+
+def unpack_sample(values):
+    """Sample dict from the values of a record"""
+    sample = dict(zip(FIELDS, values[1:7]))
+    sample['time'] = values[0]
+    sample['processes'] = [
+        (pid, name.rstrip(b'\0').decode('utf-8', 'replace'), cpu, memory)
+        for pid, cpu, memory, name in zip(*[iter(values[7:])] * 4)
+        if pid
+    ]
+    return sample
+
+class Recorder:
+    """Ring file of samples shared between SysStats instances
+
+    Only one process writes at a time, guarded by an flock on the file;
+    other instances open it read-only and can still show its history.
+    The head counter in the header is updated after each record is
+    written, so readers never see a half-written record as valid.
+    """
+
+    def __init__(self, path=RECORD_FILE, capacity=DEFAULT_CAPACITY):
+        self.path = path
+        self.capacity = capacity
+        self.fd = None
+        self.map = None
+        self.writable = False
+
+    @property
+    def size(self):
+        return HEADER_SIZE + RECORD.size * self.capacity
+
+    def open(self, write=True):
+        """Map the ring file, creating it if needed
+
+        Returns False when the file cannot be used at all.
+        """
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        except OSError:
+            return self.open_readonly()
+
+        if write:
+            try:
+                fcntl.flock(self.fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                self.writable = True
+            except OSError:
+                # Another instance is recording
+                self.writable = False
+
+        if self.writable and not self.header_matches():
+            os.ftruncate(self.fd, 0)
+            os.ftruncate(self.fd, self.size)
+            self.map = mmap.mmap(self.fd, self.size)
+            HEADER.pack_into(self.map, 0, MAGIC, VERSION, TOP_PROCESSES, RECORD.size, self.capacity, 0)
+            return True
+
+        if not self.header_matches():
+            self.close()
+            return False
+
+        access = mmap.ACCESS_WRITE if self.writable else mmap.ACCESS_READ
+        self.map = mmap.mmap(self.fd, self.size, access=access)
+        return True
+
+    def open_readonly(self):
+        """Open an existing ring file without recording to it"""
+        try:
+            self.fd = os.open(self.path, os.O_RDONLY)
+        except OSError:
+            return False
+        if not self.header_matches():
+            self.close()
+            return False
+        self.map = mmap.mmap(self.fd, self.size, access=mmap.ACCESS_READ)
+        return True
+
+    def header_matches(self):
+        """Whether the file on disk has the layout this version writes"""
+        try:
+            if os.fstat(self.fd).st_size != self.size:
+                return False
+            header = HEADER.unpack(os.pread(self.fd, HEADER.size, 0))
+        except (OSError, struct.error):
+            return False
+        return header[:5] == (MAGIC, VERSION, TOP_PROCESSES, RECORD.size, self.capacity)
+
+    def close(self):
+        """Unmap and close the file, releasing the write lock"""
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+        self.writable = False
+
+    def head(self):
+        """Number of records ever written"""
+        return HEADER.unpack_from(self.map, 0)[5]
+
+    def offset(self, number):
+        """Position in the file of a record, by number of records written before it"""
+        return HEADER_SIZE + (number % self.capacity) * RECORD.size
+
+    def append(self, sample):
+        """Write a sample dict with time, FIELDS and processes"""
+        if not self.writable:
+            return
+
+        values = [sample['time']] + [float(sample.get(field) or 0.0) for field in FIELDS]
+        processes = list(sample.get('processes') or [])[:TOP_PROCESSES]
+        processes += [(0, '', 0.0, 0.0)] * (TOP_PROCESSES - len(processes))
+        for pid, name, cpu, memory in processes:
+            values += [pid, cpu, memory, name.encode('utf-8')[:16]]
+
+        head = self.head()
+        RECORD.pack_into(self.map, self.offset(head), *values)
+        HEADER.pack_into(self.map, 0, MAGIC, VERSION, TOP_PROCESSES, RECORD.size, self.capacity, head + 1)
+
+    def records(self, since=None):
+        """Recorded samples, oldest first, optionally newer than since"""
+        if self.map is None:
+            return []
+
+        head = self.head()
+        start = head % self.capacity
+        # Copy out of the map so the writer can keep going while we parse
+        data = self.map[HEADER_SIZE:HEADER_SIZE + RECORD.size * min(head, self.capacity)]
+
+        # Once the ring has wrapped, the oldest record is at the head position
+        if head > self.capacity:
+            chunks = [data[start * RECORD.size:], data[:start * RECORD.size]]
+        else:
+            chunks = [data]
+
+        samples = []
+        for chunk in chunks:
+            for values in RECORD.iter_unpack(chunk):
+                if since is not None and values[0] <= since:
+                    continue
+                samples.append(unpack_sample(values))
+        return samples
+
+    def record_at(self, timestamp):
+        """The last sample recorded at or before timestamp, or None
+
+        Records are in time order around the ring, so this is a binary
+        search reading one timestamp per step.
+        """
+        if self.map is None:
+            return None
+        head = self.head()
+        offset = self.offset
+
+        # Absolute record numbers; the oldest still kept is head - count
+        low, high = head - min(head, self.capacity), head
+        oldest = low
+        while low < high:
+            middle = (low + high) // 2
+            if RECORD_TIME.unpack_from(self.map, offset(middle))[0] <= timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        if low == oldest:
+            return None
+        return unpack_sample(RECORD.unpack_from(self.map, offset(low - 1)))
@@ -0,0 +1,227 @@
+"""
+Native sysfs/procfs readers
+Replacements for lspci, lsblk, ip route and ethtool that read the kernel
+interfaces directly instead of spawning processes and parsing their output.
+"""
+
+import os
+
+PCI_DEVICES_DIR = '/sys/bus/pci/devices'
+BLOCK_DIR = '/sys/block'
+NET_DIR = '/sys/class/net'
+PCI_IDS_PATHS = [
+    '/usr/share/misc/pci.ids',
+    '/usr/share/hwdata/pci.ids',
+    '/usr/share/pci.ids',
+]
+
+# PCI base class 0x03 covers VGA, XGA, 3D and other display controllers
+PCI_CLASS_DISPLAY = 0x03
+
+# Route flag from <linux/route.h>
+RTF_UP = 0x0001
+
+# Names resolved from pci.ids, keyed by (vendor, device) ids
+_pci_names = {}
+
+def read_text(path, default=None):
+    """Read a small sysfs/procfs attribute, stripped"""
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except (OSError, UnicodeDecodeError):
+        return default
+
+def read_int(path, default=None, base=10):
+    """Read an integer attribute"""
+    value = read_text(path)
+    if value is None:
+        return default
+    try:
+        return int(value, base)
+    except ValueError:
+        return default
+
+def link_name(path):
+    """Name of the target of a sysfs symlink, such as a driver"""
+    try:
+        return os.path.basename(os.readlink(path))
+    except OSError:
+        return None
+
+def find_pci_ids():
+    """Locate the pci.ids database"""
+    for path in PCI_IDS_PATHS:
+        if os.path.exists(path):
+            return path
+    return None
+
+def resolve_pci_names(ids):
+    """Resolve (vendor, device) id pairs to names from pci.ids
+
+    The database is streamed once and only the requested entries are kept,
+    stopping as soon as every one has been found.
+    """
+    wanted = {}
+    for vendor, device in ids:
+        if (vendor, device) not in _pci_names:
+            wanted.setdefault(vendor, set()).add(device)
+
+    path = find_pci_ids()
+    if wanted and path:
+        remaining = sum(len(devices) for devices in wanted.values())
+        vendor = None
+        vendor_name = None
+        try:
+            with open(path, encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    if not line.strip() or line.startswith('#'):
+                        continue
+                    if line.startswith('C '):
+                        # Device class section follows the vendor list
+                        break
+                    if line[0] != '\t':
+                        try:
+                            vendor = int(line[:4], 16)
+                        except ValueError:
+                            vendor = None
+                        vendor_name = line[4:].strip()
+                        if vendor in wanted:
+                            _pci_names.setdefault((vendor, None), vendor_name)
+                        continue
+                    if line.startswith('\t\t') or vendor not in wanted:
+                        continue
+                    try:
+                        device = int(line[1:5], 16)
+                    except ValueError:
+                        continue
+                    if device in wanted[vendor]:
+                        _pci_names[(vendor, device)] = (vendor_name, line[5:].strip())
+                        remaining -= 1
+                        if remaining == 0:
+                            break
+        except OSError:
+            pass
+
+    for vendor, device in ids:
+        if (vendor, device) not in _pci_names:
+            # Fall back to the vendor name, or raw ids like lspci -n
+            vendor_name = _pci_names.get((vendor, None), f"{vendor:04x}")
+            _pci_names[(vendor, device)] = (vendor_name, f"Device {device:04x}")
+
+    return {(vendor, device): _pci_names[(vendor, device)] for vendor, device in ids}
+
+def read_pci_device(path):
+    """Read the identity of a PCI device directory"""
+    return {
+        'slot': os.path.basename(os.path.realpath(path)),
+        'class': read_int(os.path.join(path, 'class'), 0, 16),
+        'vendor': read_int(os.path.join(path, 'vendor'), 0, 16),
+        'device': read_int(os.path.join(path, 'device'), 0, 16),
+        'driver': link_name(os.path.join(path, 'driver')),
+    }
+
+def list_pci_devices():
+    """List PCI devices with their vendor and device names"""
+    try:
+        slots = sorted(os.listdir(PCI_DEVICES_DIR))
+    except OSError:
+        return []
+
+    devices = [read_pci_device(os.path.join(PCI_DEVICES_DIR, slot)) for slot in slots]
+    names = resolve_pci_names({(d['vendor'], d['device']) for d in devices})
+    for dev in devices:
+        vendor_name, device_name = names[(dev['vendor'], dev['device'])]
+        dev['name'] = f"{vendor_name} {device_name}"
+    return devices
+
+def get_gpu_name():
+    """Name of the first display controller, or None"""
+    for dev in list_pci_devices():
+        if dev['class'] >> 16 == PCI_CLASS_DISPLAY:
+            return dev['name']
+    return None
+
+def physical_disk_names():
+    """Names of physical disks, without partitions or virtual devices"""
+    try:
+        names = sorted(os.listdir(BLOCK_DIR))
+    except OSError:
+        return []
+
+    # Skip loop devices, ram, and optical drives; virtual devices (zram,
+    # device-mapper, md) have no backing device
+    return [
+        name for name in names
+        if not name.startswith(('loop', 'ram', 'sr'))
+        and os.path.exists(os.path.join(BLOCK_DIR, name, 'device'))
+    ]
+
+def list_block_devices():
+    """List physical disks like lsblk -d"""
+    disks = []
+
+    for name in physical_disk_names():
+        base = os.path.join(BLOCK_DIR, name)
+        device_dir = os.path.join(base, 'device')
+
+        # Models are space padded and may contain spaces themselves
+        model = read_text(os.path.join(device_dir, 'model')) or read_text(os.path.join(device_dir, 'name'))
+
+        disks.append({
+            'name': name,
+            'model': model,
+            'size': read_int(os.path.join(base, 'size'), 0) * 512,
+            'rotational': read_text(os.path.join(base, 'queue', 'rotational')) == '1',
+            'removable': read_text(os.path.join(base, 'removable')) == '1',
+            'usb': '/usb' in os.path.realpath(device_dir),
+        })
+
+    return disks
+
+def get_default_route_interface():
+    """Interface of the default route with the lowest metric, or None"""
+    best = None
+    try:
+        with open('/proc/net/route') as f:
+            next(f, None)
+            for line in f:
+                fields = line.split()
+                if len(fields) < 7:
+                    continue
+                iface, destination, flags, metric = fields[0], fields[1], fields[3], fields[6]
+                if destination != '00000000' or not int(flags, 16) & RTF_UP:
+                    continue
+                if best is None or int(metric) < best[0]:
+                    best = (int(metric), iface)
+    except (OSError, ValueError):
+        pass
+
+    if best:
+        return best[1]
+
+    # IPv6-only networks: default route is ::/0
+    try:
+        with open('/proc/net/ipv6_route') as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) >= 10 and fields[0] == '0' * 32 and fields[1] == '00' and fields[9] != 'lo':
+                    if best is None or int(fields[5], 16) < best[0]:
+                        best = (int(fields[5], 16), fields[9])
+    except (OSError, ValueError):
+        pass
+
+    return best[1] if best else None
+
+def get_interface_info(iface):
+    """Driver and PCI device name of a network interface"""
+    device_dir = os.path.join(NET_DIR, iface, 'device')
+    info = {'driver': link_name(os.path.join(device_dir, 'driver')), 'model': None}
+
+    # Only PCI devices expose vendor/device ids resolvable from pci.ids
+    if os.path.exists(os.path.join(device_dir, 'vendor')) and os.path.exists(os.path.join(device_dir, 'class')):
+        dev = read_pci_device(device_dir)
+        vendor_name, device_name = resolve_pci_names([(dev['vendor'], dev['device'])])[(dev['vendor'], dev['device'])]
+        info['model'] = f"{vendor_name} {device_name}"
+
+    return info
@@ -0,0 +1,154 @@
+"""
+Thermal and CPU frequency throttling monitor
+Reads per-core frequencies and governors from cpufreq, temperatures
+from thermal zones and hwmon, and the thermal throttle counters that
+Intel CPUs expose, turning the counters into rates.
+"""
+
+import glob
+import os
+import re
+from collections import Counter
+
+from sysstats_lib.rates import RateEngine
+from sysstats_lib.sysfs import read_int, read_text
+
+CPU_DIR = '/sys/devices/system/cpu'
+THERMAL_DIR = '/sys/class/thermal'
+HWMON_DIR = '/sys/class/hwmon'
+
+# Seconds between scans for sensors and CPUs that came or went
+RESCAN_INTERVAL = 60.0
+
+# Throttle counters in cpuN/thermal_throttle
+THROTTLE_COUNTERS = ('core_throttle_count', 'core_throttle_total_time_ms',
+                     'package_throttle_count', 'package_throttle_total_time_ms')
+
+def find_cpus(cpu_dir=CPU_DIR):
+    """Numbers of the CPUs present in sysfs"""
+    cpus = []
+    for path in glob.glob(os.path.join(cpu_dir, 'cpu[0-9]*')):
+        name = os.path.basename(path)[3:]
+        if name.isdigit():
+            cpus.append(int(name))
+    return sorted(cpus)
+
+def natural_key(path):
+    """Sort key putting thermal_zone2 before thermal_zone10"""
+    return [int(part) if part.isdigit() else part for part in re.split(r'(\d+)', path)]
+
+def find_sensors(thermal_dir=THERMAL_DIR, hwmon_dir=HWMON_DIR):
+    """Temperature sensors as (label, input path, critical temperature or None)
+
+    Thermal zones are labelled by type. hwmon sensors are labelled by
+    chip name and their own label, as lm-sensors does. Labels that
+    repeat, such as several acpitz zones, get the zone or chip directory
+    name added so each sensor can be told apart.
+    """
+    found = []
+    for zone in sorted(glob.glob(os.path.join(thermal_dir, 'thermal_zone*')), key=natural_key):
+        critical = None
+        for trip_type in glob.glob(os.path.join(zone, 'trip_point_*_type')):
+            if read_text(trip_type) == 'critical':
+                critical = read_int(trip_type[:-len('type')] + 'temp')
+        label = read_text(os.path.join(zone, 'type'), os.path.basename(zone))
+        found.append((label, os.path.basename(zone), os.path.join(zone, 'temp'), critical))
+
+    for chip in sorted(glob.glob(os.path.join(hwmon_dir, 'hwmon*')), key=natural_key):
+        name = read_text(os.path.join(chip, 'name'), os.path.basename(chip))
+        inputs = glob.glob(os.path.join(chip, 'temp*_input'))
+        for path in sorted(inputs, key=natural_key):
+            base = path[:-len('input')]
+            label = read_text(base + 'label') or os.path.basename(base)[:-1]
+            found.append((f'{name} {label}', os.path.basename(chip), path, read_int(base + 'crit')))
+
+    counts = Counter(label for label, directory, path, critical in found)
+    return [(f'{label} {directory}' if counts[label] > 1 else label, path, critical / 1000.0 if critical else None)
+            for label, directory, path, critical in found]
+
+class ThermalMonitor:
+    """Frequencies, temperatures and throttling since the previous sample
+
+    The sysfs layout is discovered on the first sample and again every
+    RESCAN_INTERVAL seconds; in between only the value files are read.
+    """
+
+    def __init__(self, cpu_dir=CPU_DIR, thermal_dir=THERMAL_DIR, hwmon_dir=HWMON_DIR):
+        self.cpu_dir = cpu_dir
+        self.thermal_dir = thermal_dir
+        self.hwmon_dir = hwmon_dir
+        self.rates = RateEngine()
+        self.scanned = None
+        self.cpus = []
+        self.sensors = []
+        self.throttle_cpus = []
+
+    def rescan(self, now):
+        self.scanned = now
+        cpus = find_cpus(self.cpu_dir)
+        self.cpus = [
+            cpu for cpu in cpus
+            if os.path.exists(os.path.join(self.cpu_dir, f'cpu{cpu}', 'cpufreq', 'scaling_cur_freq'))
+        ]
+        self.throttle_cpus = [
+            cpu for cpu in cpus
+            if os.path.exists(os.path.join(self.cpu_dir, f'cpu{cpu}', 'thermal_throttle'))
+        ]
+        self.sensors = find_sensors(self.thermal_dir, self.hwmon_dir)
+
+    def sample(self, now, details=False):
+        """Current readings, or None when sysfs has none of them
+
+        {'cpus': [cpu numbers], 'freq': [MHz per CPU],
+         'temps': [(label, °C, critical °C or None)], 'throttle': {...} or None}
+        With details, 'limits' holds each CPU's (min, max, hardware max)
+        MHz and 'governors' its scaling governor.
+        """
+        if self.scanned is None or now - self.scanned >= RESCAN_INTERVAL:
+            self.rescan(now)
+
+        freq = []
+        for cpu in self.cpus:
+            khz = read_int(f'{self.cpu_dir}/cpu{cpu}/cpufreq/scaling_cur_freq')
+            freq.append(khz / 1000.0 if khz else 0.0)
+
+        temps = []
+        for label, path, critical in self.sensors:
+            millidegrees = read_int(path)
+            if millidegrees is not None:
+                temps.append((label, millidegrees / 1000.0, critical))
+
+        throttle = None
+        if self.throttle_cpus:
+            throttle = {'core_events': 0.0, 'package_events': 0.0, 'percent': 0.0}
+            for cpu in self.throttle_cpus:
+                base = f'{self.cpu_dir}/cpu{cpu}/thermal_throttle/'
+                counters = {name: read_int(base + name, 0) for name in THROTTLE_COUNTERS}
+                rates = self.rates.update(f'cpu{cpu}', counters, now)
+                if not rates:
+                    continue
+                throttle['core_events'] += rates['core_throttle_count']
+                # Package counters repeat on every core of the package
+                throttle['package_events'] = max(throttle['package_events'], rates['package_throttle_count'])
+                # Milliseconds throttled per second, as a share of time
+                throttled = max(rates['core_throttle_total_time_ms'], rates['package_throttle_total_time_ms']) / 10.0
+                throttle['percent'] = max(throttle['percent'], min(throttled, 100.0))
+            self.rates.discard({f'cpu{cpu}' for cpu in self.throttle_cpus})
+
+        if not (freq or temps or throttle):
+            return None
+
+        result = {'cpus': self.cpus, 'freq': freq, 'temps': temps, 'throttle': throttle}
+        if details:
+            limits = []
+            governors = []
+            for cpu in self.cpus:
+                base = f'{self.cpu_dir}/cpu{cpu}/cpufreq/'
+                limits.append(tuple(
+                    (read_int(base + name) or 0) / 1000.0
+                    for name in ('scaling_min_freq', 'scaling_max_freq', 'cpuinfo_max_freq')
+                ))
+                governors.append(read_text(base + 'scaling_governor', ''))
+            result['limits'] = limits
+            result['governors'] = governors
+        return result
@@ -0,0 +1,183 @@
+"""
+Real-time thread audit
+Lists every thread with its scheduling policy, real-time priority, nice
+value, CPU affinity and last CPU, and flags audio threads that are not
+real-time or that can be preempted by a higher-priority IRQ thread on
+the same CPUs.
+"""
+
+import os
+import re
+import time
+
+from sysstats_lib.procscan import read_file
+
+# Field positions in /proc/[pid]/task/[tid]/stat, counted after the ")"
+# that closes the command name (state is 0)
+STAT_NICE = 16
+STAT_STARTTIME = 19
+STAT_PROCESSOR = 36
+STAT_RT_PRIORITY = 37
+STAT_POLICY = 38
+
+POLICIES = {0: 'OTHER', 1: 'FIFO', 2: 'RR', 3: 'BATCH', 5: 'IDLE', 6: 'DEADLINE'}
+REALTIME_POLICIES = {1, 2, 6}
+
+# Processes that run an audio graph, matched against the main thread's name
+AUDIO_PROCESSES = re.compile(
+    r'pipewire|jackd|jackdbus|ardour|mixbus|reaper|bitwig|carla|qtractor|zrythm|renoise|lmms|hydrogen|musescore',
+    re.IGNORECASE)
+
+# Thread names of the audio processing loops in those processes
+AUDIO_THREADS = re.compile(r'data-loop|jack|audio|dsp|^rt|process', re.IGNORECASE)
+
+# Threaded interrupt handlers are named irq/<number>-<device>
+IRQ_THREAD = re.compile(r'irq/\d+')
+
+# Seconds between affinity reads of a thread; affinity rarely changes
+AFFINITY_REFRESH = 10.0
+
+def format_cpu_list(cpus):
+    """Compact CPU list such as '0-3,8'"""
+    ranges = []
+    for cpu in sorted(cpus):
+        if ranges and cpu == ranges[-1][1] + 1:
+            ranges[-1][1] = cpu
+        else:
+            ranges.append([cpu, cpu])
+    return ','.join(f'{first}-{last}' if last > first else str(first) for first, last in ranges)
+
+def starttime(data):
+    """Start time field of a stat line, to tell reused TIDs apart"""
+    fields = data[data.rfind(b')') + 2:].split(None, STAT_STARTTIME + 1)
+    return int(fields[STAT_STARTTIME]) if len(fields) > STAT_STARTTIME else 0
+
+class ThreadEntry:
+    """Cached facts about one thread"""
+
+    __slots__ = ('tid', 'pid', 'name', 'starttime', 'stat', 'policy', 'rt_priority',
+                 'nice', 'processor', 'affinity', 'affinity_time')
+
+    def __init__(self, tid, pid, starttime):
+        self.tid = tid
+        self.pid = pid
+        self.name = ''
+        self.starttime = starttime
+        self.stat = None
+        self.policy = 0
+        self.rt_priority = 0
+        self.nice = 0
+        self.processor = 0
+        self.affinity = frozenset()
+        self.affinity_time = None
+
+class ThreadScanner:
+    """Keeps an index of all threads, updated incrementally each scan
+
+    Thread directories are listed every scan to find new and exited
+    threads. A thread's stat line is only split when it differs from the
+    last one read, and its affinity is only read when the thread is new
+    and then every AFFINITY_REFRESH seconds.
+    """
+
+    def __init__(self, proc_dir='/proc'):
+        self.proc_dir = proc_dir
+        self.threads = {}
+
+    def update_entry(self, entry, data, now):
+        """Refresh a thread from its stat line"""
+        if data != entry.stat:
+            entry.stat = data
+            close_paren = data.rfind(b')')
+            entry.name = data[data.find(b'(') + 1:close_paren].decode('utf-8', 'replace')
+            fields = data[close_paren + 2:].split()
+            if len(fields) > STAT_POLICY:
+                entry.nice = int(fields[STAT_NICE])
+                entry.processor = int(fields[STAT_PROCESSOR])
+                entry.rt_priority = int(fields[STAT_RT_PRIORITY])
+                entry.policy = int(fields[STAT_POLICY])
+
+        if entry.affinity_time is None or now - entry.affinity_time >= AFFINITY_REFRESH:
+            entry.affinity_time = now
+            try:
+                entry.affinity = frozenset(os.sched_getaffinity(entry.tid))
+            except OSError:
+                pass
+
+    def scan(self, now=None):
+        """Update the index; returns the ThreadEntry objects of live threads"""
+        if now is None:
+            now = time.monotonic()
+        proc_dir = self.proc_dir
+        seen = {}
+        for pid_name in os.listdir(proc_dir):
+            if not pid_name.isdigit():
+                continue
+            pid = int(pid_name)
+            try:
+                tids = os.listdir(f'{proc_dir}/{pid}/task')
+            except OSError:
+                # Process exited during the scan
+                continue
+            for tid_name in tids:
+                tid = int(tid_name)
+                try:
+                    data = read_file(f'{proc_dir}/{pid}/task/{tid}/stat')
+                except OSError:
+                    continue
+                entry = self.threads.get(tid)
+                if entry is None or (data != entry.stat and starttime(data) != entry.starttime):
+                    # New thread, or its TID was reused
+                    entry = ThreadEntry(tid, pid, starttime(data))
+                self.update_entry(entry, data, now)
+                seen[tid] = entry
+        self.threads = seen
+        return seen
+
+    def audit(self, now=None):
+        """Rows of every thread, audio threads and their problems flagged
+
+        Each row is [tid, pid, process, thread, policy, rt priority, nice,
+        affinity, last CPU, audio, problem], where problem is '' or
+        'not_realtime' or 'irq:<irq thread names>'.
+        """
+        threads = self.scan(now)
+
+        irq_threads = [
+            entry for entry in threads.values()
+            if entry.policy in REALTIME_POLICIES and IRQ_THREAD.match(entry.name)
+        ]
+
+        rows = []
+        for entry in threads.values():
+            main = threads.get(entry.pid)
+            process = main.name if main else entry.name
+            realtime = entry.policy in REALTIME_POLICIES
+            audio = bool(AUDIO_PROCESSES.search(process)) and (realtime or bool(AUDIO_THREADS.search(entry.name)))
+
+            problem = ''
+            if audio and not realtime:
+                problem = 'not_realtime'
+            elif audio:
+                # IRQ threads that preempt this one on a CPU it may run on
+                preempting = [
+                    irq.name for irq in irq_threads
+                    if irq.rt_priority > entry.rt_priority and irq.affinity & entry.affinity
+                ]
+                if preempting:
+                    problem = 'irq:' + ','.join(sorted(preempting))
+
+            rows.append([
+                entry.tid,
+                entry.pid,
+                process,
+                entry.name,
+                POLICIES.get(entry.policy, str(entry.policy)),
+                entry.rt_priority,
+                entry.nice,
+                format_cpu_list(entry.affinity),
+                entry.processor,
+                audio,
+                problem,
+            ])
+        return rows
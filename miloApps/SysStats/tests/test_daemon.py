@@ -0,0 +1,84 @@
+import os
+import shutil
+import socket
+import tempfile
+import unittest
+
+from sysstats_lib import protocol
+from sysstats_lib.collector import MIN_INTERVAL, for_pages
+from sysstats_lib.daemon import CollectorServer, Subscriber
+from sysstats_lib.recorder import RECORD_INTERVAL, Recorder
+
+SNAPSHOT = {'pages': ['cpu', 'processes'], 'time': 1.0, 'cpu_percent': 5.0,
+            'per_cpu': [5.0], 'processes': [], 'top_processes': []}
+
+class ForPagesTest(unittest.TestCase):
+
+    def test_keeps_common_keys_and_asked_pages(self):
+        self.assertEqual(for_pages(SNAPSHOT, {'cpu'}),
+                         {'pages': ['cpu'], 'time': 1.0, 'cpu_percent': 5.0, 'per_cpu': [5.0]})
+        self.assertEqual(for_pages(SNAPSHOT, set()), {'pages': [], 'time': 1.0, 'cpu_percent': 5.0})
+
+class ServerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = CollectorServer(path='/nonexistent')
+        self.addCleanup(self.server.close)
+
+    def connect(self, pages):
+        ours, theirs = socket.socketpair()
+        self.addCleanup(theirs.close)
+        ours.setblocking(False)
+        subscriber = Subscriber(ours)
+        self.server.subscribers[ours] = subscriber
+        self.server.selector.register(ours, 1, self.server.service)
+        self.assertTrue(self.server.handle(subscriber, {'type': 'subscribe', 'pages': pages}))
+        return subscriber, theirs
+
+    def test_malformed_messages(self):
+        subscriber, _ = self.connect([])
+        for message in ([], 'subscribe', {'type': 'subscribe', 'pages': 'cpu'},
+                        {'type': 'subscribe', 'pages': [1]}):
+            self.assertFalse(self.server.handle(subscriber, message))
+
+    def test_bad_frame_drops_only_that_client(self):
+        good, _ = self.connect(['cpu'])
+        bad, peer = self.connect(['cpu'])
+        peer.sendall(protocol.encode(['not', 'a', 'dict']))
+        self.server.service(bad.sock, 1)
+        self.assertEqual(list(self.server.subscribers.values()), [good])
+
+    def test_each_subscriber_gets_its_pages(self):
+        cpu, cpu_peer = self.connect(['cpu'])
+        processes, processes_peer = self.connect(['processes', 'unknown'])
+        self.assertEqual(processes.pages, {'processes'})
+        self.server.publish(SNAPSHOT)
+        snapshot = protocol.FrameDecoder().feed(cpu_peer.recv(65536))[0]['snapshot']
+        self.assertEqual(snapshot['pages'], ['cpu'])
+        self.assertNotIn('processes', snapshot)
+        snapshot = protocol.FrameDecoder().feed(processes_peer.recv(65536))[0]['snapshot']
+        self.assertEqual(snapshot['pages'], ['processes'])
+        self.assertNotIn('per_cpu', snapshot)
+        self.assertNotIn('top_processes', snapshot)
+
+    def test_interval_is_the_shortest_wanted(self):
+        self.assertEqual(self.server.interval(), self.server.base_interval)
+        slow, _ = self.connect([])
+        slow.interval = 5.0
+        fast, _ = self.connect([])
+        fast.interval = 0.01
+        self.assertEqual(self.server.interval(), MIN_INTERVAL)
+
+    def test_recording_caps_the_interval(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        recorder = Recorder(os.path.join(directory, 'history.ring'), 4)
+        self.assertTrue(recorder.open())
+        self.addCleanup(recorder.close)
+        self.server.collector.recorder = recorder
+        slow, _ = self.connect([])
+        slow.interval = 5.0
+        self.assertEqual(self.server.interval(), RECORD_INTERVAL)
+
+if __name__ == '__main__':
+    unittest.main()
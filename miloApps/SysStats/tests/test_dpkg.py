@@ -0,0 +1,63 @@
+import os
+import tempfile
+import unittest
+
+from sysstats_lib import dpkg
+
+STATUS = b"""Package: bash
+Status: install ok installed
+Architecture: amd64
+Origin: Debian
+
+Package: libc6
+Status: install ok installed
+Architecture: i386
+
+Package: held
+Status: hold ok installed
+Architecture: amd64
+
+Package: removed
+Status: deinstall ok config-files
+Architecture: amd64
+
+Package: half
+Status: install ok half-configured
+Architecture: amd64
+
+Package: last
+Status: install ok installed
+Architecture: all
+Origin: miloOS"""
+
+class ParseStatusTest(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp()
+        with os.fdopen(fd, 'wb') as f:
+            f.write(STATUS)
+
+    def tearDown(self):
+        os.unlink(self.path)
+
+    def test_counts_only_ii_packages(self):
+        counts = dpkg.parse_status(self.path)
+        self.assertEqual(counts['total'], 3)
+
+    def test_splits_by_architecture_and_origin(self):
+        counts = dpkg.parse_status(self.path)
+        self.assertEqual(counts['architectures'], {'amd64': 1, 'i386': 1, 'all': 1})
+        self.assertEqual(counts['origins'], {'Debian': 1, '': 1, 'miloOS': 1})
+
+    def test_count_installed_is_cached_until_the_file_changes(self):
+        first = dpkg.count_installed(self.path)
+        self.assertIs(dpkg.count_installed(self.path), first)
+        with open(self.path, 'ab') as f:
+            f.write(b"\n\nPackage: new\nStatus: install ok installed\nArchitecture: amd64\n")
+        self.assertEqual(dpkg.count_installed(self.path)['total'], 4)
+
+    def test_missing_database(self):
+        self.assertIsNone(dpkg.count_installed(self.path + '.missing'))
+
+if __name__ == '__main__':
+    unittest.main()
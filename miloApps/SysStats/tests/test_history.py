@@ -0,0 +1,83 @@
+import math
+import unittest
+from array import array
+
+from sysstats_lib.history import MetricHistory, Tier, decimate
+
+class TierTest(unittest.TestCase):
+
+    def test_slot_keeps_min_max_and_mean(self):
+        tier = Tier(10, 6)
+        for value in (1.0, 5.0, 3.0):
+            tier.add(102.0, value)
+        series = tier.series(1, 102.0)
+        self.assertEqual(list(series['min']), [1.0])
+        self.assertEqual(list(series['max']), [5.0])
+        self.assertEqual(list(series['mean']), [3.0])
+        self.assertEqual(series['end'], 10)
+
+    def test_empty_and_stale_slots_are_gaps(self):
+        tier = Tier(1, 4)
+        tier.add(10.0, 1.0)
+        tier.add(12.0, 2.0)
+        series = tier.series(4, 12.0)
+        self.assertEqual(series['gaps'], 2)
+        self.assertTrue(math.isnan(series['mean'][0]))
+        self.assertTrue(math.isnan(series['mean'][2]))
+        self.assertEqual(series['mean'][1], 1.0)
+        self.assertEqual(series['mean'][3], 2.0)
+
+    def test_ring_wraps(self):
+        tier = Tier(1, 3)
+        for t in range(10):
+            tier.add(float(t), float(t))
+        self.assertEqual(list(tier.series(3, 9.0)['mean']), [7.0, 8.0, 9.0])
+
+    def test_duration_fills_earlier_slots(self):
+        tier = Tier(1, 10)
+        tier.add(5.0, 4.0, duration=3.0)
+        series = tier.series(4, 5.0)
+        self.assertEqual(series['gaps'], 1)
+        self.assertEqual(list(series['mean'][1:]), [4.0, 4.0, 4.0])
+
+class DecimateTest(unittest.TestCase):
+
+    def series(self, means, gaps=0):
+        values = array('f', means)
+        return {'min': values, 'max': array('f', means), 'mean': array('f', means),
+                'end': 11, 'gaps': gaps, 'factor': 1}
+
+    def test_groups_without_gaps(self):
+        result = decimate(self.series([1, 2, 3, 4, 5, 6]), 2)
+        self.assertEqual(list(result['min']), [1.0, 3.0, 5.0])
+        self.assertEqual(list(result['max']), [2.0, 4.0, 6.0])
+        self.assertEqual(list(result['mean']), [1.5, 3.5, 5.5])
+        self.assertEqual(result['end'], 5)
+        self.assertEqual(result['factor'], 2)
+
+    def test_gaps_are_skipped_and_empty_groups_stay_nan(self):
+        result = decimate(self.series([1, math.nan, math.nan, math.nan, 4, 6], gaps=3), 2)
+        self.assertEqual(result['mean'][0], 1.0)
+        self.assertTrue(math.isnan(result['mean'][1]))
+        self.assertEqual(result['mean'][2], 5.0)
+
+class MetricHistoryTest(unittest.TestCase):
+
+    def test_picks_the_finest_tier_covering_the_span(self):
+        history = MetricHistory([(1, 60), (10, 360)])
+        self.assertEqual(history.tier_for(60).resolution, 1)
+        self.assertEqual(history.tier_for(3600).resolution, 10)
+        self.assertEqual(history.tier_for(10 ** 6).resolution, 10)
+
+    def test_series_is_decimated_to_columns(self):
+        history = MetricHistory([(1, 60)])
+        for t in range(60):
+            history.add(1000.0 + t, float(t))
+        series = history.series(60, columns=20)
+        self.assertEqual(series['factor'], 3)
+        self.assertEqual(len(series['mean']), 20)
+        self.assertEqual(series['max'][-1], 59.0)
+        self.assertEqual(history.last_value, 59.0)
+
+if __name__ == '__main__':
+    unittest.main()
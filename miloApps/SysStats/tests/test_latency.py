@@ -0,0 +1,46 @@
+import unittest
+from array import array
+
+from sysstats_lib import latency
+
+SECOND = 1_000_000_000
+
+class RecentMaxTest(unittest.TestCase):
+
+    def setUp(self):
+        self.counters = array('Q', bytes(latency.SLOTS * 8))
+
+    def test_maximum_per_second(self):
+        latency.note_recent(self.counters, 100 * SECOND, 5)
+        latency.note_recent(self.counters, 100 * SECOND + 1, 9)
+        latency.note_recent(self.counters, 101 * SECOND, 3)
+        self.assertEqual(latency.recent_max(self.counters, 100, 101), 9)
+        self.assertEqual(latency.recent_max(self.counters, 101, 101), 3)
+        self.assertEqual(latency.recent_max(self.counters, 102, 110), 0)
+
+    def test_slot_is_reused_for_a_later_second(self):
+        latency.note_recent(self.counters, 100 * SECOND, 50)
+        latency.note_recent(self.counters, (100 + latency.RECENT_SECONDS) * SECOND, 7)
+        self.assertEqual(latency.recent_max(self.counters, 100, 100), 0)
+        self.assertEqual(latency.recent_max(self.counters, 101, 200), 7)
+
+    def test_reader_never_clears(self):
+        latency.note_recent(self.counters, 100 * SECOND, 5)
+        # Read during second 100, then a later wakeup in the same second
+        self.assertEqual(latency.recent_max(self.counters, 90, 100), 5)
+        latency.note_recent(self.counters, 100 * SECOND + 500, 8)
+        self.assertEqual(latency.recent_max(self.counters, 100, 101), 8)
+
+class BucketTest(unittest.TestCase):
+
+    def test_buckets(self):
+        self.assertEqual(latency.bucket_of(500), 0)
+        self.assertEqual(latency.bucket_of(1500), 1)
+        self.assertEqual(latency.bucket_of(10 ** 12), latency.BUCKETS - 1)
+
+    def test_percentile(self):
+        self.assertIsNone(latency.percentile([0] * 4, 0.99))
+        self.assertEqual(latency.percentile([98, 1, 1, 0], 0.99), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import math
+import unittest
+
+from sysstats_lib.openmetrics import MetricFamily, escape, format_value, render
+
+def snapshot(**extra):
+    snapshot = {'time': 100.0, 'cpu_percent': 12.5, 'per_cpu': [10.0, 15.0],
+                'memory': {'total': 1024, 'used': 512}, 'disk_devices': {}, 'net_interfaces': {}}
+    snapshot.update(extra)
+    return snapshot
+
+class FormatTest(unittest.TestCase):
+
+    def test_values(self):
+        self.assertEqual(format_value(3), '3.0')
+        self.assertEqual(format_value(0.1), '0.1')
+        self.assertEqual(format_value(math.nan), 'NaN')
+        self.assertEqual(format_value(math.inf), '+Inf')
+        self.assertEqual(format_value(-math.inf), '-Inf')
+
+    def test_label_escaping(self):
+        self.assertEqual(escape('a"b\\c\nd'), 'a\\"b\\\\c\\nd')
+
+    def test_family_lines(self):
+        family = MetricFamily('sysstats_test_bytes', 'counter', "Test.", 'bytes')
+        family.add(math.nan, '_total', device='sda')
+        self.assertEqual(list(family.lines()), [
+            '# TYPE sysstats_test_bytes counter',
+            '# UNIT sysstats_test_bytes bytes',
+            '# HELP sysstats_test_bytes Test.',
+            'sysstats_test_bytes_total{device="sda"} NaN',
+        ])
+
+class RenderTest(unittest.TestCase):
+
+    def test_total_cpu_is_its_own_metric(self):
+        lines = render(snapshot()).splitlines()
+        self.assertIn('sysstats_cpu_usage_total_percent 12.5', lines)
+        self.assertIn('sysstats_cpu_usage_percent{cpu="0"} 10.0', lines)
+        self.assertFalse([line for line in lines if 'cpu="all"' in line])
+
+    def test_ends_with_eof(self):
+        self.assertTrue(render(snapshot()).endswith('# EOF\n'))
+
+    def test_top_processes(self):
+        text = render(snapshot(top_processes=[(42, 'jackd', 30.0, 2.5)]))
+        self.assertIn('sysstats_top_process_cpu_percent{rank="0",pid="42",name="jackd"} 30.0', text)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from sysstats_lib import procscan
+
+def stat_line(pid, name, utime, stime, starttime, rss):
+    # Fields after the name, state first; only the parsed ones matter
+    fields = ['S'] + ['0'] * 21
+    fields[procscan.STAT_UTIME] = str(utime)
+    fields[procscan.STAT_STIME] = str(stime)
+    fields[procscan.STAT_STARTTIME] = str(starttime)
+    fields[procscan.STAT_RSS] = str(rss)
+    return f"{pid} ({name}) {' '.join(fields)} 0 0 0\n"
+
+class ScanTest(unittest.TestCase):
+
+    def setUp(self):
+        self.proc_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.proc_dir)
+
+    def add(self, pid, name, utime=0, stime=0, starttime=100, rss=10):
+        path = os.path.join(self.proc_dir, str(pid))
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, 'stat'), 'w') as f:
+            f.write(stat_line(pid, name, utime, stime, starttime, rss))
+
+    def test_parses_names_with_spaces_and_parentheses(self):
+        self.add(1, 'init')
+        self.add(42, 'Web Content (x) )', utime=5, stime=7, rss=3)
+        snap = procscan.scan(self.proc_dir)
+        self.assertEqual(list(snap.pids), [1, 42])
+        self.assertEqual(snap.name(1), 'Web Content (x) )')
+        self.assertEqual(snap.cputime[1], 12)
+        self.assertEqual(snap.rss[1], 3)
+        self.assertEqual(snap.index[42], 1)
+
+    def test_owner_is_kept_for_known_processes(self):
+        self.add(7, 'a')
+        first = procscan.scan(self.proc_dir)
+        first.uids[0] = 12345
+        self.assertEqual(procscan.scan(self.proc_dir, first).uids[0], 12345)
+        # Reused PID: a new start time means a new owner lookup
+        self.add(7, 'b', starttime=200)
+        self.assertEqual(procscan.scan(self.proc_dir, first).uids[0], os.getuid())
+
+    def test_cpu_percent_against_previous_snapshot(self):
+        self.add(7, 'busy', utime=0)
+        previous = procscan.scan(self.proc_dir)
+        self.add(7, 'busy', utime=procscan.CLK_TCK // 2)
+        current = procscan.scan(self.proc_dir)
+        current.timestamp = previous.timestamp + 1.0
+        self.assertAlmostEqual(procscan.cpu_percent(current, previous)[0],
+                               100.0 * (procscan.CLK_TCK // 2) / procscan.CLK_TCK)
+
+    def test_new_process_gets_average_since_start(self):
+        previous = procscan.scan(self.proc_dir)
+        self.add(9, 'new', utime=procscan.CLK_TCK, starttime=0)
+        current = procscan.scan(self.proc_dir)
+        current.uptime = 4.0
+        current.timestamp = previous.timestamp + 1.0
+        self.assertAlmostEqual(procscan.cpu_percent(current, previous)[0], 25.0)
+
+if __name__ == '__main__':
+    unittest.main()
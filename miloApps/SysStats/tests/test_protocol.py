@@ -0,0 +1,40 @@
+import json
+import unittest
+
+from sysstats_lib import protocol
+from sysstats_lib.protocol import FrameDecoder
+
+class ProtocolTest(unittest.TestCase):
+
+    def test_round_trip(self):
+        message = {'type': 'subscribe', 'pages': ['cpu', 'processes'], 'interval': 0.5}
+        self.assertEqual(FrameDecoder().feed(protocol.encode(message)), [message])
+
+    def test_partial_frames_are_kept(self):
+        frames = protocol.encode({'n': 1}) + protocol.encode({'n': 2})
+        decoder = FrameDecoder()
+        self.assertEqual(decoder.feed(frames[:3]), [])
+        self.assertEqual(decoder.feed(frames[3:-1]), [{'n': 1}])
+        self.assertEqual(decoder.feed(frames[-1:]), [{'n': 2}])
+        self.assertEqual(decoder.buffer, bytearray())
+
+    def test_json_is_decoded_without_msgpack(self):
+        payload = json.dumps({'type': 'snapshot'}).encode()
+        frame = protocol.FRAME_HEADER.pack(protocol.FORMAT_JSON, len(payload)) + payload
+        self.assertEqual(FrameDecoder().feed(frame), [{'type': 'snapshot'}])
+
+    def test_oversized_frame(self):
+        header = protocol.FRAME_HEADER.pack(protocol.FORMAT_JSON, protocol.MAX_FRAME + 1)
+        with self.assertRaises(ValueError):
+            FrameDecoder().feed(header)
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            FrameDecoder().feed(protocol.FRAME_HEADER.pack(b'X', 2) + b'{}')
+
+    def test_invalid_payload(self):
+        with self.assertRaises(ValueError):
+            FrameDecoder().feed(protocol.FRAME_HEADER.pack(protocol.FORMAT_JSON, 2) + b'\xff{')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+
+from sysstats_lib.rates import RateCounter, RateEngine, counter_delta
+
+class CounterDeltaTest(unittest.TestCase):
+
+    def test_increase(self):
+        self.assertEqual(counter_delta(150, 100), 50)
+
+    def test_backwards_without_wrap_is_a_reset(self):
+        self.assertEqual(counter_delta(10, 100), 0)
+
+    def test_wrap(self):
+        self.assertEqual(counter_delta(5, 2 ** 32 - 5, 2 ** 32), 10)
+
+    def test_small_drop_with_wrap_is_still_a_reset(self):
+        self.assertEqual(counter_delta(10, 100, 2 ** 32), 0)
+
+class RateCounterTest(unittest.TestCase):
+
+    def test_first_snapshot_has_no_rates(self):
+        self.assertIsNone(RateCounter().update({'bytes': 10}, 1.0))
+
+    def test_rates_use_elapsed_time(self):
+        counter = RateCounter()
+        counter.update({'bytes': 100}, 1.0)
+        self.assertEqual(counter.update({'bytes': 400}, 3.0), {'bytes': 150.0})
+
+    def test_same_timestamp_gives_no_rates(self):
+        counter = RateCounter()
+        counter.update({'bytes': 100}, 1.0)
+        self.assertIsNone(counter.update({'bytes': 200}, 1.0))
+
+    def test_per_field_wrap(self):
+        counter = RateCounter({'time': 2 ** 32})
+        counter.update({'time': 2 ** 32 - 1, 'count': 100}, 0.0)
+        rates = counter.update({'time': 1, 'count': 50}, 1.0)
+        self.assertEqual(rates, {'time': 2.0, 'count': 0.0})
+
+class RateEngineTest(unittest.TestCase):
+
+    def test_wrap_given_for_a_source(self):
+        engine = RateEngine()
+        engine.update('disk', {'time': 2 ** 32 - 1}, 0.0, wrap=2 ** 32)
+        self.assertEqual(engine.update('disk', {'time': 1}, 1.0), {'time': 2.0})
+
+    def test_discard(self):
+        engine = RateEngine()
+        engine.update('a', {'x': 1}, 0.0)
+        engine.update('b', {'x': 1}, 0.0)
+        engine.discard({'a'})
+        self.assertEqual(list(engine.counters), ['a'])
+
+if __name__ == '__main__':
+    unittest.main()
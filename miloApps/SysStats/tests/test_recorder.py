@@ -0,0 +1,80 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from sysstats_lib import recorder
+from sysstats_lib.recorder import Recorder
+
+def sample(t, processes=()):
+    return {'time': float(t), 'cpu': 10.0 + t, 'memory': 50.0, 'disk_read': 1.0,
+            'disk_write': 2.0, 'net_recv': 3.0, 'net_sent': 4.0, 'processes': list(processes)}
+
+class RecorderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'history.ring')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def open(self, capacity=4, write=True):
+        ring = Recorder(self.path, capacity)
+        self.assertTrue(ring.open(write))
+        self.addCleanup(ring.close)
+        return ring
+
+    def test_round_trip(self):
+        ring = self.open()
+        ring.append(sample(1, [(42, 'ardour-8.0-long-name', 12.5, 3.0)]))
+        records = ring.records()
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]['time'], 1.0)
+        self.assertEqual(records[0]['cpu'], 11.0)
+        self.assertEqual(records[0]['processes'], [(42, 'ardour-8.0-long-', 12.5, 3.0)])
+
+    def test_ring_keeps_the_newest_records_in_order(self):
+        ring = self.open(capacity=4)
+        for t in range(10):
+            ring.append(sample(t))
+        self.assertEqual([record['time'] for record in ring.records()], [6.0, 7.0, 8.0, 9.0])
+        self.assertEqual([record['time'] for record in ring.records(since=7.0)], [8.0, 9.0])
+
+    def test_record_at(self):
+        ring = self.open(capacity=4)
+        self.assertIsNone(ring.record_at(5.0))
+        for t in range(0, 20, 2):
+            ring.append(sample(t))
+        # Kept: 12, 14, 16, 18
+        self.assertIsNone(ring.record_at(11.0))
+        self.assertEqual(ring.record_at(12.0)['time'], 12.0)
+        self.assertEqual(ring.record_at(15.0)['time'], 14.0)
+        self.assertEqual(ring.record_at(100.0)['time'], 18.0)
+
+    def test_second_writer_is_read_only(self):
+        writer = self.open()
+        writer.append(sample(1))
+        reader = self.open()
+        self.assertFalse(reader.writable)
+        reader.append(sample(2))
+        self.assertEqual(len(reader.records()), 1)
+
+    def test_file_with_another_layout_is_recreated(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'not a ring file')
+        ring = self.open()
+        self.assertEqual(ring.records(), [])
+        self.assertEqual(os.path.getsize(self.path), ring.size)
+
+    def test_read_only_open_of_missing_file(self):
+        self.assertFalse(Recorder(self.path).open_readonly())
+
+    def test_top_processes_are_padded_and_truncated(self):
+        ring = self.open()
+        processes = [(pid, f'p{pid}', 1.0, 1.0) for pid in range(1, recorder.TOP_PROCESSES + 3)]
+        ring.append(sample(1, processes))
+        self.assertEqual(len(ring.records()[0]['processes']), recorder.TOP_PROCESSES)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from sysstats_lib import thermal
+
+class FindSensorsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.thermal_dir = os.path.join(self.root, 'thermal')
+        self.hwmon_dir = os.path.join(self.root, 'hwmon')
+
+    def write(self, path, text):
+        path = os.path.join(self.root, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(text + '\n')
+
+    def labels(self):
+        return [label for label, path, critical in thermal.find_sensors(self.thermal_dir, self.hwmon_dir)]
+
+    def test_repeated_zone_types_get_the_zone_name(self):
+        for zone, kind in ((0, 'acpitz'), (1, 'x86_pkg_temp'), (2, 'acpitz'), (10, 'acpitz')):
+            self.write(f'thermal/thermal_zone{zone}/type', kind)
+        self.assertEqual(self.labels(), ['acpitz thermal_zone0', 'x86_pkg_temp',
+                                         'acpitz thermal_zone2', 'acpitz thermal_zone10'])
+
+    def test_hwmon_labels_and_critical(self):
+        self.write('hwmon/hwmon0/name', 'coretemp')
+        self.write('hwmon/hwmon0/temp1_label', 'Package id 0')
+        self.write('hwmon/hwmon0/temp1_input', '45000')
+        self.write('hwmon/hwmon0/temp1_crit', '100000')
+        for chip in (1, 2):
+            self.write(f'hwmon/hwmon{chip}/name', 'nvme')
+            self.write(f'hwmon/hwmon{chip}/temp1_label', 'Composite')
+            self.write(f'hwmon/hwmon{chip}/temp1_input', '40000')
+        sensors = thermal.find_sensors(self.thermal_dir, self.hwmon_dir)
+        self.assertEqual([label for label, path, critical in sensors],
+                         ['coretemp Package id 0', 'nvme Composite hwmon1', 'nvme Composite hwmon2'])
+        self.assertEqual(sensors[0][2], 100.0)
+        self.assertIsNone(sensors[1][2])
+
+if __name__ == '__main__':
+    unittest.main()